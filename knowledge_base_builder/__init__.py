@@ -8,19 +8,52 @@ using multiple LLM providers including Google Gemini, OpenAI GPT-4o, and Anthrop
 
 __version__ = "0.1.0"
 
-from knowledge_base_builder.llm_client import LLMClient
-from knowledge_base_builder.gemini_client import GeminiClient
-from knowledge_base_builder.openai_client import OpenAIClient
-from knowledge_base_builder.anthropic_client import AnthropicClient
-from knowledge_base_builder.llm import LLM
-from knowledge_base_builder.kb_builder import KBBuilder
-from knowledge_base_builder.base_processor import BaseProcessor
-from knowledge_base_builder.pdf_processor import PDFProcessor
-from knowledge_base_builder.document_processor import DocumentProcessor
-from knowledge_base_builder.spreadsheet_processor import SpreadsheetProcessor
-from knowledge_base_builder.web_content_processor import WebContentProcessor
-from knowledge_base_builder.website_processor import WebsiteProcessor
-from knowledge_base_builder.github_processor import GitHubProcessor
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public names and the modules that define them. They are imported on first
+# access, so `import knowledge_base_builder` does not load every provider SDK
+# and document library up front.
+_EXPORTS = {
+    'LLMClient': 'knowledge_base_builder.llm_client',
+    'GeminiClient': 'knowledge_base_builder.gemini_client',
+    'OpenAIClient': 'knowledge_base_builder.openai_client',
+    'AnthropicClient': 'knowledge_base_builder.anthropic_client',
+    'LLM': 'knowledge_base_builder.llm',
+    'KBBuilder': 'knowledge_base_builder.kb_builder',
+    'BaseProcessor': 'knowledge_base_builder.base_processor',
+    'PDFProcessor': 'knowledge_base_builder.pdf_processor',
+    'DocumentProcessor': 'knowledge_base_builder.document_processor',
+    'SpreadsheetProcessor': 'knowledge_base_builder.spreadsheet_processor',
+    'WebContentProcessor': 'knowledge_base_builder.web_content_processor',
+    'WebsiteProcessor': 'knowledge_base_builder.website_processor',
+    'GitHubProcessor': 'knowledge_base_builder.github_processor',
+}
+
+if TYPE_CHECKING:
+    from knowledge_base_builder.llm_client import LLMClient
+    from knowledge_base_builder.gemini_client import GeminiClient
+    from knowledge_base_builder.openai_client import OpenAIClient
+    from knowledge_base_builder.anthropic_client import AnthropicClient
+    from knowledge_base_builder.llm import LLM
+    from knowledge_base_builder.kb_builder import KBBuilder
+    from knowledge_base_builder.base_processor import BaseProcessor
+    from knowledge_base_builder.pdf_processor import PDFProcessor
+    from knowledge_base_builder.document_processor import DocumentProcessor
+    from knowledge_base_builder.spreadsheet_processor import SpreadsheetProcessor
+    from knowledge_base_builder.web_content_processor import WebContentProcessor
+    from knowledge_base_builder.website_processor import WebsiteProcessor
+    from knowledge_base_builder.github_processor import GitHubProcessor
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     'LLMClient',
@@ -4,12 +4,14 @@ import tempfile
 import urllib.parse
 import re
 from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from knowledge_base_builder.registry import SNIFF_BYTES, sniff_extension
 
 class BaseProcessor(ABC):
     """Base class for all document processors."""
     
     @staticmethod
-    def download(url: str, supported_extensions: list) -> str:
+    def download(url: str, supported_extensions: list, mime_types: Optional[Dict[str, str]] = None) -> str:
         """Download a file from a URL or load from local file."""
         if url.startswith("file://"):
             parsed = urllib.parse.urlparse(url)
@@ -54,10 +56,13 @@ class BaseProcessor(ABC):
             
             # Ensure we have the correct file extension
             if not any(filename.lower().endswith(ext) for ext in supported_extensions):
-                # Try to guess from content-type
-                content_type = response.headers.get('content-type', '')
+                # Try to guess from content-type, then from the file signature
+                content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+                extension = (mime_types or {}).get(content_type) or sniff_extension(response.content[:SNIFF_BYTES])
                 # Default to first supported extension if we can't determine
-                filename = filename + supported_extensions[0]
+                if extension not in supported_extensions:
+                    extension = supported_extensions[0]
+                filename = filename + extension
             
             # Create temporary file with the correct extension
             temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1])
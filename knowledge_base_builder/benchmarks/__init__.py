@@ -0,0 +1,26 @@
+"""
+Offline benchmarks for the knowledge base pipeline.
+
+Builds run against a local HTTP fixture server and a deterministic fake LLM
+client, so throughput, latency percentiles and peak memory can be measured
+without network access or API keys and compared across commits:
+
+    python -m knowledge_base_builder.benchmarks run -o bench.json
+    python -m knowledge_base_builder.benchmarks compare base.json bench.json
+"""
+
+from knowledge_base_builder.benchmarks.fake_llm import FakeLLMClient, RateLimitError
+from knowledge_base_builder.benchmarks.fixtures import FixtureServer, SyntheticCorpus
+from knowledge_base_builder.benchmarks.runner import SCENARIOS, Scenario, compare, run_scenario, run_suite
+
+__all__ = [
+    'FakeLLMClient',
+    'RateLimitError',
+    'FixtureServer',
+    'SyntheticCorpus',
+    'Scenario',
+    'SCENARIOS',
+    'run_scenario',
+    'run_suite',
+    'compare',
+]
@@ -0,0 +1,6 @@
+import sys
+
+from knowledge_base_builder.benchmarks.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
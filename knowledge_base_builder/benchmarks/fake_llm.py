@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+from typing import Any, Dict
+
+from knowledge_base_builder.llm_client import LLMClient
+from knowledge_base_builder.metrics import increment, span
+
+class RateLimitError(Exception):
+    """Simulated HTTP 429 from the fake provider."""
+
+class FakeResponse:
+    """Stand-in for a LangChain message: content plus usage metadata."""
+    def __init__(self, content: str, usage_metadata: Dict[str, int]):
+        self.content = content
+        self.usage_metadata = usage_metadata
+
+def _unit(*parts: Any) -> float:
+    """Deterministic pseudo-random number in [0, 1) derived from parts."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+class FakeLLMClient(LLMClient):
+    """
+    Offline LLM client with configurable latency, throughput, rate limits and output size.
+
+    Every decision is derived from a hash of the prompt and attempt number, so a
+    run produces the same outputs, 429s and delays whatever order concurrent
+    requests arrive in. A call takes latency (± jitter) plus the output tokens
+    at tokens_per_second, and fails with RateLimitError with probability
+    rate_limit_rate, retried with the same backoff scheme as the real clients.
+    """
+    def __init__(
+        self,
+        model: str = "fake-model",
+        latency: float = 0.05,
+        jitter: float = 0.2,
+        tokens_per_second: float = 2000.0,
+        rate_limit_rate: float = 0.0,
+        output_ratio: float = 0.3,
+        backoff: float = 0.01,
+        seed: int = 0,
+        max_retries: int = 3,
+        max_concurrency: int = 8,
+    ):
+        super().__init__("fake", model, 0.0, max_retries, max_concurrency)
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.output_ratio = output_ratio
+        self.backoff = backoff
+        self.seed = seed
+        self.calls = 0
+        self.rate_limited = 0
+
+    def respond(self, prompt: str) -> str:
+        """The Markdown the fake model returns for a prompt: a heading and the prompt's words, truncated."""
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+        words = prompt.split()
+        body = []
+        size = 0
+        target = int(len(prompt) * self.output_ratio)
+        for word in words:
+            if size >= target:
+                break
+            body.append(word)
+            size += len(word) + 1
+        return f"# Knowledge base {digest}\n\n" + " ".join(body)
+
+    async def _complete(self, prompt: str, attempt: int) -> FakeResponse:
+        self.calls += 1
+        if _unit(self.seed, prompt, attempt, "429") < self.rate_limit_rate:
+            self.rate_limited += 1
+            await asyncio.sleep(self.latency / 10)
+            raise RateLimitError("429 Too Many Requests")
+        content = self.respond(prompt)
+        usage = {'input_tokens': len(prompt) // 4, 'output_tokens': len(content) // 4}
+        spread = 1 + self.jitter * (2 * _unit(self.seed, prompt, attempt, "latency") - 1)
+        await asyncio.sleep(self.latency * spread + usage['output_tokens'] / self.tokens_per_second)
+        return FakeResponse(content, usage)
+
+    async def run_async(self, prompt: str) -> str:
+        """Return the fake response for a prompt, retrying simulated 429s with exponential backoff."""
+        with span('llm_request', provider='fake', model=self.model):
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    async with self._sem:
+                        with span('attempt', attempt=attempt):
+                            result = await self._complete(prompt, attempt)
+                        self._record_usage(prompt, result)
+                        return result.content
+                except RateLimitError:
+                    if attempt == self.max_retries:
+                        increment('llm_failures')
+                        raise
+                    increment('llm_retries')
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
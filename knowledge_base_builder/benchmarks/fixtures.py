@@ -0,0 +1,283 @@
+import io
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+_WORDS = (
+    "system data model pipeline request cache latency memory index query token chunk "
+    "source document server client network storage schema record batch stream worker "
+    "queue thread process metric report budget config deploy release version update "
+    "service endpoint response error retry timeout limit throughput capacity scale "
+    "knowledge base markdown summary section feature support user account project team"
+).split()
+
+class SyntheticCorpus:
+    """
+    Deterministic documents for benchmarks: every page, file and repository is
+    generated from the seed, so two runs with the same parameters fetch
+    byte-identical inputs.
+    """
+    def __init__(
+        self,
+        pages: int = 20,
+        pdfs: int = 5,
+        spreadsheets: int = 5,
+        github_files: int = 10,
+        paragraphs: int = 8,
+        seed: int = 0,
+    ):
+        self.pages = pages
+        self.pdfs = pdfs
+        self.spreadsheets = spreadsheets
+        self.github_files = github_files
+        self.paragraphs = paragraphs
+        self.seed = seed
+
+    def _rng(self, *key: object) -> random.Random:
+        return random.Random(f"{self.seed}:{key}")
+
+    def paragraph(self, rng: random.Random) -> str:
+        """One paragraph of 40-120 words."""
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(40, 120))]
+        return " ".join(words).capitalize() + "."
+
+    def text(self, *key: object) -> List[str]:
+        """The paragraphs of the document identified by key."""
+        rng = self._rng(*key)
+        return [self.paragraph(rng) for _ in range(self.paragraphs)]
+
+    def html(self, index: int) -> str:
+        """A web page with site-wide navigation and footer around the article."""
+        body = "\n".join(f"<p>{paragraph}</p>" for paragraph in self.text("page", index))
+        return (
+            f"<html><head><title>Page {index}</title></head><body>"
+            "<nav><a href='/'>Home</a> <a href='/docs'>Docs</a> <a href='/blog'>Blog</a></nav>"
+            f"<main><article><h1>Page {index}</h1>\n{body}</article></main>"
+            "<footer>Copyright Example Corp. All rights reserved.</footer>"
+            "</body></html>"
+        )
+
+    def sitemap(self, base_url: str) -> str:
+        """A sitemap listing every page."""
+        urls = "".join(f"<url><loc>{base_url}/pages/{i}.html</loc></url>" for i in range(self.pages))
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>')
+
+    def pdf(self, index: int) -> bytes:
+        """A minimal single-font PDF with one page per paragraph."""
+        pages = []
+        for paragraph in self.text("pdf", index):
+            words = paragraph.split()
+            lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+            escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+            pages.append("BT /F1 11 Tf 14 TL 50 780 Td " + " ".join(f"({line}) '" for line in escaped) + " ET")
+
+        font_id = 3
+        objects = [
+            "<< /Type /Catalog /Pages 2 0 R >>",
+            "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+                " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        ]
+        for i, stream in enumerate(pages):
+            content_id = 5 + 2 * i
+            objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                           f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>")
+            objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+        out = io.BytesIO()
+        out.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, obj in enumerate(objects, 1):
+            offsets.append(out.tell())
+            out.write(f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1"))
+        xref = out.tell()
+        out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+        for offset in offsets:
+            out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+        out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+        return out.getvalue()
+
+    def rows(self, index: int) -> List[Tuple[str, str, int, float]]:
+        """Rows of a spreadsheet: id, name, quantity, price."""
+        rng = self._rng("sheet", index)
+        return [(f"R{index}-{row}", " ".join(rng.choice(_WORDS) for _ in range(3)),
+                 rng.randint(1, 1000), round(rng.uniform(1, 500), 2))
+                for row in range(self.paragraphs * 25)]
+
+    def csv(self, index: int) -> bytes:
+        """A spreadsheet as CSV."""
+        lines = ["id,name,quantity,price"] + [",".join(map(str, row)) for row in self.rows(index)]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def xlsx(self, index: int) -> bytes:
+        """A spreadsheet as an Excel workbook."""
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["id", "name", "quantity", "price"])
+        for row in self.rows(index):
+            sheet.append(list(row))
+        out = io.BytesIO()
+        workbook.save(out)
+        return out.getvalue()
+
+    def markdown(self, path: str) -> str:
+        """A repository Markdown file."""
+        return f"# {path}\n\n" + "\n\n".join(self.text("github", path))
+
+    def github_paths(self) -> List[str]:
+        """Markdown paths of the fake repository, spread over nested directories."""
+        return [f"docs/section{i % 3}/file{i}.md" if i % 2 else f"file{i}.md" for i in range(self.github_files)]
+
+    def files(self, base_url: str) -> List[str]:
+        """URLs of every file source, for the 'files' input of a build."""
+        urls = [f"{base_url}/files/doc{i}.pdf" for i in range(self.pdfs)]
+        for i in range(self.spreadsheets):
+            urls.append(f"{base_url}/files/table{i}.xlsx" if i % 2 else f"{base_url}/files/table{i}.csv")
+        return urls
+
+class FixtureServer:
+    """
+    Local HTTP server for a SyntheticCorpus.
+
+    Serves /sitemap.xml, /pages/<n>.html, /files/doc<n>.pdf, /files/table<n>.csv|.xlsx,
+    a GitHub API stand-in under /github (users/<owner>/repos and
+    repos/<owner>/<repo>/contents/<path>) and raw files under /raw. Every response
+    is delayed by latency seconds to approximate a remote host. Use as a context
+    manager; pass `github_api_url` as GITHUB_API_URL to point a build at it.
+    """
+    OWNER = "bench"
+    REPO = "docs"
+
+    def __init__(self, corpus: Optional[SyntheticCorpus] = None, latency: float = 0.0):
+        self.corpus = corpus or SyntheticCorpus()
+        self.latency = latency
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cache: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def github_api_url(self) -> str:
+        return f"{self.url}/github"
+
+    @property
+    def github_repository(self) -> str:
+        return f"{self.OWNER}/{self.REPO}"
+
+    def start(self) -> "FixtureServer":
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests += 1
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                response = fixture.respond(self.path)
+                if response is None:
+                    self.send_error(404)
+                    return
+                body, content_type = response
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def respond(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Body and content type for a request path, or None for 404."""
+        # Generated files are cached so repeated requests measure the client, not the generator
+        if path not in self._cache:
+            parsed = urllib.parse.urlparse(path)
+            response = self._generate(parsed.path, urllib.parse.parse_qs(parsed.query))
+            if response is None:
+                return None
+            self._cache[path] = response
+        return self._cache[path]
+
+    def _generate(self, path: str, query: Dict[str, List[str]]) -> Optional[Tuple[bytes, str]]:
+        corpus = self.corpus
+        parts = path.strip("/").split("/")
+        name, _, ext = parts[-1].rpartition(".")
+
+        if path == "/sitemap.xml":
+            return corpus.sitemap(self.url).encode("utf-8"), "application/xml"
+        if parts[0] == "pages" and len(parts) == 2 and ext == "html" and name.isdigit() and int(name) < corpus.pages:
+            return corpus.html(int(name)).encode("utf-8"), "text/html; charset=utf-8"
+        if parts[0] == "files" and len(parts) == 2:
+            if name.startswith("doc") and name[3:].isdigit() and ext == "pdf" and int(name[3:]) < corpus.pdfs:
+                return corpus.pdf(int(name[3:])), "application/pdf"
+            if name.startswith("table") and name[5:].isdigit() and int(name[5:]) < corpus.spreadsheets:
+                if ext == "csv":
+                    return corpus.csv(int(name[5:])), "text/csv"
+                if ext == "xlsx":
+                    return (corpus.xlsx(int(name[5:])),
+                            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+            return None
+        if parts[0] == "github":
+            return self._github(parts[1:], query)
+        if parts[0] == "raw" and parts[1:3] == [self.OWNER, self.REPO]:
+            file_path = "/".join(parts[3:])
+            if file_path in corpus.github_paths():
+                return corpus.markdown(file_path).encode("utf-8"), "text/plain; charset=utf-8"
+        return None
+
+    def _github(self, parts: List[str], query: Dict[str, List[str]]) -> Optional[Tuple[bytes, str]]:
+        """The subset of the GitHub REST API that GitHubProcessor uses."""
+        if parts[:1] == ["users"] and parts[1:] == [self.OWNER, "repos"]:
+            page = int(query.get("page", ["1"])[0])
+            repos = [{"name": self.REPO}] if page == 1 else []
+            return json.dumps(repos).encode("utf-8"), "application/json"
+        if parts[:3] != ["repos", self.OWNER, self.REPO] or parts[3:4] != ["contents"]:
+            return None
+
+        directory = "/".join(parts[4:])
+        prefix = f"{directory}/" if directory else ""
+        entries: Dict[str, Dict[str, str]] = {}
+        for file_path in self.corpus.github_paths():
+            if not file_path.startswith(prefix):
+                continue
+            child = file_path[len(prefix):].split("/")[0]
+            child_path = prefix + child
+            if child_path == file_path:
+                entries[child] = {"type": "file", "name": child, "path": child_path,
+                                  "download_url": f"{self.url}/raw/{self.OWNER}/{self.REPO}/{child_path}"}
+            else:
+                entries[child] = {"type": "dir", "name": child, "path": child_path, "download_url": None}
+        if not entries:
+            return None
+        return json.dumps(sorted(entries.values(), key=lambda entry: entry["name"])).encode("utf-8"), "application/json"
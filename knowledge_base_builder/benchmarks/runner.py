@@ -0,0 +1,258 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from knowledge_base_builder.benchmarks.fake_llm import FakeLLMClient
+from knowledge_base_builder.benchmarks.fixtures import FixtureServer, SyntheticCorpus
+from knowledge_base_builder.metrics import percentile
+
+class Scenario(NamedTuple):
+    """One benchmark workload: a synthetic corpus, a fake provider and the build settings."""
+    name: str
+    pages: int = 0
+    pdfs: int = 0
+    spreadsheets: int = 0
+    github_files: int = 0
+    paragraphs: int = 8
+    http_latency: float = 0.005
+    llm_latency: float = 0.05
+    tokens_per_second: float = 2000.0
+    rate_limit_rate: float = 0.0
+    output_ratio: float = 0.3
+    llm_workers: int = 8
+    seed: int = 0
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in [
+    Scenario("smoke", pages=5, pdfs=2, spreadsheets=2, github_files=3),
+    Scenario("website", pages=200, paragraphs=12),
+    Scenario("files", pdfs=20, spreadsheets=20),
+    Scenario("github", github_files=60),
+    Scenario("rate_limited", pages=100, paragraphs=20, rate_limit_rate=0.3),
+    Scenario("mixed", pages=100, pdfs=10, spreadsheets=10, github_files=30, paragraphs=12),
+]}
+
+# Span names whose latency percentiles are reported
+LATENCY_STAGES = ['source', 'download', 'extract', 'chunk', 'llm_request', 'attempt', 'build']
+
+# Result fields compared across runs, and whether a higher value is better
+COMPARED = {
+    'wall_seconds': False,
+    'peak_rss_mb': False,
+    'throughput.documents_per_second': True,
+    'throughput.input_mb_per_second': True,
+    'latency.source.p95': False,
+    'latency.chunk.p95': False,
+    'latency.llm_request.p95': False,
+}
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, where the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_scenario(scenario: Scenario, quiet: bool = True) -> Dict[str, Any]:
+    """Build a knowledge base from the scenario's fixture server with a fake LLM and summarize the run."""
+    from knowledge_base_builder.kb_builder import KBBuilder
+
+    corpus = SyntheticCorpus(
+        pages=scenario.pages,
+        pdfs=scenario.pdfs,
+        spreadsheets=scenario.spreadsheets,
+        github_files=scenario.github_files,
+        paragraphs=scenario.paragraphs,
+        seed=scenario.seed,
+    )
+    client = FakeLLMClient(
+        latency=scenario.llm_latency,
+        tokens_per_second=scenario.tokens_per_second,
+        rate_limit_rate=scenario.rate_limit_rate,
+        output_ratio=scenario.output_ratio,
+        seed=scenario.seed,
+        max_retries=5,
+        max_concurrency=scenario.llm_workers,
+    )
+    with FixtureServer(corpus, latency=scenario.http_latency) as server, tempfile.TemporaryDirectory() as tmp:
+        sources: Dict[str, Any] = {'files': corpus.files(server.url)}
+        if scenario.pages:
+            sources['sitemap_url'] = f"{server.url}/sitemap.xml"
+        if scenario.github_files:
+            sources['github_repositories'] = [server.github_repository]
+        config = {
+            'GITHUB_API_URL': server.github_api_url,
+            'LLM_WORKERS': scenario.llm_workers,
+            'PIPELINE_QUEUE_SIZE': 16,
+        }
+        output_file = os.path.join(tmp, "kb.md")
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            builder = KBBuilder(config, llm_client=client)
+            builder.build(sources, output_file)
+        output_chars = os.path.getsize(output_file) if os.path.exists(output_file) else 0
+        requests_served = server.requests
+
+    metrics = builder.metrics
+    wall = next((span.duration for span in metrics.spans if span.name == 'build'), 0.0)
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in metrics.spans:
+        durations[span.name].append(span.duration)
+    counters = dict(metrics.counters)
+    documents = counters.get('documents', 0)
+    input_mb = counters.get('bytes_fetched', 0) / (1024 * 1024)
+
+    return {
+        'scenario': scenario.name,
+        'params': scenario._asdict(),
+        'wall_seconds': wall,
+        'documents': documents,
+        'chunks': counters.get('chunks', 0),
+        'output_bytes': output_chars,
+        'http_requests': requests_served,
+        'llm_calls': client.calls,
+        'llm_rate_limited': client.rate_limited,
+        'throughput': {
+            'documents_per_second': documents / wall if wall else 0.0,
+            'input_mb_per_second': input_mb / wall if wall else 0.0,
+            'llm_tokens_per_second': (counters.get('llm_input_tokens', 0) + counters.get('llm_output_tokens', 0)) / wall if wall else 0.0,
+        },
+        'latency': {
+            name: {
+                'count': len(durations[name]),
+                'p50': percentile(durations[name], 0.5),
+                'p95': percentile(durations[name], 0.95),
+                'p99': percentile(durations[name], 0.99),
+                'max': max(durations[name]),
+            }
+            for name in LATENCY_STAGES if durations[name]
+        },
+        'counters': counters,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+def _run_isolated(scenario: Scenario, queue: multiprocessing.Queue) -> None:
+    queue.put(run_scenario(scenario))
+
+def run_isolated(scenario: Scenario) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter so its peak RSS and warm caches are its own."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_isolated, args=(scenario, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(names: List[str], isolated: bool = True) -> Dict[str, Any]:
+    """Run the named scenarios and return a report that can be saved and compared with another commit's."""
+    results = {}
+    for name in names:
+        print(f"🏁 Running scenario {name}...")
+        result = run_isolated(SCENARIOS[name]) if isolated else run_scenario(SCENARIOS[name])
+        results[name] = result
+        llm = result['latency'].get('llm_request', {})
+        rss = f"{result['peak_rss_mb']:.0f} MiB" if result['peak_rss_mb'] is not None else "n/a"
+        print(f"  ⏱️ {result['wall_seconds']:.2f}s, {result['documents']:.0f} documents "
+              f"({result['throughput']['documents_per_second']:.1f}/s), {result['chunks']:.0f} chunks, "
+              f"LLM p50/p95 {llm.get('p50', 0):.3f}/{llm.get('p95', 0):.3f}s, peak RSS {rss}")
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'results': results,
+    }
+
+def _lookup(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Relative change of every compared field for scenarios present in both reports.
+    A change is a regression when it is worse than threshold (0.1 = 10%).
+    """
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        for path, higher_is_better in COMPARED.items():
+            before = _lookup(baseline['results'][name], path)
+            after = _lookup(result, path)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            rows.append({'scenario': name, 'metric': path, 'baseline': before, 'current': after,
+                         'change': change, 'regression': worse > threshold})
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for `python -m knowledge_base_builder.benchmarks`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the knowledge base pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run = subparsers.add_parser("run", help="Run benchmark scenarios")
+    run.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                     help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    run.add_argument("--output", "-o", help="Write the JSON report to this path")
+    run.add_argument("--in-process", action="store_true", help="Run scenarios in this process (shared peak RSS)")
+    run.add_argument("--baseline", help="Compare with an earlier JSON report")
+    run.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown counted as a regression")
+    diff = subparsers.add_parser("compare", help="Compare two JSON reports")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if unknown := [name for name in args.scenarios if name not in SCENARIOS]:
+            parser.error(f"unknown scenarios: {', '.join(unknown)}")
+        report = run_suite(args.scenarios or list(SCENARIOS), isolated=not args.in_process)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"✅ Benchmark report written to: {args.output}")
+        if not args.baseline:
+            return 0
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, "r", encoding="utf-8") as f:
+            report = json.load(f)
+
+    rows = compare(baseline, report, args.threshold)
+    print(f"📊 {baseline.get('commit') or 'baseline'} → {report.get('commit') or 'current'}")
+    for row in rows:
+        marker = "❌" if row['regression'] else "  "
+        print(f"{marker} {row['scenario']:<14} {row['metric']:<34} "
+              f"{row['baseline']:>10.3f} → {row['current']:>10.3f} ({row['change']:+.1%})")
+    regressions = sum(row['regression'] for row in rows)
+    if regressions:
+        print(f"❌ {regressions} regressions above {args.threshold:.0%}")
+    return 1 if regressions else 0
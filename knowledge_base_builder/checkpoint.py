@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from knowledge_base_builder.collector import source_id
+from knowledge_base_builder.metrics import increment
+
+class BuildCheckpoint:
+    """
+    Durable record of a build's finished work under <root>/<build_id>/.
+
+    Extracted text is stored per source in sources/<source id>.txt and every
+    LLM-processed chunk in chunks/<sha256 of the chunk>.md, each written
+    atomically as soon as it is done. Resuming a build with the same ID skips
+    every source and chunk already on disk; because collection order is
+    deterministic, the same inputs cut the same chunks and hit the cache.
+    A build that finishes all of its work removes its checkpoint.
+    """
+
+    def __init__(self, root: str = ".kb_builds", build_id: Optional[str] = None):
+        self.build_id = build_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.path = os.path.join(root, self.build_id)
+        self.sources_dir = os.path.join(self.path, "sources")
+        self.chunks_dir = os.path.join(self.path, "chunks")
+        os.makedirs(self.sources_dir, exist_ok=True)
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        self.reused_sources = 0
+        self.reused_chunks = 0
+
+    def remove(self) -> None:
+        """Delete this build's checkpoint directory."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        """Write through a temporary file so a crash never leaves a partial entry."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _source_path(self, source: str) -> str:
+        return os.path.join(self.sources_dir, f"{source_id(source)}.txt")
+
+    def _chunk_path(self, chunk: str) -> str:
+        digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+        return os.path.join(self.chunks_dir, f"{digest}.md")
+
+    def save_source(self, source: str, text: str) -> None:
+        """Store the extracted text of a source."""
+        self._write(self._source_path(source), text)
+
+    def load_source(self, source: str) -> Optional[str]:
+        """Return the stored text of a source, or None if it has not been extracted yet."""
+        text = self._read(self._source_path(source))
+        if text is not None:
+            self.reused_sources += 1
+            increment('source_cache_hits')
+        return text
+
+    def save_chunk(self, chunk: str, processed: str) -> None:
+        """Store the LLM output for a chunk."""
+        self._write(self._chunk_path(chunk), processed)
+
+    def load_chunk(self, chunk: str) -> Optional[str]:
+        """Return the stored LLM output for a chunk, or None if it has not been processed yet."""
+        processed = self._read(self._chunk_path(chunk))
+        if processed is not None:
+            self.reused_chunks += 1
+            increment('chunk_cache_hits')
+        return processed
+
+    def save_manifest(self, sources: Dict[str, Any], output_file: str) -> None:
+        """Record what the build was started with so it can be resumed without repeating it."""
+        manifest = {"build_id": self.build_id, "sources": sources, "output_file": output_file}
+        self._write(os.path.join(self.path, "manifest.json"), json.dumps(manifest, indent=2))
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        """Return the manifest of an earlier run of this build, if any."""
+        manifest = self._read(os.path.join(self.path, "manifest.json"))
+        return json.loads(manifest) if manifest is not None else None
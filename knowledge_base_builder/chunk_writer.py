@@ -0,0 +1,124 @@
+import hashlib
+import json
+import re
+from typing import Dict, List, NamedTuple, Optional, TextIO
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+_FENCE = re.compile(r'^\s*(```|~~~)')
+
+class Section(NamedTuple):
+    """A piece of a Markdown document under its heading path."""
+    heading_path: List[str]
+    text: str
+
+def split_sections(markdown: str, max_chars: int = 4000) -> List[Section]:
+    """
+    Split Markdown at its headings, keeping the path of enclosing headings for each
+    section. Headings inside code fences are ignored, and sections longer than
+    max_chars are split further at blank lines (or hard, for a single long paragraph).
+    """
+    sections: List[Section] = []
+    path: List[str] = []
+    lines: List[str] = []
+    in_fence = False
+
+    def flush():
+        text = '\n'.join(lines).strip()
+        if text:
+            sections.extend(Section(list(path), part) for part in _split_long(text, max_chars))
+        lines.clear()
+
+    for line in markdown.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        heading = None if in_fence else _HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            del path[level - 1:]
+            # Skipped levels (# then ###) keep the path flat rather than inventing blanks
+            path.append(heading.group(2))
+        lines.append(line)
+    flush()
+    return sections
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    parts: List[str] = []
+    current = ''
+    for paragraph in re.split(r'\n\s*\n', text):
+        while len(paragraph) > max_chars:
+            if current:
+                parts.append(current)
+                current = ''
+            parts.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + 2 + len(paragraph) > max_chars:
+            parts.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        parts.append(current)
+    return parts
+
+class ChunkJSONLWriter:
+    """
+    Stream processed chunks to a JSONL file for vector-database ingestion.
+
+    Every LLM output is split into heading sections and written as one record per
+    section as soon as its chunk completes:
+
+        {"id", "chunk", "sources", "heading_path", "tokens", "hash", "text"}
+
+    `id` is derived from the chunk position, its sources and the section's heading
+    path, so it stays the same across builds of the same inputs while `hash`
+    (SHA-256 of the text) changes with the content; indexers can upsert records
+    whose hash changed and skip the rest. `tokens` is estimated at 4 characters
+    per token. Records follow completion order; `chunk` gives the position in
+    the knowledge base.
+    """
+
+    def __init__(self, path: str, max_chars: int = 4000):
+        self.path = path
+        self.max_chars = max_chars
+        self.records = 0
+        self._file: Optional[TextIO] = open(path, 'w', encoding='utf-8')
+
+    def write(self, index: int, outputs: List[str], sources: Dict[str, int]) -> int:
+        """Write the records of one processed chunk and return how many were written."""
+        # Sources ordered by how much of the chunk they contributed
+        urls = [url for url, _ in sorted(sources.items(), key=lambda item: (-item[1], item[0]))]
+        lines = []
+        occurrences: Dict[str, int] = {}
+        for output in outputs:
+            for section in split_sections(output, self.max_chars):
+                key = json.dumps([index, urls, section.heading_path])
+                occurrence = occurrences.get(key, 0)
+                occurrences[key] = occurrence + 1
+                lines.append(json.dumps({
+                    'id': hashlib.sha256(f"{key}#{occurrence}".encode('utf-8')).hexdigest()[:16],
+                    'chunk': index,
+                    'sources': urls,
+                    'heading_path': section.heading_path,
+                    'tokens': len(section.text) // 4,
+                    'hash': hashlib.sha256(section.text.encode('utf-8')).hexdigest(),
+                    'text': section.text,
+                }, ensure_ascii=False))
+        if lines:
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+        self.records += len(lines)
+        return len(lines)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ChunkJSONLWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -3,8 +3,9 @@
 import os
 import argparse
 import json
+import threading
 from dotenv import load_dotenv
-from knowledge_base_builder import KBBuilder
+from knowledge_base_builder.checkpoint import BuildCheckpoint
 
 def main():
     """Main entry point for CLI."""
@@ -17,8 +18,8 @@ def main():
     )
     
     # Basic configuration
-    parser.add_argument("--output", "-o", default="final_knowledge_base.md",
-                      help="Output file path for the knowledge base (default: final_knowledge_base.md)")
+    parser.add_argument("--output", "-o",
+                      help="Output file path for the knowledge base (default: final_knowledge_base.md; required with --git-changed-since)")
     
     # LLM Provider selection
     parser.add_argument("--llm-provider", default=os.environ.get('LLM_PROVIDER', 'gemini'),
@@ -57,7 +58,15 @@ def main():
     
     # Sources - New unified approach
     parser.add_argument("--file", "-f", action="append", default=[],
-                      help="File URL or local file path (any supported format) (can be used multiple times)")
+                      help="File URL, local file path, directory or glob such as 'docs/**/*.md' (can be used multiple times)")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                      help="Only take files matching this pattern from directories and globs (can be used multiple times)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                      help="Skip files and directories matching this pattern (can be used multiple times)")
+    parser.add_argument("--max-file-mb", type=float, metavar="MB",
+                      help="Skip files larger than this when expanding directories and globs")
+    parser.add_argument("--no-gitignore", action="store_true",
+                      help="Also take files ignored by .gitignore when expanding directories and globs")
     
     # Sources - Legacy support
     parser.add_argument("--pdf", "-p", action="append", default=[],
@@ -67,21 +76,97 @@ def main():
     parser.add_argument("--spreadsheet", "-s", action="append", default=[],
                       help="[Legacy] Spreadsheet URLs or local file paths (.csv, .tsv, .xlsx, .ods)")
     parser.add_argument("--web-content", "-w", action="append", default=[],
-                      help="[Legacy] Web content URLs or local file paths (.html, .xml, .json, .yaml/.yml)")
+                      help="[Legacy] Web content URLs or local file paths (.html, .xml, .json, .jsonl/.ndjson, .yaml/.yml)")
     parser.add_argument("--web-url", "-u", action="append", default=[],
                       help="[Legacy] Individual web page URLs")
     
     # Website / Sitemap
     parser.add_argument("--sitemap", "-m", 
                       help="Process an entire website using its sitemap URL")
+    parser.add_argument("--no-main-content", action="store_true",
+                      help="Keep whole web pages instead of extracting their main content")
+    
+    # Local git repositories
+    parser.add_argument("--git-repo", action="append", default=[], metavar="PATH",
+                      help="Local git checkout or bare repository to read tracked docs from (can be used multiple times)")
+    parser.add_argument("--git-rev", default="HEAD",
+                      help="Commit, branch or tag of --git-repo to read (default: HEAD)")
+    parser.add_argument("--git-changed-since", metavar="SHA",
+                      help="Delta build: the KB holds only the files of --git-repo changed since this commit (requires --output)")
     
     # GitHub repositories
     parser.add_argument("--github-repo", "-g", action="append", default=[],
                       help="GitHub repositories to process (format: username/repo or https://github.com/username/repo)")
     
+    # Checkpointing
+    parser.add_argument("--checkpoint", action="store_true",
+                      help="Save extracted sources and processed chunks so an interrupted build can be resumed")
+    parser.add_argument("--checkpoint-dir", default=os.environ.get('KB_CHECKPOINT_DIR'),
+                      help="Directory for build checkpoints; implies --checkpoint (default: .kb_builds)")
+    parser.add_argument("--keep-checkpoint", action="store_true",
+                      help="Keep the checkpoint of a build that finished (by default only unfinished builds keep theirs)")
+    parser.add_argument("--resume", metavar="BUILD_ID",
+                      help="Resume an interrupted build, skipping sources and chunks it already finished (implies --checkpoint)")
+    
+    # Watch mode
+    parser.add_argument("--watch", action="store_true",
+                      help="Keep running and update the KB when local --file paths or directories change")
+    parser.add_argument("--watch-interval", type=float, default=1.0,
+                      help="Seconds between scans for changes in watch mode (default: 1.0)")
+    parser.add_argument("--watch-debounce", type=float, default=0.5,
+                      help="Seconds files must stay unchanged before a rebuild (default: 0.5)")
+    
+    # Distributed builds
+    parser.add_argument("--queue", metavar="PATH",
+                      help="Coordinate the build through a SQLite task queue served by knowledge-base-builder-worker processes")
+    
+    # Metrics export
+    parser.add_argument("--metrics-json", metavar="PATH",
+                      help="Write a JSON run report with per-stage timings, counters and histograms")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                      help="Write the run's metrics in Prometheus text format")
+    
+    # Chunk records
+    parser.add_argument("--chunks-jsonl", metavar="PATH",
+                      help="Also write processed chunks as JSONL records (id, sources, heading path, tokens, hash, text)")
+    
+    # Sharded output
+    parser.add_argument("--shard-dir", metavar="DIR",
+                      help="Also write the KB as size-bounded shards with an index.json of its sections")
+    parser.add_argument("--shard-max-mb", type=float, default=64,
+                      help="Maximum uncompressed size of one shard in MB (default: 64)")
+    parser.add_argument("--shard-compression", choices=['gzip', 'zstd'],
+                      help="Compress shards in independently readable gzip members or zstd frames")
+    parser.add_argument("--shard-by-source", action="store_true",
+                      help="Start a new shard whenever the main source moves to another host or directory")
+    parser.add_argument("--group-by-topic", action="store_true",
+                      help="Cluster documents by topic and chunk related documents together (waits for all sources)")
+    parser.add_argument("--topic-groups", type=int, default=0,
+                      help="Number of topic groups for --group-by-topic (default: about sqrt(documents / 2))")
+    parser.add_argument("--embeddings", action="store_true",
+                      help="Also store a vector per KB section next to the output (<output>.vectors.npy)")
+    parser.add_argument("--embedder",
+                      help="Embedder: 'hashing' (default), module:attribute or an installed embedder plugin")
+    parser.add_argument("--llms-txt", metavar="DIR",
+                      help="Also write an llms.txt index, llms-full.txt and one Markdown page per source to DIR")
+    parser.add_argument("--llms-title", default="Knowledge Base", help="Title of the llms.txt index")
+    parser.add_argument("--llms-summary", help="Summary line of the llms.txt index")
+    parser.add_argument("--llms-base-url",
+                      help="URL the llms.txt directory is published at, for absolute page links")
+    
+    # LLM budget
+    parser.add_argument("--max-cost", type=float, metavar="USD",
+                      help="Stop sending chunks to the LLM once the build has cost this much")
+    parser.add_argument("--max-tokens", type=int, metavar="N",
+                      help="Stop sending chunks to the LLM once the build has used this many tokens")
+    
     # Parse arguments
     args = parser.parse_args()
     
+    # Checkpointing is opt-in, so plain runs leave nothing behind in the working directory
+    if not args.checkpoint_dir and (args.checkpoint or args.resume):
+        args.checkpoint_dir = '.kb_builds'
+    
     # Build config dictionary
     config = {
         # LLM provider selection
@@ -105,10 +190,68 @@ def main():
         # GitHub configuration
         'GITHUB_USERNAME': args.github_username or os.environ.get('GITHUB_USERNAME', ''),
         'GITHUB_API_KEY': args.github_api_key or os.environ.get('GITHUB_API_KEY', ''),
+        
+        # Web page extraction
+        'EXTRACT_MAIN_CONTENT': not args.no_main_content,
+        
+        # Directory and glob sources
+        'FILE_INCLUDE': args.include,
+        'FILE_EXCLUDE': args.exclude,
+        'MAX_FILE_MB': args.max_file_mb,
+        'RESPECT_GITIGNORE': not args.no_gitignore,
+        
+        # Checkpointing
+        'CHECKPOINT_DIR': args.checkpoint_dir,
+        'BUILD_ID': args.resume,
+        'KEEP_CHECKPOINTS': args.keep_checkpoint,
+        
+        # Metrics export
+        'METRICS_JSON': args.metrics_json,
+        'METRICS_PROM': args.metrics_prom,
+        
+        # Chunk records
+        'CHUNKS_JSONL': args.chunks_jsonl,
+        
+        # Sharded output
+        'SHARD_DIR': args.shard_dir,
+        'SHARD_MAX_MB': args.shard_max_mb,
+        'SHARD_COMPRESSION': args.shard_compression,
+        'SHARD_BY_SOURCE': args.shard_by_source,
+        
+        # Topic grouping
+        'GROUP_BY_TOPIC': args.group_by_topic,
+        'TOPIC_GROUPS': args.topic_groups,
+        
+        # Section vectors
+        'EMBEDDINGS': args.embeddings,
+        'EMBEDDER': args.embedder,
+        
+        # llms.txt output
+        'LLMS_TXT_DIR': args.llms_txt,
+        'LLMS_TXT_TITLE': args.llms_title,
+        'LLMS_TXT_SUMMARY': args.llms_summary,
+        'LLMS_TXT_BASE_URL': args.llms_base_url,
+        
+        # LLM budget
+        'MAX_COST': args.max_cost,
+        'MAX_TOKENS': args.max_tokens,
     }
     
-    # Validate required API keys based on selected provider
-    if args.llm_provider == 'gemini' and not config['GOOGLE_API_KEY']:
+    # A delta KB holds only the changed files, so it must not silently replace the full one
+    if args.git_changed_since and not args.output:
+        parser.error("--git-changed-since writes a delta KB of the changed files only; "
+                     "pass --output so it does not overwrite the full knowledge base.")
+    if args.watch:
+        if args.queue:
+            parser.error("--watch cannot be combined with --queue.")
+        if not args.file or any(path.startswith(('http://', 'https://', 'file://')) or not os.path.exists(path)
+                                for path in args.file):
+            parser.error("--watch needs existing local paths passed with --file.")
+    
+    # Validate required API keys based on selected provider; a coordinator leaves LLM calls to its workers
+    if args.queue:
+        pass
+    elif args.llm_provider == 'gemini' and not config['GOOGLE_API_KEY']:
         parser.error("Google API Key is required when using Gemini. Provide via --google-api-key or GOOGLE_API_KEY environment variable.")
     elif args.llm_provider == 'openai' and not config['OPENAI_API_KEY']:
         parser.error("OpenAI API Key is required when using OpenAI. Provide via --openai-api-key or OPENAI_API_KEY environment variable.")
@@ -132,14 +275,115 @@ def main():
         
         # GitHub repositories
         'github_repositories': args.github_repo,
+        
+        # Local git repositories
+        'git_repositories': [{'path': path, 'rev': args.git_rev, 'changed_since': args.git_changed_since} for path in args.git_repo],
     }
     
+    output_file = args.output or "final_knowledge_base.md"
+    
+    # Resuming without sources reuses the ones the build was started with
+    if args.resume and not any(sources.values()):
+        if not os.path.isdir(os.path.join(args.checkpoint_dir, args.resume)):
+            parser.error(f"No build {args.resume} found in {args.checkpoint_dir}.")
+        manifest = BuildCheckpoint(args.checkpoint_dir, args.resume).load_manifest()
+        if manifest is None:
+            parser.error(f"Build {args.resume} has no manifest; pass its sources again to resume it.")
+        sources = manifest['sources']
+        output_file = manifest['output_file']
+    
     # Initialize KB Builder
-    kb_builder = KBBuilder(config)
+    # Imported here so --help and argument errors do not pay for loading the pipeline
+    from knowledge_base_builder import KBBuilder
+
+    if args.queue:
+        from knowledge_base_builder.distributed import DistributedKBBuilder, SQLiteTaskQueue
+        kb_builder = DistributedKBBuilder(config, SQLiteTaskQueue(args.queue))
+    else:
+        kb_builder = KBBuilder(config)
     
     # Build and save knowledge base
-    output_path = kb_builder.build(sources, args.output)
+    if args.watch:
+        from knowledge_base_builder.watch import KBWatcher
+
+        watcher = KBWatcher(kb_builder, args.file, output_file, args.watch_interval, args.watch_debounce)
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            print(f"👋 Stopped watching after {watcher.rebuilds} updates")
+        return
+    
+    output_path = kb_builder.build(sources, output_file)
     print(f"Knowledge base built successfully: {output_path}")
 
+def _environment_config(parser: argparse.ArgumentParser) -> dict:
+    """Provider keys and models from the environment, as for the CLI's defaults."""
+    config = {
+        key: os.environ[key]
+        for key in ('GOOGLE_API_KEY', 'GEMINI_MODEL', 'OPENAI_API_KEY', 'OPENAI_MODEL', 'ANTHROPIC_API_KEY',
+                    'ANTHROPIC_MODEL', 'GITHUB_API_KEY', 'LLM_WORKERS')
+        if os.environ.get(key)
+    }
+    # Same variable as the CLI's --checkpoint-dir default
+    if os.environ.get('KB_CHECKPOINT_DIR'):
+        config['CHECKPOINT_DIR'] = os.environ['KB_CHECKPOINT_DIR']
+    if not any(config.get(key) for key in ('GOOGLE_API_KEY', 'OPENAI_API_KEY', 'ANTHROPIC_API_KEY')):
+        parser.error("An LLM API key is required: set GOOGLE_API_KEY, OPENAI_API_KEY or ANTHROPIC_API_KEY.")
+    return config
+
+def serve_main():
+    """Entry point for the long-running build service."""
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(
+        description="Serve knowledge base builds over a local HTTP API, keeping the builder warm between jobs."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--socket", metavar="PATH", help="Listen on a Unix socket instead of a TCP port")
+    parser.add_argument("--workers", type=int, default=2, help="Builds run at the same time (default: 2)")
+    parser.add_argument("--tenant-limit", type=int, default=1,
+                      help="Builds one tenant may run at the same time (default: 1)")
+    parser.add_argument("--output-dir", default=".",
+                      help="Directory job outputs are written to; jobs cannot write outside it (default: .)")
+    args = parser.parse_args()
+    
+    config = _environment_config(parser)
+    
+    from knowledge_base_builder.server import BuildServer
+
+    server = BuildServer(config, output_dir=args.output_dir, workers=args.workers, tenant_limit=args.tenant_limit)
+    server.start(args.host, args.port, args.socket)
+    print(f"🛰️ Build service listening on {server.address} with {args.workers} workers")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("👋 Shutting down build service")
+    finally:
+        server.stop()
+
+def worker_main():
+    """Entry point for a distributed build worker."""
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(
+        description="Run fetch, extraction and LLM tasks from a distributed build's task queue."
+    )
+    parser.add_argument("--queue", required=True, metavar="PATH", help="SQLite task queue shared with the coordinator")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tasks run at the same time (default: 8)")
+    parser.add_argument("--until-idle", action="store_true", help="Exit once no task is left instead of waiting for more")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before a task fails (default: 3)")
+    args = parser.parse_args()
+    
+    config = _environment_config(parser)
+    
+    from knowledge_base_builder.distributed import SQLiteTaskQueue, Worker
+
+    worker = Worker(SQLiteTaskQueue(args.queue, max_attempts=args.max_attempts), config, concurrency=args.concurrency)
+    try:
+        worker.run(until_idle=args.until_idle)
+    except KeyboardInterrupt:
+        print(f"👋 Worker stopped after {worker.completed} tasks")
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
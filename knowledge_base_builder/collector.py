@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+def source_id(source: str) -> str:
+    """Stable identifier of a source, independent of when or in which order it is fetched."""
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+class OrderedCollector:
+    """
+    Reassemble concurrently collected documents in enumeration order.
+
+    Every source reserves a slot when it is enumerated, before any download
+    starts. Documents are added to their slot as they finish in any order, and
+    a slot's documents are passed to emit only once every earlier slot has been
+    closed. The emitted sequence, and with it chunk boundaries and everything
+    keyed on them, is therefore the same on every run. Finished documents wait
+    here behind a slow earlier slot, so callers bound the slots reserved at a
+    time with wait_for_room.
+    """
+
+    def __init__(self, emit: Callable[[str, str], Awaitable[None]]):
+        self._emit = emit
+        self._documents: Dict[int, List[Tuple[str, str]]] = {}
+        self._closed: Set[int] = set()
+        self._next_release = 0
+        self._lock = asyncio.Lock()
+        self._released = asyncio.Event()
+        self.sources: List[Tuple[str, str]] = []  # (id, source) per slot
+
+    def reserve(self, source: str) -> int:
+        """Reserve the next slot for a source and return its index."""
+        self.sources.append((source_id(source), source))
+        self._documents[len(self.sources) - 1] = []
+        return len(self.sources) - 1
+
+    def add(self, slot: int, text: str, source: str) -> None:
+        """Add a document to an open slot."""
+        self._documents[slot].append((text, source))
+
+    async def close(self, slot: int) -> None:
+        """Mark a slot complete (whether or not it produced anything) and release what is ready."""
+        self._closed.add(slot)
+        # The lock keeps emits in slot order even while one of them waits on backpressure
+        async with self._lock:
+            while self._next_release in self._closed:
+                for text, source in self._documents.pop(self._next_release):
+                    await self._emit(text, source)
+                self._closed.discard(self._next_release)
+                self._next_release += 1
+                self._released.set()
+
+    async def wait_for_room(self, limit: int) -> None:
+        """Wait until fewer than limit slots are reserved and not yet released."""
+        while self.pending >= limit:
+            self._released.clear()
+            await self._released.wait()
+
+    async def collect(self, text: str, source: str) -> None:
+        """Reserve, fill and close a slot for a document collected in order."""
+        slot = self.reserve(source)
+        self.add(slot, text, source)
+        await self.close(slot)
+
+    @property
+    def pending(self) -> int:
+        """Number of reserved slots not yet released."""
+        return len(self.sources) - self._next_release
@@ -0,0 +1,43 @@
+import asyncio
+import contextvars
+import functools
+import weakref
+from typing import Any, Callable
+
+async def to_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call in the default executor with the caller's context.
+
+    Same as asyncio.to_thread, which only exists from Python 3.9: context
+    variables such as the active metrics and usage tracker follow the call.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, func, *args, **kwargs))
+
+class LoopSemaphore:
+    """
+    An asyncio.Semaphore per event loop, created inside the loop on first use.
+
+    Before Python 3.10 a semaphore binds to the thread's current loop when it
+    is created, which fails in a thread without one (a build worker, or after
+    asyncio.run) and breaks when the object is used from another loop.
+    """
+
+    def __init__(self, value: int):
+        self.value = value
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _current(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.value)
+        return semaphore
+
+    async def __aenter__(self) -> None:
+        await self._current().acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._current().release()
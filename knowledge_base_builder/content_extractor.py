@@ -0,0 +1,141 @@
+import re
+import urllib.parse
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from knowledge_base_builder.html_cleaner import Block
+
+class MainContentExtractor:
+    """
+    Readability-style main-content selection over rendered HTML blocks.
+
+    Each block is scored by its text length, its link density and the classes/ids
+    of the elements around it. Blocks inside obvious page chrome (footers, cookie
+    banners, sidebars, share bars, ...) or made mostly of links are dropped. The
+    region spanned by the page's dense text blocks is kept, extended over the
+    headings, code, lists and tables around it and over anything inside a
+    content container (main, article, ...), so short sections such as
+    "Usage" or "Options" after the last long paragraph survive.
+    """
+
+    # Blocks that carry document structure even when they are short
+    STRUCTURAL_KINDS = ('heading', 'code', 'list_item', 'table')
+
+    BOILERPLATE_HINTS = re.compile(
+        r'(?:^|[\s_-])(?:footer|sidebar|aside|cookies?|consent|gdpr|banner|breadcrumbs?|'
+        r'share|sharing|social|related|advert\w*|ads?|sponsor\w*|promo\w*|newsletter|'
+        r'subscribe|signup|comments?|pagination|pager|menu|masthead|toolbar|skip-link|'
+        r'popup|modal|widget)(?:$|[\s_-])',
+        re.IGNORECASE,
+    )
+    CONTENT_HINTS = re.compile(
+        r'(?:^|[\s_-])(?:article|main|content|post|entry|story|markdown|prose|docs?|'
+        r'documentation|body-text)(?:$|[\s_-])',
+        re.IGNORECASE,
+    )
+
+    def __init__(self, max_link_density: float = 0.5, min_content_words: int = 25):
+        self.max_link_density = max_link_density
+        self.min_content_words = min_content_words
+
+    def link_density(self, block: Block) -> float:
+        """Share of the block's characters that belong to links."""
+        return min(block.link_chars / max(len(block.text), 1), 1.0)
+
+    def is_boilerplate(self, block: Block) -> bool:
+        """True when the block is link-heavy or its closest telling container is chrome."""
+        if block.kind not in ('table', 'code') and self.link_density(block) > self.max_link_density:
+            return True
+        # The innermost container that looks like content or chrome decides
+        for hint in reversed(block.hints):
+            if self.CONTENT_HINTS.search(hint):
+                return False
+            if self.BOILERPLATE_HINTS.search(hint):
+                return True
+        return False
+
+    def is_dense(self, block: Block) -> bool:
+        """True for blocks that are clearly body text."""
+        words = len(block.text.split())
+        return (
+            block.kind in ('paragraph', 'list_item', 'table', 'code')
+            and words >= self.min_content_words
+            and self.link_density(block) <= self.max_link_density / 2
+        )
+
+    def in_content_container(self, block: Block) -> bool:
+        """True when some enclosing element looks like the page's content."""
+        return any(self.CONTENT_HINTS.search(hint) for hint in block.hints)
+
+    def select(self, blocks: List[Block]) -> List[Block]:
+        """Return the main-content blocks of a page, preserving their order."""
+        candidates = [block for block in blocks if not self.is_boilerplate(block)]
+        dense = [index for index, block in enumerate(candidates) if self.is_dense(block)]
+        if not dense:
+            # Short pages have no dense region; chrome removal is all we can do
+            return candidates
+
+        # Keep everything between the first and last dense block, plus the
+        # headings that introduce the region and content containers around it
+        first, last = dense[0], dense[-1]
+        while first > 0 and (candidates[first - 1].kind == 'heading' or self.in_content_container(candidates[first - 1])):
+            first -= 1
+        # Trailing sections end at the last structural or contained block; loose short text after it is dropped
+        for index in range(last + 1, len(candidates)):
+            block = candidates[index]
+            if block.kind in self.STRUCTURAL_KINDS or self.in_content_container(block):
+                last = index
+        return candidates[first:last + 1]
+
+class SiteBoilerplateFilter:
+    """
+    Learn blocks repeated across the pages of a site and drop them.
+
+    Navbars, footers and cookie notices survive per-page extraction when their
+    markup is unusual, but they repeat verbatim on every page of a crawl. Blocks
+    whose normalized text appears on at least min_pages pages and on at least
+    min_ratio of the pages seen for the same host are treated as site chrome.
+    """
+
+    _NORMALIZE = re.compile(r'\W+')
+
+    def __init__(self, min_pages: int = 3, min_ratio: float = 0.5):
+        self.min_pages = min_pages
+        self.min_ratio = min_ratio
+        self._pages_per_host: Dict[str, int] = defaultdict(int)
+        self._block_pages: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.removed_blocks = 0
+        self.removed_chars = 0
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urllib.parse.urlparse(url).netloc.lower()
+
+    def _fingerprint(self, block: Block) -> int:
+        return hash(self._NORMALIZE.sub(' ', block.text.lower()).strip())
+
+    def observe(self, url: str, blocks: List[Block]) -> None:
+        """Record the distinct blocks of one page."""
+        host = self._host(url)
+        self._pages_per_host[host] += 1
+        seen: Set[int] = {self._fingerprint(block) for block in blocks}
+        for fingerprint in seen:
+            self._block_pages[(host, fingerprint)] += 1
+
+    def is_repeated(self, url: str, block: Block) -> bool:
+        """True when the block occurs on enough pages of the same host."""
+        host = self._host(url)
+        pages = self._block_pages.get((host, self._fingerprint(block)), 0)
+        threshold = max(self.min_pages, self.min_ratio * self._pages_per_host.get(host, 0))
+        return pages >= threshold
+
+    def filter(self, url: str, blocks: List[Block]) -> List[Block]:
+        """Drop site-wide repeated blocks from one page's blocks."""
+        kept = []
+        for block in blocks:
+            if self.is_repeated(url, block):
+                self.removed_blocks += 1
+                self.removed_chars += len(block.text)
+            else:
+                kept.append(block)
+        return kept
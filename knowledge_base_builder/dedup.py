@@ -0,0 +1,211 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r'\w+')
+_PARAGRAPH_BREAK = re.compile(r'(\n\s*\n)')
+# Opening or closing line of a fenced code block: the fence and whatever follows it
+_FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})(.*)$', re.MULTILINE)
+_BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+_WORD_HASH_CACHE_SIZE = 1_000_000
+_WORD_HASHES: Dict[str, int] = {}
+
+class DuplicateRecord(NamedTuple):
+    """One document or paragraph removed as a near-duplicate."""
+    kind: str          # 'document' or 'paragraph'
+    source: str        # where the removed text came from
+    duplicate_of: str  # where the kept copy came from
+    similarity: float
+    chars: int
+
+def _word_hash(word: str) -> int:
+    value = _WORD_HASHES.get(word)
+    if value is None:
+        if len(_WORD_HASHES) >= _WORD_HASH_CACHE_SIZE:
+            _WORD_HASHES.clear()
+        value = _WORD_HASHES[word] = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+    return value
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, so combined word hashes spread over all 64 bits."""
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """
+    64-bit SimHash of a text over word shingles.
+
+    Words are hashed once with BLAKE2b so fingerprints are stable across runs;
+    shingle hashes are combined from them and the per-bit votes counted with
+    NumPy instead of a Python loop per shingle and bit. Returns None for texts
+    without words.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    hashes = np.fromiter((_word_hash(word) for word in words), dtype=np.uint64, count=len(words))
+    if len(words) >= shingle_size:
+        shingles = np.zeros(len(words) - shingle_size + 1, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for offset in range(shingle_size):
+                shingles = _mix(shingles ^ hashes[offset:offset + len(shingles)])
+    else:
+        with np.errstate(over='ignore'):
+            shingles = _mix(np.bitwise_xor.reduce(hashes, keepdims=True))
+
+    votes = ((shingles[:, None] >> _BIT_SHIFTS) & np.uint64(1)).sum(axis=0)
+    bits = votes * 2 > len(shingles)
+    return int(np.sum(np.left_shift(np.uint64(1), _BIT_SHIFTS[bits]), dtype=np.uint64))
+
+class SimHashIndex:
+    """
+    LSH index over 64-bit SimHash fingerprints.
+
+    Fingerprints are split into max_distance + 1 bands; by the pigeonhole
+    principle two fingerprints within max_distance bits agree on at least one
+    band, so a band lookup finds every near-duplicate without a full scan.
+    """
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self._band_mask = (1 << self.band_bits) - 1
+        self._buckets: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._fingerprints = np.zeros(1024, dtype=np.uint64)
+        self._labels: List[str] = []
+
+    def _band_keys(self, fingerprint: int):
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self.band_bits)) & self._band_mask
+
+    def query(self, fingerprint: int) -> Optional[Tuple[str, int]]:
+        """Return (label, Hamming distance) of the closest indexed fingerprint within range."""
+        candidates = set()
+        for band, key in self._band_keys(fingerprint):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return None
+
+        # Hamming distances of all candidates at once
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        xor = self._fingerprints[ids] ^ np.uint64(fingerprint)
+        distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+        best = int(np.argmin(distances))
+        if distances[best] > self.max_distance:
+            return None
+        return self._labels[ids[best]], int(distances[best])
+
+    def add(self, fingerprint: int, label: str) -> None:
+        """Index a fingerprint under a label."""
+        position = len(self._labels)
+        if position == len(self._fingerprints):
+            self._fingerprints = np.concatenate([self._fingerprints, np.zeros_like(self._fingerprints)])
+        self._fingerprints[position] = fingerprint
+        self._labels.append(label)
+        for band, key in self._band_keys(fingerprint):
+            self._buckets[band][key].append(position)
+
+def _split_paragraphs(text: str) -> List[str]:
+    """Blank-line separated paragraphs of Markdown, each fenced code block kept whole as one."""
+    pieces = _PARAGRAPH_BREAK.split(text)
+    paragraphs = []
+    fence = None
+    # Pieces alternate between paragraph text and the blank lines that separated them
+    for position in range(0, len(pieces), 2):
+        if fence is not None:
+            paragraphs[-1] += pieces[position - 1] + pieces[position]
+        else:
+            paragraphs.append(pieces[position])
+        for marker, rest in _FENCE.findall(pieces[position]):
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence) and not rest.strip():
+                fence = None
+    return paragraphs
+
+class Deduplicator:
+    """
+    Drop near-duplicate documents and paragraphs before they reach the LLM.
+
+    Documents are compared as a whole first; a document similar to an earlier
+    one above the threshold is dropped entirely. Otherwise its paragraphs are
+    compared against every paragraph seen so far and repeated ones are removed;
+    a fenced code block counts as one paragraph, so no fence is left unbalanced.
+    Paragraphs shorter than min_words (headings, "MIT", one-line notes) carry
+    document structure rather than content and are always kept; documents that
+    short are only matched exactly. Every removal is recorded in `report`.
+    """
+
+    def __init__(self, threshold: float = 0.9, min_words: int = 10):
+        if not 0 < threshold <= 1:
+            raise ValueError("Dedup threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.min_words = min_words
+        max_distance = int(round((1 - threshold) * 64))
+        self._indexes = {kind: SimHashIndex(max_distance) for kind in ('document', 'paragraph')}
+        self._exact: Dict[str, Dict[str, str]] = {kind: {} for kind in ('document', 'paragraph')}
+        self.report: List[DuplicateRecord] = []
+
+    def _find(self, kind: str, text: str, label: str) -> Optional[Tuple[str, float]]:
+        """Look a text up (exactly for short texts) and index it when it is new."""
+        normalized = ' '.join(_WORD.findall(text.lower()))
+        if len(normalized.split(' ')) < self.min_words:
+            exact = self._exact[kind]
+            key = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+            if key in exact:
+                return exact[key], 1.0
+            exact[key] = label
+            return None
+
+        index = self._indexes[kind]
+        fingerprint = simhash(normalized)
+        match = index.query(fingerprint)
+        if match is not None:
+            return match[0], 1 - match[1] / 64
+        index.add(fingerprint, label)
+        return None
+
+    def add(self, text: str, source: str) -> Optional[str]:
+        """Return the text with repeated paragraphs removed, or None if it is a duplicate document."""
+        match = self._find('document', text, source)
+        if match is not None:
+            self.report.append(DuplicateRecord('document', source, match[0], match[1], len(text)))
+            return None
+
+        kept = []
+        for paragraph in _split_paragraphs(text):
+            if not paragraph.strip():
+                continue
+            if len(_WORD.findall(paragraph)) < self.min_words:
+                # Headings, separators and other short lines stay as they are
+                kept.append(paragraph)
+                continue
+            match = self._find('paragraph', paragraph, source)
+            if match is not None:
+                self.report.append(DuplicateRecord('paragraph', source, match[0], match[1], len(paragraph)))
+            else:
+                kept.append(paragraph)
+        return '\n\n'.join(kept)
+
+    def deduplicate(self, texts: List[str], sources: Optional[List[str]] = None) -> List[str]:
+        """Deduplicate a list of documents, keeping the first copy of everything."""
+        sources = sources or [f"document {i + 1}" for i in range(len(texts))]
+        results = []
+        for text, source in zip(texts, sources):
+            result = self.add(text, source)
+            if result and result.strip():
+                results.append(result)
+        return results
+
+    def summary(self) -> str:
+        """One-line description of what was removed."""
+        documents = [record for record in self.report if record.kind == 'document']
+        paragraphs = [record for record in self.report if record.kind == 'paragraph']
+        removed = sum(record.chars for record in self.report)
+        return (f"{len(documents)} duplicate documents and {len(paragraphs)} duplicate paragraphs "
+                f"removed ({removed} characters)")
@@ -0,0 +1,390 @@
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from knowledge_base_builder.compat import to_thread
+from knowledge_base_builder.html_cleaner import Block, HTMLCleaner
+from knowledge_base_builder.kb_builder import KBBuilder
+from knowledge_base_builder.content_extractor import SiteBoilerplateFilter
+from knowledge_base_builder.llm import LLM
+from knowledge_base_builder.llm_client import LLMClient
+from knowledge_base_builder.metrics import increment, span
+from knowledge_base_builder.registry import ProcessorSpec
+from knowledge_base_builder.usage import UsageTracker, record_usage, use_tracker
+
+# Task kinds: the work a coordinator hands out and workers know how to do
+EXTRACT = 'extract'    # {url, processor}: download a file and extract its text
+WEBSITE = 'website'    # {url}: download a page and clean it to Markdown
+BLOCKS = 'blocks'      # {url}: download a sitemap page and render its blocks
+MARKDOWN = 'markdown'  # {url}: download a GitHub Markdown file
+LLM_CALL = 'llm'       # {prompt}: run one prompt through the worker's LLM client
+
+class Task(NamedTuple):
+    """One claimed unit of work."""
+    id: int
+    key: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+class TaskResult(NamedTuple):
+    """State of a task as seen by the coordinator."""
+    status: str  # 'queued', 'running', 'done' or 'failed'
+    result: Any
+    error: Optional[str]
+
+def task_key(kind: str, payload: Dict[str, Any]) -> str:
+    """Content-derived task key: the same work always gets the same key."""
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True).encode('utf-8')).hexdigest()
+
+class TaskQueue(ABC):
+    """
+    Backend that coordinators put tasks into and workers claim them from.
+
+    Tasks are keyed by their content, so putting the same task again is a no-op
+    and a restarted coordinator picks up finished results instead of redoing
+    them. A claimed task is leased to its worker; if the worker dies the lease
+    runs out and another worker claims it. Completing a task twice keeps the
+    first result.
+    """
+
+    @abstractmethod
+    def put(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Queue a task unless it already exists; return its key."""
+
+    @abstractmethod
+    def claim(self, worker: str, kinds: Optional[Sequence[str]] = None) -> Optional[Task]:
+        """Lease the oldest available task to a worker, or return None."""
+
+    @abstractmethod
+    def complete(self, task: Task, result: Any) -> None:
+        """Store a task's result."""
+
+    @abstractmethod
+    def fail(self, task: Task, error: str) -> None:
+        """Release a failed task for another attempt, or mark it failed for good."""
+
+    @abstractmethod
+    def results(self, keys: Sequence[str]) -> Dict[str, TaskResult]:
+        """Current state of the tasks with these keys."""
+
+    def wait(self, keys: Sequence[str], poll: float = 0.5) -> Dict[str, TaskResult]:
+        """Block until every task is done or failed."""
+        pending = list(keys)
+        finished: Dict[str, TaskResult] = {}
+        while pending:
+            for key, state in self.results(pending).items():
+                if state.status in ('done', 'failed'):
+                    finished[key] = state
+            pending = [key for key in pending if key not in finished]
+            if pending:
+                time.sleep(poll)
+        return finished
+
+    async def wait_async(self, key: str, poll: float = 0.5) -> Any:
+        """Wait for one task without blocking the event loop; return its result or raise its error."""
+        while True:
+            state = (await to_thread(self.results, [key]))[key]
+            if state.status == 'done':
+                return state.result
+            if state.status == 'failed':
+                raise Exception(f"Error in remote task: {state.error}")
+            await asyncio.sleep(poll)
+
+class SQLiteTaskQueue(TaskQueue):
+    """
+    TaskQueue in a SQLite database, for workers on one host or sharing a disk.
+
+    Claims run in an immediate transaction, so concurrent workers never lease the
+    same task. Tasks are retried up to max_attempts times before they fail;
+    putting a failed task again gives it a fresh set of attempts.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT UNIQUE NOT NULL, kind TEXT NOT NULL,"
+            " payload TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'queued', attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker TEXT, lease_until REAL, result TEXT, error TEXT, updated REAL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, kind, id)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections belong to the thread that opened them
+        if getattr(self._local, 'db', None) is None:
+            self._local.db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        return self._local.db
+
+    def put(self, kind: str, payload: Dict[str, Any]) -> str:
+        key = task_key(kind, payload)
+        self._connection().execute(
+            "INSERT INTO tasks (key, kind, payload, updated) VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE"
+            " SET status = 'queued', attempts = 0, error = NULL WHERE status = 'failed'",
+            (key, kind, json.dumps(payload), time.time()),
+        )
+        return key
+
+    def claim(self, worker: str, kinds: Optional[Sequence[str]] = None) -> Optional[Task]:
+        db = self._connection()
+        now = time.time()
+        kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, key, kind, payload, attempts FROM tasks"
+                " WHERE (status = 'queued' OR (status = 'running' AND lease_until < ?))" + kind_filter +
+                " ORDER BY id LIMIT 1",
+                (now, *(kinds or ())),
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE tasks SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1,"
+                    " updated = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, row[0]),
+                )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return Task(row[0], row[1], row[2], json.loads(row[3]), row[4] + 1)
+
+    def complete(self, task: Task, result: Any) -> None:
+        self._connection().execute(
+            "UPDATE tasks SET status = 'done', result = ?, error = NULL, updated = ? WHERE id = ? AND status != 'done'",
+            (json.dumps(result), time.time(), task.id),
+        )
+
+    def fail(self, task: Task, error: str) -> None:
+        status = 'failed' if task.attempts >= self.max_attempts else 'queued'
+        self._connection().execute(
+            "UPDATE tasks SET status = ?, error = ?, lease_until = NULL, updated = ? WHERE id = ? AND status != 'done'",
+            (status, error, time.time(), task.id),
+        )
+
+    def results(self, keys: Sequence[str]) -> Dict[str, TaskResult]:
+        found: Dict[str, TaskResult] = {}
+        db = self._connection()
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(keys), 500):
+            batch = list(keys[start:start + 500])
+            for key, status, result, error in db.execute(
+                f"SELECT key, status, result, error FROM tasks WHERE key IN ({','.join('?' * len(batch))})", batch
+            ):
+                found[key] = TaskResult(status, json.loads(result) if result is not None else None, error)
+        return found
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks per status."""
+        return dict(self._connection().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+class QueueLLMClient(LLMClient):
+    """
+    LLM client that sends each prompt to the task queue and waits for a worker's
+    answer. Workers report their model and token counts, which are recorded
+    here so the coordinator's usage report and budget cover the whole build.
+    """
+
+    def __init__(self, queue: TaskQueue, poll: float = 0.5):
+        super().__init__(api_key='', model='remote', max_concurrency=1 << 16)
+        self.queue = queue
+        self.poll = poll
+
+    async def run_async(self, prompt: str) -> str:
+        with span('llm_request'):
+            key = await to_thread(self.queue.put, LLM_CALL, {'prompt': prompt})
+            result = await self.queue.wait_async(key, self.poll)
+        increment('llm_requests')
+        increment('llm_input_tokens', result['input_tokens'])
+        increment('llm_output_tokens', result['output_tokens'])
+        record_usage(result['model'], result['input_tokens'], result['output_tokens'])
+        return result['text']
+
+class DistributedKBBuilder(KBBuilder):
+    """
+    Coordinator of a distributed build.
+
+    Works like KBBuilder, but file extraction, page downloads and LLM calls are
+    queued as tasks for Worker processes instead of running here. Sources are
+    expanded locally (sitemaps are read and repositories listed), every task of a
+    phase is queued at once, and results are collected in source order as workers
+    finish them, so chunking, deduplication and every output option work as in a
+    local build.
+    """
+
+    def __init__(self, config: Dict[str, Any], queue: TaskQueue):
+        self.queue = queue
+        self.poll = float(config.get('QUEUE_POLL_SECONDS', 0.5))
+        super().__init__(config, llm_client=QueueLLMClient(queue, self.poll))
+        # Workers bound the real concurrency; keep enough chunks in flight to feed them
+        self.llm_workers = int(config.get('LLM_WORKERS', 64))
+        self.llm = LLM(self.llm_client, max_concurrency=self.llm_workers)
+
+    async def _remote(self, kind: str, payload: Dict[str, Any]) -> Any:
+        key = await to_thread(self.queue.put, kind, payload)
+        return await self.queue.wait_async(key, self.poll)
+
+    async def _process_source_async(self, spec: ProcessorSpec, url: str) -> None:
+        try:
+            print(f"{spec.icon} Queued {spec.label}: {url}")
+            with span('source', source=url, kind=spec.name):
+                text = await self._remote(EXTRACT, {'url': url, 'processor': spec.name})
+            if text.strip():
+                await self._collect_async(text, url)
+        except Exception as e:
+            increment('source_errors')
+            print(f"❌ Error processing {spec.label} {url}: {e}")
+
+    async def _process_web_url_async(self, url: str) -> None:
+        try:
+            print(f"🔗 Queued website: {url}")
+            with span('source', source=url, kind='website'):
+                text = await self._remote(WEBSITE, {'url': url, 'main_content': self.extract_main_content})
+            if text.strip():
+                await self._collect_async(text, url)
+        except Exception as e:
+            increment('source_errors')
+            print(f"❌ Error processing website {url}: {e}")
+
+    def process_websites(self, sitemap_url: str) -> None:
+        """Queue every page of a sitemap, then drop site-wide blocks and collect the pages in order."""
+        try:
+            print(f"🌐 Sitemap: {sitemap_url}")
+            urls = self.website_processor.get_urls_from_sitemap(sitemap_url)
+            keys = [self.queue.put(BLOCKS, {'url': url, 'main_content': self.extract_main_content}) for url in urls]
+            print(f"  📤 Queued {len(keys)} pages")
+            with span('sitemap_wait'):
+                states = self.queue.wait(keys, self.poll)
+
+            boilerplate = SiteBoilerplateFilter(min_pages=self.site_boilerplate_min_pages)
+            pages = []
+            for url, key in zip(urls, keys):
+                if states[key].status != 'done':
+                    increment('source_errors')
+                    print(f"❌ Site error: {url}: {states[key].error}")
+                    continue
+                blocks = [Block(kind, text, link_chars, tuple(hints)) for kind, text, link_chars, hints in states[key].result]
+                boilerplate.observe(url, blocks)
+                pages.append((url, blocks))
+            for url, blocks in pages:
+                text = HTMLCleaner.join_blocks(boilerplate.filter(url, blocks))
+                if text.strip():
+                    self._collect(text, url)
+        except Exception as e:
+            print(f"❌ Sitemap load error: {e}")
+
+    def process_github_repos(self, github_repos: List[str]) -> None:
+        """List each repository's Markdown files here and queue their downloads."""
+        for repo in github_repos:
+            try:
+                print(f"📂 Processing GitHub repository: {repo}")
+                username, repo_name = self._parse_github_repo_url(repo)
+                md_urls = self.get_github_processor().get_markdown_urls_for_repo(username, repo_name)
+                keys = [self.queue.put(MARKDOWN, {'url': url}) for url in md_urls]
+                print(f"  📤 Queued {len(keys)} markdown files")
+                states = self.queue.wait(keys, self.poll)
+                for url, key in zip(md_urls, keys):
+                    if states[key].status == 'done' and states[key].result.strip():
+                        self._collect(states[key].result, url)
+                    elif states[key].status != 'done':
+                        increment('source_errors')
+                        print(f"  ❌ Markdown error: {url}: {states[key].error}")
+            except Exception as e:
+                print(f"❌ GitHub repository error: {e}")
+
+class Worker:
+    """
+    Stateless worker: claims tasks from the queue, runs them with a KBBuilder's
+    processors and LLM client, and stores the results. Up to `concurrency` tasks
+    run at once; blocking downloads and extraction run in threads. A failing task
+    is released for another attempt.
+    """
+
+    def __init__(self, queue: TaskQueue, config: Dict[str, Any], llm_client: Optional[LLMClient] = None,
+                 concurrency: int = 8, worker_id: Optional[str] = None):
+        self.queue = queue
+        self.builder = KBBuilder(config, llm_client=llm_client)
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.completed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Stop claiming tasks; tasks already running finish first. Safe to call from any thread."""
+        self._stop.set()
+
+    async def handle(self, task: Task) -> Any:
+        """Result of one task."""
+        builder = self.builder
+        payload = task.payload
+        if task.kind == LLM_CALL:
+            # The client records its token counts; the coordinator accounts for them
+            usage = UsageTracker()
+            with use_tracker(usage):
+                text = await builder.llm_client.run_async(payload['prompt'])
+            return {
+                'text': text,
+                'model': builder.llm_client.model,
+                'input_tokens': int(usage.total['input_tokens']),
+                'output_tokens': int(usage.total['output_tokens']),
+            }
+        if task.kind == EXTRACT:
+            spec = builder.processors.get(payload['processor'])
+            if spec is None:
+                raise ValueError(f"No processor registered as {payload['processor']}")
+            path = await to_thread(spec.processor.download, payload['url'])
+            return await to_thread(spec.processor.extract_text, path)
+        if task.kind == WEBSITE:
+            return await to_thread(builder.website_processor.download_and_clean_html,
+                                           payload['url'], payload.get('main_content', True))
+        if task.kind == BLOCKS:
+            html = await to_thread(builder.website_processor.download_html, payload['url'])
+            blocks = await to_thread(builder.website_processor.extract_blocks, html,
+                                             payload.get('main_content', True))
+            return [list(block) for block in blocks]
+        if task.kind == MARKDOWN:
+            return await to_thread(builder.get_github_processor().download_markdown, payload['url'])
+        raise ValueError(f"Unknown task kind: {task.kind}")
+
+    async def _slot(self, until_idle: bool, poll: float) -> None:
+        while not self._stop.is_set():
+            task = await to_thread(self.queue.claim, self.worker_id)
+            if task is None:
+                if until_idle:
+                    return
+                await asyncio.sleep(poll)
+                continue
+            try:
+                result = await self.handle(task)
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Task {task.kind} {task.key[:12]} failed (attempt {task.attempts}): {e}")
+                await to_thread(self.queue.fail, task, str(e))
+                continue
+            await to_thread(self.queue.complete, task, result)
+            self.completed += 1
+
+    async def run_async(self, until_idle: bool = False, poll: float = 1.0) -> None:
+        """Work until stopped, or with until_idle until no task is left to claim."""
+        self._stop.clear()
+        print(f"🛠️ Worker {self.worker_id} running {self.concurrency} task slots")
+        await asyncio.gather(*(self._slot(until_idle, poll) for _ in range(self.concurrency)))
+        print(f"🛠️ Worker {self.worker_id}: {self.completed} tasks completed, {self.failed} failed")
+
+    def run(self, until_idle: bool = False, poll: float = 1.0) -> None:
+        asyncio.run(self.run_async(until_idle, poll))
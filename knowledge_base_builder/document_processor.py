@@ -1,21 +1,24 @@
 import os
-from docx import Document
-import markdown
-import mistune
 import re
-from striprtf.striprtf import rtf_to_text
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from knowledge_base_builder.base_processor import BaseProcessor
 
 class DocumentProcessor(BaseProcessor):
     """Handle document processing for .docx, .txt, .md, and .rtf files."""
     
     SUPPORTED_EXTENSIONS = ['.docx', '.txt', '.md', '.rtf']
+    MIME_TYPES = {
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+        'text/plain': '.txt',
+        'text/markdown': '.md',
+        'text/x-markdown': '.md',
+        'application/rtf': '.rtf',
+        'text/rtf': '.rtf',
+    }
     
     @staticmethod
     def download(url: str) -> str:
         """Download a document from a URL or load from local file."""
-        return BaseProcessor.download(url, DocumentProcessor.SUPPORTED_EXTENSIONS)
+        return BaseProcessor.download(url, DocumentProcessor.SUPPORTED_EXTENSIONS, DocumentProcessor.MIME_TYPES)
 
     @staticmethod
     def extract_text(file_path: str) -> str:
@@ -36,6 +39,8 @@ class DocumentProcessor(BaseProcessor):
     @staticmethod
     def _extract_from_docx(file_path: str) -> str:
         """Extract text from a .docx file."""
+        from docx import Document
+
         try:
             doc = Document(file_path)
             text = '\n'.join(paragraph.text for paragraph in doc.paragraphs)
@@ -72,6 +77,8 @@ class DocumentProcessor(BaseProcessor):
     @staticmethod
     def _extract_from_rtf(file_path: str) -> str:
         """Extract text from a .rtf file."""
+        from striprtf.striprtf import rtf_to_text
+
         try:
             with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
                 rtf_content = file.read()
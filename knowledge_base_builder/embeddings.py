@@ -0,0 +1,196 @@
+import importlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+
+from knowledge_base_builder.chunk_writer import split_sections
+from knowledge_base_builder.dedup import _word_hash
+
+_WORD = re.compile(r'\w+')
+
+# Rows converted per block when the raw vectors are weighted into the final matrix
+_BLOCK_ROWS = 4096
+
+class SimilarChunk(NamedTuple):
+    """One result of a similarity query."""
+    score: float
+    chunk: int
+    heading_path: List[str]
+    sources: List[str]
+    text: str
+
+class HashingEmbedder:
+    """
+    Local bag-of-words embedder: words and word bigrams are hashed into a fixed
+    number of signed buckets with sublinear term frequency. No vocabulary or
+    model is needed, so it works on a stream. Its vectors are raw counts
+    (`idf = True`); the index applies inverse document frequency weights once it
+    has seen the whole corpus, turning them into TF-IDF vectors.
+    """
+    idf = True
+
+    def __init__(self, dimensions: int = 512, bigrams: bool = True):
+        self.dimensions = dimensions
+        self.bigrams = bigrams
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        if self.bigrams:
+            return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return words
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter((_word_hash(feature) for feature in self._features(text)), dtype=np.uint64)
+            if not len(hashes):
+                continue
+            buckets = (hashes % np.uint64(self.dimensions)).astype(np.int64)
+            signs = np.where((hashes >> np.uint64(63)) == 1, -1.0, 1.0)
+            np.add.at(vectors[row], buckets, signs)
+        return np.sign(vectors) * np.log1p(np.abs(vectors))
+
+ENTRY_POINT_GROUP = "knowledge_base_builder.embedders"
+
+def load_embedder(spec: Any = None, dimensions: int = 512) -> Any:
+    """
+    Resolve an embedder: None or 'hashing' for the HashingEmbedder, an object
+    with `dimensions` and `embed(texts) -> array`, a 'module:attribute' path, or
+    the name of a `knowledge_base_builder.embedders` entry point. Classes are
+    instantiated without arguments.
+    """
+    if spec is None or spec == 'hashing':
+        return HashingEmbedder(dimensions)
+    if not isinstance(spec, str):
+        return spec
+    if ':' in spec:
+        module, _, attribute = spec.partition(':')
+        embedder = getattr(importlib.import_module(module), attribute)
+    else:
+        from importlib.metadata import entry_points
+
+        found = entry_points()
+        candidates = found.select(group=ENTRY_POINT_GROUP) if hasattr(found, 'select') else found.get(ENTRY_POINT_GROUP, [])
+        matches = [entry_point for entry_point in candidates if entry_point.name == spec]
+        if not matches:
+            raise ValueError(f"Unknown embedder: {spec}. Expected 'hashing', module:attribute or an installed plugin")
+        embedder = matches[0].load()
+    return embedder() if isinstance(embedder, type) else embedder
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+def index_paths(prefix: str) -> Dict[str, str]:
+    """Files of the vector index stored under a path prefix, e.g. the KB path without .md."""
+    return {'vectors': f"{prefix}.vectors.npy", 'meta': f"{prefix}.vectors.json"}
+
+class EmbeddingIndexWriter:
+    """
+    Embed processed chunks as they complete and store the vectors as a NumPy
+    matrix next to the KB.
+
+    Outputs are split into heading sections like the chunk JSONL records, and
+    one row is embedded per section. Rows are appended to a raw float32 file
+    during the build; `close` writes the final `.vectors.npy` matrix block by
+    block (with IDF weights for count-based embedders) and L2-normalizes every
+    row so a dot product is the cosine similarity. The `.vectors.json` file
+    holds the embedder, the IDF weights and each row's chunk, heading path,
+    sources and text. `add` may be called from several threads.
+    """
+
+    def __init__(self, prefix: str, embedder: Any = None, max_chars: int = 4000):
+        self.paths = index_paths(prefix)
+        self.embedder = embedder if embedder is not None else HashingEmbedder()
+        self.max_chars = max_chars
+        self.rows: List[Dict[str, Any]] = []
+        self._raw_path = self.paths['vectors'] + '.part'
+        self._raw = open(self._raw_path, 'wb')
+        self._lock = threading.Lock()
+
+    def add(self, index: int, outputs: List[str], sources: Dict[str, int]) -> int:
+        """Embed the sections of one processed chunk and return how many rows were added."""
+        urls = [url for url, _ in sorted(sources.items(), key=lambda item: (-item[1], item[0]))]
+        sections = [section for output in outputs for section in split_sections(output, self.max_chars)]
+        if not sections:
+            return 0
+        vectors = np.asarray(self.embedder.embed([section.text for section in sections]), dtype=np.float32)
+        with self._lock:
+            self._raw.write(vectors.tobytes())
+            self.rows.extend({'chunk': index, 'heading_path': section.heading_path, 'sources': urls,
+                              'text': section.text} for section in sections)
+        return len(sections)
+
+    def close(self) -> str:
+        """Write the normalized matrix and its metadata; return the matrix path."""
+        self._raw.close()
+        dimensions = int(self.embedder.dimensions)
+        raw = (np.memmap(self._raw_path, dtype=np.float32, mode='r', shape=(len(self.rows), dimensions))
+               if self.rows else np.zeros((0, dimensions), dtype=np.float32))
+        weights = None
+        if getattr(self.embedder, 'idf', False) and self.rows:
+            frequency = np.zeros(dimensions, dtype=np.int64)
+            for start in range(0, len(self.rows), _BLOCK_ROWS):
+                frequency += (raw[start:start + _BLOCK_ROWS] != 0).sum(axis=0)
+            weights = (np.log((1 + len(self.rows)) / (1 + frequency)) + 1).astype(np.float32)
+
+        matrix = np.lib.format.open_memmap(self.paths['vectors'], mode='w+', dtype=np.float32,
+                                           shape=(len(self.rows), dimensions))
+        for start in range(0, len(self.rows), _BLOCK_ROWS):
+            block = np.asarray(raw[start:start + _BLOCK_ROWS])
+            matrix[start:start + len(block)] = _normalize(block * weights if weights is not None else block)
+        matrix.flush()
+        del matrix, raw
+        os.remove(self._raw_path)
+
+        with open(self.paths['meta'], 'w', encoding='utf-8') as f:
+            json.dump({
+                'embedder': type(self.embedder).__name__,
+                'dimensions': dimensions,
+                'idf': weights.tolist() if weights is not None else None,
+                'rows': self.rows,
+            }, f, ensure_ascii=False)
+        return self.paths['vectors']
+
+class EmbeddingIndex:
+    """Cosine similarity search over a stored vector index; the matrix is memory-mapped, not loaded."""
+
+    def __init__(self, prefix: str, embedder: Any = None):
+        paths = index_paths(prefix)
+        self.vectors = np.load(paths['vectors'], mmap_mode='r')
+        with open(paths['meta'], 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.rows: List[Dict[str, Any]] = meta['rows']
+        self.embedder = embedder if embedder is not None else HashingEmbedder(meta['dimensions'])
+        self.idf = np.asarray(meta['idf'], dtype=np.float32) if meta.get('idf') else None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Query vectors in the same space as the stored rows."""
+        vectors = np.asarray(self.embedder.embed(texts), dtype=np.float32)
+        return _normalize(vectors * self.idf if self.idf is not None else vectors)
+
+    def scores(self, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of one normalized vector with every row."""
+        return np.asarray(self.vectors @ vector)
+
+    def top_k(self, vector: np.ndarray, k: int = 5) -> List[SimilarChunk]:
+        """The k rows most similar to a normalized vector, best first."""
+        if not len(self.rows) or k <= 0:
+            return []
+        scores = self.scores(vector)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [SimilarChunk(float(scores[i]), self.rows[i]['chunk'], self.rows[i]['heading_path'],
+                             self.rows[i]['sources'], self.rows[i]['text']) for i in best]
+
+    def query(self, text: str, k: int = 5) -> List[SimilarChunk]:
+        """The k stored sections most similar to a text."""
+        return self.top_k(self.embed([text])[0], k)
@@ -1,9 +1,9 @@
 import asyncio
-import time
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import HumanMessage
 
 from knowledge_base_builder.llm_client import LLMClient
+from knowledge_base_builder.metrics import increment, span
 
 class GeminiClient(LLMClient):
     """Asynchronous client for Google's Gemini AI via LangChain."""
@@ -27,28 +27,29 @@ class GeminiClient(LLMClient):
         Send prompt to Gemini and return the response.
         Uses retries + exponential backoff.
         """
-        start_time = time.time()
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                async with self._sem:
-                    result = await self.llm.ainvoke([HumanMessage(content=prompt)])
-                    end_time = time.time()
-                    print(f"    ⏱️ Gemini API call: {end_time - start_time:.2f} seconds")
-                    return result.content if hasattr(result, "content") else result
-            except Exception as e:
-                if attempt == self.max_retries:
-                    end_time = time.time()
-                    print(f"    ⏱️ Gemini API call failed after {end_time - start_time:.2f} seconds and {attempt} attempts")
-                    raise
-                # backoff: 2, 4, 8, ...
-                backoff_time = 2 ** attempt
-                print(f"    ⚠️ Gemini API call attempt {attempt} failed, retrying in {backoff_time} seconds...")
-                await asyncio.sleep(backoff_time)
+        with span('llm_request', provider='gemini', model=self.model) as request:
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    async with self._sem:
+                        with span('attempt', attempt=attempt):
+                            result = await self.llm.ainvoke([HumanMessage(content=prompt)])
+                        self._record_usage(prompt, result)
+                        print(f"    ⏱️ Gemini API call: {request.elapsed:.2f} seconds")
+                        return result.content if hasattr(result, "content") else result
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        increment('llm_failures')
+                        print(f"    ⏱️ Gemini API call failed after {request.elapsed:.2f} seconds and {attempt} attempts")
+                        raise
+                    # backoff: 2, 4, 8, ...
+                    increment('llm_retries')
+                    backoff_time = 2 ** attempt
+                    print(f"    ⚠️ Gemini API call attempt {attempt} failed, retrying in {backoff_time} seconds...")
+                    await asyncio.sleep(backoff_time)
 
     # Keep a synchronous alias if you still need it elsewhere
     def run(self, prompt: str) -> str:
-        start_time = time.time()
-        result = asyncio.get_event_loop().run_until_complete(self.run_async(prompt))
-        end_time = time.time()
-        print(f"    ⏱️ Gemini API call (sync): {end_time - start_time:.2f} seconds")
+        with span('llm_sync_call') as call:
+            result = asyncio.get_event_loop().run_until_complete(self.run_async(prompt))
+        print(f"    ⏱️ Gemini API call (sync): {call.duration:.2f} seconds")
         return result.content if hasattr(result, "content") else result
\ No newline at end of file
@@ -3,8 +3,12 @@ from typing import List, Optional
 
 class GitHubProcessor:
     """Handle GitHub repository processing."""
-    def __init__(self, username: Optional[str] = None, token: Optional[str] = None):
+    API_URL = "https://api.github.com"
+
+    def __init__(self, username: Optional[str] = None, token: Optional[str] = None, api_url: str = API_URL):
         self.username = username
+        # Point at GitHub Enterprise or a local stand-in instead of api.github.com
+        self.api_url = api_url.rstrip("/")
         self.headers = {"Authorization": f"token {token}"} if token else {}
 
     def get_markdown_urls(self) -> List[str]:
@@ -27,7 +31,7 @@ class GitHubProcessor:
         repos = []
         page = 1
         while True:
-            url = f"https://api.github.com/users/{self.username}/repos?per_page=100&page={page}"
+            url = f"{self.api_url}/users/{self.username}/repos?per_page=100&page={page}"
             res = requests.get(url, headers=self.headers)
             if res.status_code != 200:
                 raise Exception(f"GitHub API error: {res.status_code}")
@@ -41,7 +45,7 @@ class GitHubProcessor:
     def get_markdown_urls_for_repo(self, owner: str, repo: str) -> List[str]:
         """Get all markdown files from a specific repository."""
         def recurse(path=""):
-            url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+            url = f"{self.api_url}/repos/{owner}/{repo}/contents/{path}"
             res = requests.get(url, headers=self.headers)
             if res.status_code != 200:
                 return []
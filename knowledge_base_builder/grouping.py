@@ -0,0 +1,86 @@
+import math
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from knowledge_base_builder.embeddings import HashingEmbedder, _normalize
+
+def tfidf(texts: List[str], embedder: Any = None) -> np.ndarray:
+    """L2-normalized TF-IDF vectors of texts, over the hashed features of the embedder."""
+    embedder = embedder if embedder is not None else HashingEmbedder(1024)
+    vectors = np.asarray(embedder.embed(texts), dtype=np.float32)
+    if getattr(embedder, 'idf', False):
+        frequency = (vectors != 0).sum(axis=0)
+        vectors = vectors * (np.log((1 + len(texts)) / (1 + frequency)) + 1).astype(np.float32)
+    return _normalize(vectors)
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 25, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means over L2-normalized rows: cosine similarity assigns rows to
+    centroids, seeded with k-means++ for a deterministic result. Empty clusters
+    are re-seeded with the row farthest from its centroid. Returns a label per row.
+    """
+    n = len(vectors)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    centroids = [vectors[rng.integers(n)]]
+    distance = 1 - vectors @ centroids[0]
+    for _ in range(1, k):
+        weights = np.clip(distance, 0, None) ** 2
+        choice = rng.choice(n, p=weights / weights.sum()) if weights.sum() > 0 else rng.integers(n)
+        centroids.append(vectors[choice])
+        distance = np.minimum(distance, 1 - vectors @ vectors[choice])
+    centroids = np.array(centroids)
+
+    labels = np.full(n, -1)
+    for _ in range(iterations):
+        similarity = vectors @ centroids.T
+        new_labels = similarity.argmax(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            members = labels == cluster
+            if members.any():
+                centroids[cluster] = vectors[members].sum(axis=0)
+            else:
+                centroids[cluster] = vectors[int(similarity.max(axis=1).argmin())]
+        centroids = _normalize(centroids)
+    return labels
+
+class TopicGrouper:
+    """
+    Reorder documents so those on the same topic are chunked together.
+
+    Documents are embedded as TF-IDF vectors and clustered with k-means, by
+    default into about sqrt(n / 2) groups. Groups follow the position of their
+    first document and documents keep their relative order within a group, so
+    an unclustered corpus stays in collection order. `groups` holds the sources
+    of each group of the last call.
+    """
+
+    def __init__(self, clusters: Optional[int] = None, embedder: Any = None, seed: int = 0):
+        self.clusters = clusters
+        self.embedder = embedder
+        self.seed = seed
+        self.groups: List[List[str]] = []
+
+    def order(self, documents: List[Tuple[str, str]]) -> List[int]:
+        """Positions of the (text, source) documents in grouped order."""
+        if len(documents) < 3:
+            self.groups = [[source for _, source in documents]] if documents else []
+            return list(range(len(documents)))
+        k = self.clusters or max(1, round(math.sqrt(len(documents) / 2)))
+        labels = kmeans(tfidf([text for text, _ in documents], self.embedder), k, seed=self.seed)
+        first_seen = {}
+        for position, label in enumerate(labels):
+            first_seen.setdefault(int(label), position)
+        order = sorted(range(len(documents)), key=lambda position: (first_seen[int(labels[position])], position))
+        self.groups = []
+        previous = None
+        for position in order:
+            if labels[position] != previous:
+                self.groups.append([])
+                previous = labels[position]
+            self.groups[-1].append(documents[position][1])
+        return order
@@ -0,0 +1,361 @@
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Placeholder for <br> inside an inline run; never produced by parsers
+_LINE_BREAK = '\x00'
+
+# (event, tag, data): ('start', tag, attrs), ('end', tag, None), ('text', None, text)
+HTMLEvent = Tuple[str, Optional[str], object]
+
+class Block(NamedTuple):
+    """A rendered block of Markdown text."""
+    kind: str
+    text: str
+    # Characters of the block that sit inside <a> elements
+    link_chars: int = 0
+    # Tag names, ids, classes and roles of the enclosing elements, outermost first
+    hints: Tuple[str, ...] = ()
+
+class HTMLCleaner:
+    """
+    Convert HTML into Markdown-flavoured text in a single walk over the document.
+
+    Parsing is delegated to a pluggable engine that turns HTML into a flat
+    start/text/end event stream. The lxml engine is used when lxml is installed;
+    the standard library parser is the fallback. Non-content subtrees (scripts,
+    styles, navigation, SVG, ...) are dropped while walking, and headings, lists,
+    tables and preformatted blocks are kept as Markdown so the LLM sees structure.
+    """
+
+    # Never void elements: a skipped tag must have an end tag to stop skipping at
+    SKIP_TAGS = frozenset([
+        'script', 'style', 'noscript', 'template', 'head', 'nav', 'svg', 'math',
+        'iframe', 'object', 'canvas', 'select', 'button',
+    ])
+    BLOCK_TAGS = frozenset([
+        'p', 'div', 'section', 'article', 'main', 'header', 'footer', 'aside',
+        'blockquote', 'form', 'fieldset', 'figure', 'figcaption', 'address',
+        'details', 'summary', 'dl', 'dt', 'dd', 'body', 'center', 'hr',
+    ])
+    HEADING_TAGS = {f'h{level}': level for level in range(1, 7)}
+    # Container tags whose names are worth recording as block hints
+    HINT_TAGS = frozenset(['header', 'footer', 'aside', 'article', 'main', 'form'])
+
+    _engines: Dict[str, Callable[[str], Iterator[HTMLEvent]]] = {}
+
+    def __init__(self, engine: Optional[str] = None):
+        self.engine = engine or self.default_engine()
+        if self.engine not in self._engines:
+            raise ValueError(f"Unknown HTML engine: {self.engine}. Available: {', '.join(self._engines)}")
+
+    @classmethod
+    def register_engine(cls, name: str, parse: Callable[[str], Iterator[HTMLEvent]]) -> None:
+        """Register a parser that turns an HTML string into start/text/end events."""
+        cls._engines[name] = parse
+
+    @classmethod
+    def default_engine(cls) -> str:
+        """Return the fastest registered engine."""
+        return 'lxml' if 'lxml' in cls._engines else 'html.parser'
+
+    def to_markdown(self, html: str) -> str:
+        """Convert an HTML document into Markdown text."""
+        return self.join_blocks(self.to_blocks(html))
+
+    def to_blocks(self, html: str) -> List[Block]:
+        """Convert an HTML document into a list of Markdown blocks."""
+        renderer = _MarkdownRenderer(self.SKIP_TAGS, self.BLOCK_TAGS, self.HEADING_TAGS, self.HINT_TAGS)
+        for event, tag, data in self._engines[self.engine](html):
+            if event == 'text':
+                renderer.text(data)
+            elif event == 'start':
+                renderer.start(tag, data)
+            else:
+                renderer.end(tag)
+        return renderer.close()
+
+    @staticmethod
+    def join_blocks(blocks: List[Block]) -> str:
+        """Join blocks with blank lines, keeping consecutive list items together."""
+        parts = []
+        previous = None
+        for block in blocks:
+            if parts:
+                parts.append('\n' if block.kind == previous == 'list_item' else '\n\n')
+            parts.append(block.text)
+            previous = block.kind
+        return ''.join(parts)
+
+class _TableState:
+    """Rows and the cell currently being filled for one open <table>."""
+    def __init__(self):
+        self.rows: List[List[str]] = []
+        self.row: Optional[List[str]] = None
+        self.cell: Optional[List[str]] = None
+
+class _MarkdownRenderer:
+    """Turn a start/text/end event stream into Markdown blocks."""
+
+    VOID_TAGS = frozenset([
+        'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+        'meta', 'param', 'source', 'track', 'wbr',
+    ])
+
+    def __init__(self, skip_tags, block_tags, heading_tags, hint_tags):
+        self.skip_tags = skip_tags
+        self.block_tags = block_tags
+        self.heading_tags = heading_tags
+        self.hint_tags = hint_tags
+        self.open_elements: List[Tuple[str, str]] = []  # (tag, hint)
+        self.link_depth = 0
+        self.link_chars = 0
+        self.blocks: List[Block] = []
+        self.inline: List[str] = []
+        self.kind = 'paragraph'
+        self.prefix = ''
+        self.skip_depth = 0
+        self.pre_depth = 0
+        self.lists: List[List] = []  # [ordered, next number]
+        self.tables: List[_TableState] = []
+
+    def _in_cell(self) -> bool:
+        return bool(self.tables) and self.tables[-1].cell is not None
+
+    def _emit(self, kind: str, text: str) -> None:
+        hints = tuple(hint for _, hint in self.open_elements if hint)
+        self.blocks.append(Block(kind, text, self.link_chars, hints))
+        self.link_chars = 0
+
+    def _open(self, tag: str, attrs) -> None:
+        """Track the element so blocks can report their enclosing containers."""
+        if tag in self.VOID_TAGS:
+            return
+        if attrs and not hasattr(attrs, 'get'):
+            attrs = dict(attrs)
+        parts = [tag] if tag in self.hint_tags else []
+        # Page-level classes on <html>/<body> say nothing about a single block
+        if attrs and tag not in ('html', 'body'):
+            parts.extend(value for value in (attrs.get('id'), attrs.get('class'), attrs.get('role')) if value)
+        self.open_elements.append((tag, ' '.join(parts)))
+
+    def _close(self, tag: str) -> None:
+        # Tolerate unclosed children (common with html.parser) by unwinding to the match
+        for index in range(len(self.open_elements) - 1, -1, -1):
+            if self.open_elements[index][0] == tag:
+                del self.open_elements[index:]
+                return
+
+    def flush(self) -> None:
+        """Finish the current inline run as a block."""
+        if self._in_cell():
+            self.tables[-1].cell.append(' ')
+            return
+        text = ''.join(self.inline)
+        self.inline = []
+        if self.kind == 'code':
+            if text.strip('\n'):
+                self._emit('code', f"```\n{text.strip(chr(10))}\n```")
+        else:
+            # Collapse whitespace, keeping explicit <br> line breaks
+            text = '\n'.join(' '.join(line.split()) for line in text.split(_LINE_BREAK))
+            text = text.strip('\n')
+            if text:
+                self._emit(self.kind, self.prefix + text)
+        self.kind = 'paragraph'
+        self.prefix = ''
+
+    def text(self, data: str) -> None:
+        if self.skip_depth:
+            return
+        if self.link_depth:
+            self.link_chars += len(data.strip())
+        if self._in_cell():
+            self.tables[-1].cell.append(data)
+        else:
+            self.inline.append(data)
+
+    def start(self, tag: str, attrs=None) -> None:
+        if tag == 'body':
+            # An unclosed <head> must not swallow the page
+            self.skip_depth = 0
+        skipped = tag in self.skip_tags and tag not in self.VOID_TAGS
+        if self.skip_depth or skipped:
+            self.skip_depth += skipped
+            return
+        self._dispatch_start(tag)
+        self._open(tag, attrs)
+
+    def _dispatch_start(self, tag: str) -> None:
+        if tag == 'a':
+            self.link_depth += 1
+
+        elif tag in self.heading_tags:
+            self.flush()
+            if not self._in_cell():
+                self.kind = 'heading'
+                self.prefix = '#' * self.heading_tags[tag] + ' '
+        elif tag in ('ul', 'ol'):
+            self.flush()
+            self.lists.append([tag == 'ol', 1])
+        elif tag == 'li':
+            self.flush()
+            if not self._in_cell():
+                depth = max(len(self.lists), 1)
+                marker = '- '
+                if self.lists and self.lists[-1][0]:
+                    marker = f"{self.lists[-1][1]}. "
+                    self.lists[-1][1] += 1
+                self.kind = 'list_item'
+                self.prefix = '  ' * (depth - 1) + marker
+        elif tag == 'pre':
+            self.flush()
+            self.pre_depth += 1
+            if not self._in_cell():
+                self.kind = 'code'
+        elif tag == 'br':
+            self.text('\n' if self.pre_depth else _LINE_BREAK)
+        elif tag == 'table':
+            self.flush()
+            self.tables.append(_TableState())
+        elif tag == 'tr' and self.tables:
+            self._end_row()
+            self.tables[-1].row = []
+        elif tag in ('td', 'th') and self.tables:
+            table = self.tables[-1]
+            self._end_cell()
+            if table.row is None:
+                table.row = []
+            table.cell = []
+        elif tag in self.block_tags:
+            self.flush()
+
+    def end(self, tag: str) -> None:
+        if self.skip_depth:
+            self.skip_depth -= tag in self.skip_tags and tag not in self.VOID_TAGS
+            return
+        # Flush while the element is still open so its block carries its hints
+        self._dispatch_end(tag)
+        self._close(tag)
+
+    def _dispatch_end(self, tag: str) -> None:
+        if tag == 'a':
+            self.link_depth = max(self.link_depth - 1, 0)
+        elif tag in self.heading_tags or tag == 'li' or tag in self.block_tags:
+            self.flush()
+        elif tag in ('ul', 'ol'):
+            self.flush()
+            if self.lists:
+                self.lists.pop()
+        elif tag == 'pre':
+            if not self._in_cell():
+                self.flush()
+            self.pre_depth = max(self.pre_depth - 1, 0)
+        elif tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'table' and self.tables:
+            self._end_row()
+            table = self.tables.pop()
+            rendered = self._render_table(table.rows)
+            if self._in_cell():
+                self.tables[-1].cell.append(' ' + rendered.replace('\n', ' ') + ' ')
+            elif rendered:
+                self._emit('table', rendered)
+
+    def _end_cell(self) -> None:
+        table = self.tables[-1]
+        if table.cell is not None:
+            cell = ''.join(table.cell).replace(_LINE_BREAK, ' ')
+            table.row.append(' '.join(cell.split()).replace('|', '\\|'))
+            table.cell = None
+
+    def _end_row(self) -> None:
+        if not self.tables:
+            return
+        self._end_cell()
+        table = self.tables[-1]
+        if table.row:
+            table.rows.append(table.row)
+        table.row = None
+
+    @staticmethod
+    def _render_table(rows: List[List[str]]) -> str:
+        rows = [row for row in rows if any(row)]
+        if not rows:
+            return ''
+        width = max(len(row) for row in rows)
+        rows = [row + [''] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "| " + " | ".join(['---'] * width) + " |"]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return '\n'.join(lines)
+
+    def close(self) -> List[Block]:
+        while self.tables:
+            self.end('table')
+        self.flush()
+        return self.blocks
+
+class _StdlibEventParser(HTMLParser):
+    """Collect start/text/end events with the standard library parser."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events: List[HTMLEvent] = []
+
+    def handle_starttag(self, tag, attrs):
+        self.events.append(('start', tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.events.append(('start', tag, attrs))
+        self.events.append(('end', tag, None))
+
+    def handle_endtag(self, tag):
+        self.events.append(('end', tag, None))
+
+    def handle_data(self, data):
+        self.events.append(('text', None, data))
+
+def _parse_with_stdlib(html: str) -> Iterator[HTMLEvent]:
+    parser = _StdlibEventParser()
+    parser.feed(html)
+    parser.close()
+    return iter(parser.events)
+
+HTMLCleaner.register_engine('html.parser', _parse_with_stdlib)
+
+try:
+    import lxml.html
+    from lxml import etree
+
+    _LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+    def _parse_with_lxml(html: str) -> Iterator[HTMLEvent]:
+        # Encode first: lxml rejects str input that carries an encoding declaration
+        data = html.encode('utf-8') if isinstance(html, str) else html
+        if not data.strip():
+            return
+        try:
+            root = lxml.html.document_fromstring(data, parser=_LXML_PARSER)
+        except etree.ParserError:
+            return
+        # Drop non-content subtrees in C before walking the tree in Python
+        etree.strip_elements(root, *HTMLCleaner.SKIP_TAGS, with_tail=False)
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            tag = element.tag
+            if not isinstance(tag, str):
+                # Comments and processing instructions: keep only the tail text
+                if event == 'end' and element.tail:
+                    yield 'text', None, element.tail
+                continue
+            if event == 'start':
+                yield 'start', tag, element.attrib
+                if element.text:
+                    yield 'text', None, element.text
+            else:
+                yield 'end', tag, None
+                if element.tail:
+                    yield 'text', None, element.tail
+
+    HTMLCleaner.register_engine('lxml', _parse_with_lxml)
+except ImportError:
+    pass
@@ -0,0 +1,220 @@
+"""Incremental JSON reading for documents too large to json.load at once."""
+
+import json
+import re
+from json.decoder import scanstring, JSONDecodeError
+from typing import Any, Iterator, List, TextIO, Tuple
+
+# One token per match: punctuation | escape-free string | number | literal
+_TOKEN = re.compile(
+    r'[ \t\n\r]*(?:([{}\[\],:])|"([^"\\\x00-\x1f]*)"'
+    r'|(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?)|(true|false|null|NaN|Infinity|-Infinity))'
+)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# NaN and the infinities are not JSON, but json.load accepts them and so do we
+_LITERALS = {
+    'true': True, 'false': False, 'null': None,
+    'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf'),
+}
+# Longest token that can be cut short at the end of the buffer without any match ("-Infinit")
+_PARTIAL_TOKEN = len('-Infinity')
+_DECODER = json.JSONDecoder()
+
+# Event names emitted by iter_json_events
+START_MAP, END_MAP, START_ARRAY, END_ARRAY, KEY, VALUE = (
+    'start_map', 'end_map', 'start_array', 'end_array', 'key', 'value'
+)
+
+def _iter_tokens(fp: TextIO, buffer_size: int) -> Iterator[Tuple[Any, Any]]:
+    """
+    Yield (punctuation, None) or (None, value) tokens from a text stream.
+
+    Containers that are complete inside the current buffer are decoded in one
+    step by the C decoder and yielded as a single value; only containers that
+    straddle the end of the buffer are broken into punctuation tokens.
+    """
+    buf = ''
+    pos = 0
+    eof = False
+
+    while True:
+        match = _TOKEN.match(buf, pos)
+        # A token touching the end of the buffer may continue in the next
+        # read ("tr" + "ue", "1." + "5", "1e" + "+5"), so treat it as missing
+        if match is None or (not eof and match.end() + 2 >= len(buf)):
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= len(buf) and eof:
+                return
+            if not eof and (match is not None or len(buf) - pos < _PARTIAL_TOKEN):
+                # Grow geometrically so huge values are not rescanned per read
+                buf, data = buf[pos:], fp.read(max(buffer_size, len(buf) - pos))
+                eof = not data
+                buf += data
+                pos = 0
+                continue
+            if buf[pos] != '"':
+                raise JSONDecodeError("Unexpected character", buf, pos)
+            # Strings with escapes go through the C scanner used by json itself
+            try:
+                value, pos = scanstring(buf, pos + 1)
+            except JSONDecodeError:
+                if eof:
+                    raise
+                buf, data = buf[pos:], fp.read(max(buffer_size, len(buf) - pos))
+                eof = not data
+                buf += data
+                pos = 0
+                continue
+            yield None, value
+            continue
+
+        punct, string, number, literal = match.groups()
+        if punct is not None:
+            if punct in '{[':
+                try:
+                    value, pos = _DECODER.raw_decode(buf, match.end() - 1)
+                except (ValueError, RecursionError):
+                    pass
+                else:
+                    yield None, value
+                    continue
+            pos = match.end()
+            yield punct, None
+        elif string is not None:
+            pos = match.end()
+            yield None, string
+        elif number is not None:
+            pos = match.end()
+            yield None, float(number) if ('.' in number or 'e' in number or 'E' in number) else int(number)
+        else:
+            pos = match.end()
+            yield None, _LITERALS[literal]
+
+def iter_json_events(fp: TextIO, buffer_size: int = 1024 * 1024) -> Iterator[Tuple[str, Any]]:
+    """
+    Parse a JSON text stream into (event, value) pairs without building the document.
+
+    Containers small enough to be complete inside the read buffer arrive as a
+    single VALUE event carrying the decoded dict/list; larger ones are reported
+    as start/key/end events. Memory stays bounded by the buffer size and the
+    nesting depth instead of the document size.
+
+    Unlike json.load, a key repeated within a streamed mapping is reported for
+    each occurrence rather than keeping only its last value.
+    """
+    stack = []
+    # What the grammar allows next: 'value', 'value_or_end' (after '['), 'key',
+    # 'key_or_end' (after '{'), 'colon', 'comma_or_end' or 'done' (top-level value read)
+    expect = 'value'
+
+    for punct, value in _iter_tokens(fp, buffer_size):
+        if punct is None:
+            if expect in ('key', 'key_or_end'):
+                if not isinstance(value, str):
+                    raise ValueError(f"Expected a string key in JSON stream, got {value!r}")
+                expect = 'colon'
+                yield KEY, value
+                continue
+            if expect not in ('value', 'value_or_end'):
+                raise ValueError(f"Unexpected value {value!r} in JSON stream (expected {expect})")
+            expect = 'comma_or_end' if stack else 'done'
+            yield VALUE, value
+        elif punct == ',':
+            if expect != 'comma_or_end':
+                raise ValueError(f"Unexpected ',' in JSON stream (expected {expect})")
+            expect = 'key' if stack[-1] == '{' else 'value'
+        elif punct == ':':
+            if expect != 'colon':
+                raise ValueError(f"Unexpected ':' in JSON stream (expected {expect})")
+            expect = 'value'
+        elif punct in '{[':
+            if expect not in ('value', 'value_or_end'):
+                raise ValueError(f"Unexpected '{punct}' in JSON stream (expected {expect})")
+            stack.append(punct)
+            if punct == '{':
+                expect = 'key_or_end'
+                yield START_MAP, None
+            else:
+                expect = 'value_or_end'
+                yield START_ARRAY, None
+        else:
+            opener = '{' if punct == '}' else '['
+            if not stack or stack[-1] != opener:
+                raise ValueError(f"Unbalanced '{punct}' in JSON stream")
+            # A trailing comma leaves 'key' or 'value' expected and is rejected here
+            if expect not in ('comma_or_end', 'key_or_end' if opener == '{' else 'value_or_end'):
+                raise ValueError(f"Unexpected '{punct}' in JSON stream (expected {expect})")
+            stack.pop()
+            expect = 'comma_or_end' if stack else 'done'
+            yield (END_MAP if punct == '}' else END_ARRAY), None
+
+    if expect != 'done':
+        raise ValueError("Unexpected end of JSON stream")
+
+def format_value(obj: Any, level: int = 0) -> List[str]:
+    """
+    Render a decoded JSON value as indented "key: value" lines.
+
+    Mapping values that are containers go one level deeper, while containers
+    inside arrays stay at the array's level. Uses an explicit work stack so deep
+    values cannot hit the recursion limit.
+    """
+    lines = []
+    # Work items are either ready lines (str) or (value, level) pairs
+    work: List[Any] = [(obj, level)]
+    while work:
+        item = work.pop()
+        if isinstance(item, str):
+            lines.append(item)
+            continue
+        value, level = item
+        indent = '  ' * level
+        if isinstance(value, dict):
+            for key, child in reversed(list(value.items())):
+                if isinstance(child, (dict, list)):
+                    work.append((child, level + 1))
+                    work.append(f"{indent}{key}:")
+                else:
+                    work.append(f"{indent}{key}: {child}")
+        elif isinstance(value, list):
+            for child in reversed(value):
+                if isinstance(child, (dict, list)):
+                    work.append((child, level))
+                else:
+                    work.append(indent + str(child))
+        else:
+            lines.append(indent + str(value))
+    return lines
+
+def iter_formatted_lines(events: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+    """Render iter_json_events output with the same layout as format_value."""
+    # Each open container: [is_map, indent level, pending key]
+    stack = []
+
+    for event, value in events:
+        if event == KEY:
+            stack[-1][2] = value
+            continue
+        if event == VALUE and not isinstance(value, (dict, list)):
+            if stack and stack[-1][0]:
+                yield f"{'  ' * stack[-1][1]}{stack[-1][2]}: {value}"
+            else:
+                yield '  ' * (stack[-1][1] if stack else 0) + str(value)
+            continue
+        if event in (END_MAP, END_ARRAY):
+            stack.pop()
+            continue
+
+        # A container starts, either streamed or already decoded
+        level = 0
+        if stack:
+            parent_is_map, parent_level, key = stack[-1]
+            if parent_is_map:
+                yield f"{'  ' * parent_level}{key}:"
+                level = parent_level + 1
+            else:
+                level = parent_level
+        if event == VALUE:
+            yield from format_value(value, level)
+        else:
+            stack.append([event == START_MAP, level, None])
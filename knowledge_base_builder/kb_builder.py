@@ -1,13 +1,14 @@
 import asyncio
-from typing import List, Dict, Any, Tuple
+import concurrent.futures
+import contextvars
+import importlib
+from typing import List, Dict, Any, Optional, Tuple, Type
 import os
 import urllib.parse
 import re
-import time
+import threading
+from knowledge_base_builder.compat import to_thread
 from knowledge_base_builder.llm_client import LLMClient
-from knowledge_base_builder.gemini_client import GeminiClient
-from knowledge_base_builder.openai_client import OpenAIClient
-from knowledge_base_builder.anthropic_client import AnthropicClient
 from knowledge_base_builder.llm import LLM
 from knowledge_base_builder.pdf_processor import PDFProcessor
 from knowledge_base_builder.document_processor import DocumentProcessor
@@ -15,16 +16,53 @@ from knowledge_base_builder.spreadsheet_processor import SpreadsheetProcessor
 from knowledge_base_builder.web_content_processor import WebContentProcessor
 from knowledge_base_builder.website_processor import WebsiteProcessor
 from knowledge_base_builder.github_processor import GitHubProcessor
+from knowledge_base_builder.local_git_processor import LocalGitProcessor
+from knowledge_base_builder.registry import ProcessorRegistry, ProcessorSpec
+from knowledge_base_builder.html_cleaner import HTMLCleaner
+from knowledge_base_builder.content_extractor import SiteBoilerplateFilter
+from knowledge_base_builder.pipeline import StreamingPipeline
+from knowledge_base_builder.collector import OrderedCollector
+from knowledge_base_builder.checkpoint import BuildCheckpoint
+from knowledge_base_builder.chunk_writer import ChunkJSONLWriter
+from knowledge_base_builder.shard_writer import ShardedKBWriter
+from knowledge_base_builder.llms_txt import LlmsTxtWriter
+from knowledge_base_builder.walker import FileWalker, has_magic
+from knowledge_base_builder.metrics import Metrics, increment, observe, span, use_metrics
+from knowledge_base_builder.usage import UsageTracker, attribute_usage, use_tracker
+
+# Provider clients are imported on first use, so a run loads only its own provider's SDK
+_LLM_CLIENTS = {
+    'GeminiClient': 'knowledge_base_builder.gemini_client',
+    'OpenAIClient': 'knowledge_base_builder.openai_client',
+    'AnthropicClient': 'knowledge_base_builder.anthropic_client',
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _LLM_CLIENTS:
+        value = getattr(importlib.import_module(_LLM_CLIENTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _llm_client_class(name: str) -> Type[LLMClient]:
+    """The provider client class, honouring one already set on this module (e.g. by a test patch)."""
+    return globals().get(name) or __getattr__(name)
+
+# Slot reserved for the source a file task is collecting
+_current_slot: contextvars.ContextVar = contextvars.ContextVar('current_slot', default=None)
 
 class KBBuilder:
     """Main application class for building knowledge bases from various sources."""
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], llm_client: Optional[LLMClient] = None):
         self.config = config
         
         # Initialize the appropriate LLM client based on available API keys
         # Try providers in order: Gemini > OpenAI > Anthropic
-        if 'GOOGLE_API_KEY' in config and config['GOOGLE_API_KEY']:
-            self.llm_client = GeminiClient(
+        if llm_client is not None:
+            self.llm_client = llm_client
+            print(f"🤖 Using {llm_client.__class__.__name__} as LLM provider")
+        elif 'GOOGLE_API_KEY' in config and config['GOOGLE_API_KEY']:
+            self.llm_client = _llm_client_class('GeminiClient')(
                 api_key=config['GOOGLE_API_KEY'],
                 model=config.get('GEMINI_MODEL', 'gemini-2.0-flash'),
                 temperature=float(config.get('GEMINI_TEMPERATURE', 0.7)),
@@ -33,7 +71,7 @@ class KBBuilder:
             )
             print("🤖 Using Gemini as LLM provider")
         elif 'OPENAI_API_KEY' in config and config['OPENAI_API_KEY']:
-            self.llm_client = OpenAIClient(
+            self.llm_client = _llm_client_class('OpenAIClient')(
                 api_key=config['OPENAI_API_KEY'],
                 model=config.get('OPENAI_MODEL', 'gpt-4o'),
                 temperature=float(config.get('OPENAI_TEMPERATURE', 0.7)),
@@ -42,7 +80,7 @@ class KBBuilder:
             )
             print("🤖 Using OpenAI as LLM provider")
         elif 'ANTHROPIC_API_KEY' in config and config['ANTHROPIC_API_KEY']:
-            self.llm_client = AnthropicClient(
+            self.llm_client = _llm_client_class('AnthropicClient')(
                 api_key=config['ANTHROPIC_API_KEY'],
                 model=config.get('ANTHROPIC_MODEL', 'claude-3-7-sonnet'),
                 temperature=float(config.get('ANTHROPIC_TEMPERATURE', 0.7)),
@@ -62,34 +100,305 @@ class KBBuilder:
         self.web_content_processor = WebContentProcessor()
         self.website_processor = WebsiteProcessor()
         self.github_processor = None
+        
+        # Processors by extension, MIME type and file signature; plugins can add or replace them
+        self.processors = ProcessorRegistry()
+        self.processors.register('pdf', self.pdf_processor, label='PDF', icon='📄')
+        self.processors.register('document', self.document_processor, icon='📝')
+        self.processors.register('spreadsheet', self.spreadsheet_processor, icon='📊')
+        self.processors.register('web_content', self.web_content_processor, icon='🌐')
+        if config.get('PROCESSOR_PLUGINS', True):
+            for name in self.processors.load_entry_points():
+                print(f"🔌 Loaded processor plugin: {name}")
         self.text_contents: List[str] = []  # Changed from kbs to text_contents
+        
+        # Directory and glob entries of `files` are expanded with these filters
+        self.file_include = list(config.get('FILE_INCLUDE') or [])
+        self.file_exclude = list(config.get('FILE_EXCLUDE') or [])
+        self.max_file_bytes = int(float(config['MAX_FILE_MB']) * 1024 * 1024) if config.get('MAX_FILE_MB') else None
+        self.respect_gitignore = bool(config.get('RESPECT_GITIGNORE', True))
+        self.scan_workers = int(config.get('SCAN_WORKERS', 8))
+        
+        # Local git repositories: commit each one was read at (for the next delta build) and, in
+        # a delta build, the paths removed since the earlier commit
+        self.git_commits: Dict[str, str] = {}
+        self.git_removed: Dict[str, List[str]] = {}
+        
+        # Keep only the main content of web pages and drop chrome repeated across a sitemap
+        self.extract_main_content = bool(config.get('EXTRACT_MAIN_CONTENT', True))
+        self.site_boilerplate_min_pages = int(config.get('SITE_BOILERPLATE_MIN_PAGES', 3))
+
+        # Similarity above which documents and paragraphs count as duplicates (0 disables dedup)
+        self.dedup_threshold = float(config.get('DEDUP_THRESHOLD', 0.9))
+
+        # Cluster documents by topic before chunking (0 groups picks a count from the corpus size)
+        self.group_by_topic = bool(config.get('GROUP_BY_TOPIC', False))
+        self.topic_groups = int(config.get('TOPIC_GROUPS') or 0)
+
+        # Streaming pipeline: documents are chunked and sent to the LLM while later sources download
+        self.chunk_size = 20000 * 4  # ~20K tokens at 4 characters per token, leaving room for output
+        self.pipeline_queue_size = int(config.get('PIPELINE_QUEUE_SIZE', 16))
+        self.llm_workers = int(config.get('LLM_WORKERS', 8))
+        # File sources started but not yet handed on in order; bounds what waits behind a slow file
+        self.files_in_flight = int(config.get('FILES_IN_FLIGHT', 4 * self.llm_workers))
+        self._collector: Optional[OrderedCollector] = None
+        self._pipeline: Optional[StreamingPipeline] = None
+        self._loop = None
+
+        # Processed chunks as JSONL records for vector-database ingestion, alongside the Markdown
+        self.chunks_jsonl = config.get('CHUNKS_JSONL')
+        self.chunk_record_chars = int(config.get('CHUNK_RECORD_CHARS', 4000))
+        self.chunk_writer: Optional[ChunkJSONLWriter] = None
+        self._chunk_sources: Dict[int, Dict[str, int]] = {}
+
+        # Optional sharded (and compressed) copy of the KB with an index of sections
+        self.shard_dir = config.get('SHARD_DIR')
+        self.shard_max_bytes = int(float(config.get('SHARD_MAX_MB', 64)) * 1024 * 1024)
+        self.shard_compression = config.get('SHARD_COMPRESSION') or None
+        self.shard_by_source = bool(config.get('SHARD_BY_SOURCE', False))
+
+        # llms.txt site: documents are chunked on their own so each source gets its own page
+        self.llms_txt_dir = config.get('LLMS_TXT_DIR')
+        self.llms_txt_title = config.get('LLMS_TXT_TITLE', 'Knowledge Base')
+        self.llms_txt_summary = config.get('LLMS_TXT_SUMMARY')
+        self.llms_txt_base_url = config.get('LLMS_TXT_BASE_URL')
+        self.llms_writer: Optional[LlmsTxtWriter] = None
+
+        # Local vectors of the processed sections next to the KB, for query_similar
+        self.embeddings = bool(config.get('EMBEDDINGS', False))
+        self.embedder = config.get('EMBEDDER')
+        self.embedding_dimensions = int(config.get('EMBEDDING_DIMENSIONS', 512))
+        self.embedding_writer = None
+        self.embeddings_prefix: Optional[str] = None
+        self._embedding_index = None
+
+        # Durable per-source and per-chunk results, so an interrupted build can be resumed
+        self.checkpoint_dir = config.get('CHECKPOINT_DIR')
+        self.build_id = config.get('BUILD_ID')
+        self.checkpoint: Optional[BuildCheckpoint] = None
+        # Finished builds delete their checkpoint unless asked to keep it
+        self.keep_checkpoints = bool(config.get('KEEP_CHECKPOINTS', False))
+        
+        # Spans, counters and histograms of the last build
+        self.metrics = Metrics()
+
+        # Token and cost accounting; once a budget is used up no further chunks are sent
+        self.max_cost = float(config['MAX_COST']) if config.get('MAX_COST') else None
+        self.max_tokens = int(config['MAX_TOKENS']) if config.get('MAX_TOKENS') else None
+        self.model_prices = config.get('MODEL_PRICES')
+        self.usage = UsageTracker(self.model_prices, self.max_cost, self.max_tokens)
 
     def build(self, sources: Dict[str, Any] = None, output_file: str = "final_knowledge_base.md") -> str:
-        """Synchronously run the pipeline up to merge, then dispatch async merge."""
-        total_start_time = time.time()
+        """Collect every source and stream the extracted text through the LLM as it arrives."""
+        self.metrics = Metrics()
+        self.usage = UsageTracker(self.model_prices, self.max_cost, self.max_tokens)
+        with use_metrics(self.metrics), use_tracker(self.usage):
+            try:
+                with span('build') as build:
+                    self._build(sources or {}, output_file)
+                print(f"⏱️ Total processing time: {build.duration:.2f} seconds")
+                self._finish_checkpoint()
+            finally:
+                self._report_usage()
+                self._export_metrics()
+        return output_file
+
+    def _build(self, sources: Dict[str, Any], output_file: str) -> None:
         print("🚀 Starting Knowledge Base Builder pipeline...")
         self.text_contents = []
-        sources = sources or {}
+        self._chunk_sources = {}
+
+        if self.checkpoint_dir:
+            self.checkpoint = BuildCheckpoint(self.checkpoint_dir, self.build_id)
+            self.checkpoint.save_manifest(sources, output_file)
+            print(f"💾 Checkpointing to {self.checkpoint.path} (resume with --resume {self.checkpoint.build_id})")
+
+        deduplicator = None
+        if self.dedup_threshold:
+            from knowledge_base_builder.dedup import Deduplicator
+            deduplicator = Deduplicator(threshold=self.dedup_threshold)
+        grouper = None
+        if self.group_by_topic:
+            from knowledge_base_builder.grouping import TopicGrouper
+            grouper = TopicGrouper(clusters=self.topic_groups or None)
+        pipeline = StreamingPipeline(
+            self._process_chunk_async,
+            chunk_size=self.chunk_size,
+            queue_size=self.pipeline_queue_size,
+            workers=self.llm_workers,
+            deduplicator=deduplicator,
+            per_document=bool(self.llms_txt_dir),
+            grouper=grouper,
+        )
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            # asyncio.run() elsewhere in this thread leaves no current loop behind
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        if self.chunks_jsonl:
+            self.chunk_writer = ChunkJSONLWriter(self.chunks_jsonl, self.chunk_record_chars)
+        if self.embeddings:
+            from knowledge_base_builder.embeddings import EmbeddingIndexWriter, load_embedder
+            self.embeddings_prefix = os.path.splitext(output_file)[0]
+            self._embedding_index = None
+            self.embedding_writer = EmbeddingIndexWriter(
+                self.embeddings_prefix,
+                load_embedder(self.embedder, self.embedding_dimensions),
+                self.chunk_record_chars,
+            )
+        if self.llms_txt_dir:
+            self.llms_writer = LlmsTxtWriter(self.llms_txt_dir, self.llms_txt_title,
+                                             self.llms_txt_summary, self.llms_txt_base_url)
+        try:
+            processed_chunks = loop.run_until_complete(self._run_pipeline(pipeline, sources))
+        finally:
+            if self.chunk_writer is not None:
+                self.chunk_writer.close()
+                print(f"🧩 Wrote {self.chunk_writer.records} chunk records to: {self.chunks_jsonl}")
+                self.chunk_writer = None
+            if self.llms_writer is not None:
+                index_path = self.llms_writer.close()
+                print(f"🤖 Wrote {len(self.llms_writer.pages)} llms.txt pages; index: {index_path}")
+                self.llms_writer = None
+            if self.embedding_writer is not None:
+                with span('embeddings') as embed:
+                    vectors_path = self.embedding_writer.close()
+                print(f"🧭 Wrote {len(self.embedding_writer.rows)} section vectors to: {vectors_path} "
+                      f"({embed.duration:.2f} seconds)")
+                self.embedding_writer = None
+
+        if deduplicator is not None:
+            for record in deduplicator.report:
+                print(f"  ♻️ Dropped {record.kind} from {record.source} "
+                      f"({record.similarity:.0%} similar to {record.duplicate_of}, {record.chars} chars)")
+            print(f"♻️ Dedup: {deduplicator.summary()}")
+            increment('dedup_removed_chars', sum(record.chars for record in deduplicator.report))
+
+        if grouper is not None and grouper.groups:
+            print(f"🧲 Grouped {pipeline.documents} documents into {len(grouper.groups)} topics before chunking")
+            for group in grouper.groups:
+                print(f"  🧲 {len(group)} documents, starting with {group[0]}")
+
+        if not pipeline.documents:
+            print("⚠️ No content collected.")
+            return
+
+        print(f"📚 Processed {pipeline.documents} documents in {pipeline.chunks} chunks of text")
+        increment('documents', pipeline.documents)
+        increment('chunks', pipeline.chunks)
+        if self.checkpoint is not None:
+            print(f"💾 Reused {self.checkpoint.reused_sources} sources and "
+                  f"{self.checkpoint.reused_chunks} chunks from checkpoint")
+
+        # Combine all processed chunks
+        processed_content = "\n\n".join(processed_chunks)
+
+        # Store the processed content
+        self.text_contents = [processed_content]
 
-        # process all your legacy or unified sources exactly as before...
+        with span('write') as write:
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(processed_content)
+        print(f"⏱️ File writing completed in {write.duration:.2f} seconds")
+        print(f"✅ Final KB written to: {output_file}")
+
+        if self.shard_dir:
+            self._write_shards(pipeline)
+
+    def _write_shards(self, pipeline: StreamingPipeline) -> None:
+        """Write the processed chunks as size-bounded shards with an index of their sections."""
+        with span('write_shards') as write:
+            writer = ShardedKBWriter(
+                self.shard_dir,
+                max_shard_bytes=self.shard_max_bytes,
+                compression=self.shard_compression,
+                by_source=self.shard_by_source,
+            )
+            for index, outputs in pipeline.chunk_results():
+                if outputs:
+                    writer.add("\n\n".join(outputs), self._chunk_sources.get(index))
+            index_path = writer.close()
+        print(f"🗂️ Wrote {len(writer.sections)} sections in {len(writer.shards)} shards "
+              f"({write.duration:.2f} seconds); index: {index_path}")
+
+    def query_similar(self, text: str, k: int = 5, prefix: Optional[str] = None) -> List[Any]:
+        """
+        The k sections of the KB most similar to a text, as SimilarChunk records
+        (score, chunk, heading_path, sources, text). Searches the vectors of the
+        last build with EMBEDDINGS enabled, or those stored under prefix.
+        """
+        from knowledge_base_builder.embeddings import EmbeddingIndex, load_embedder
+
+        prefix = prefix or self.embeddings_prefix
+        if not prefix:
+            raise ValueError("No vector index: build with EMBEDDINGS enabled or pass the KB path prefix")
+        # The index stays open between queries until another prefix or build replaces it
+        if self._embedding_index is None or self._embedding_index[0] != prefix:
+            embedder = load_embedder(self.embedder, self.embedding_dimensions) if self.embedder else None
+            self._embedding_index = (prefix, EmbeddingIndex(prefix, embedder))
+        return self._embedding_index[1].query(text, k)
+
+    def _report_usage(self) -> None:
+        """Print the run's LLM usage and the sources that cost the most."""
+        print(f"💰 LLM usage: {self.usage.summary()}")
+        for source, bucket in list(self.usage.report()['by_source'].items())[:5]:
+            print(f"  💰 {source}: ${bucket['cost']:.4f} "
+                  f"({int(bucket['input_tokens'])} input / {int(bucket['output_tokens'])} output tokens)")
+        if reason := self.usage.exceeded:
+            print(f"⚠️ Budget exhausted: {reason}")
+
+    def _finish_checkpoint(self) -> None:
+        """Remove the checkpoint of a build that finished all its work; keep it while a resume can still help."""
+        if self.checkpoint is None or self.keep_checkpoints:
+            return
+        unfinished = int(self.metrics.counters.get('sub_chunk_failures', 0)
+                         + self.metrics.counters.get('chunks_skipped_budget', 0))
+        if unfinished:
+            print(f"💾 Kept checkpoint {self.checkpoint.path} for --resume {self.checkpoint.build_id}: "
+                  f"{unfinished} chunks unfinished")
+            return
+        self.checkpoint.remove()
+        print(f"🧹 Removed checkpoint {self.checkpoint.path} of the finished build")
+
+    def _export_metrics(self) -> None:
+        """Write the run's metrics to the configured report files."""
+        if path := self.config.get('METRICS_JSON'):
+            self.metrics.write_json(path, usage=self.usage.report())
+            print(f"📈 Metrics report written to: {path}")
+        if path := self.config.get('METRICS_PROM'):
+            self.metrics.write_prometheus(path)
+            print(f"📈 Prometheus metrics written to: {path}")
+
+    async def _run_pipeline(self, pipeline: StreamingPipeline, sources: Dict[str, Any]) -> List[str]:
+        """Route collected documents into the pipeline while it runs."""
+        self._collector = OrderedCollector(pipeline.put)
+        self._pipeline = pipeline
+        self._loop = asyncio.get_running_loop()
+        try:
+            return await pipeline.run(lambda: self._collect_sources(sources))
+        finally:
+            self._collector = None
+            self._pipeline = None
+            self._loop = None
+
+    async def _collect_sources(self, sources: Dict[str, Any]) -> None:
+        """Fetch and extract every source; blocking phases run in a worker thread."""
         if files := sources.get('files', []):
-            files_start_time = time.time()
-            asyncio.get_event_loop().run_until_complete(self.process_files_async(files))
-            files_end_time = time.time()
-            print(f"⏱️ Files processing completed in {files_end_time - files_start_time:.2f} seconds")
+            with span('files') as phase:
+                await self.process_files_async(files)
+            print(f"⏱️ Files processing completed in {phase.duration:.2f} seconds")
         else:
             print("ℹ️ No files provided for processing")
             
-        legacy_start_time = time.time()
-        self._process_legacy_sources(sources)
-        legacy_end_time = time.time()
-        print(f"⏱️ Legacy sources processing completed in {legacy_end_time - legacy_start_time:.2f} seconds")
+        with span('legacy') as phase:
+            await to_thread(self._process_legacy_sources, sources)
+        print(f"⏱️ Legacy sources processing completed in {phase.duration:.2f} seconds")
         
         if sitemap := sources.get('sitemap_url'):
-            sitemap_start_time = time.time()
-            self.process_websites(sitemap)
-            sitemap_end_time = time.time()
-            print(f"⏱️ Sitemap processing completed in {sitemap_end_time - sitemap_start_time:.2f} seconds")
+            with span('sitemap') as phase:
+                await to_thread(self.process_websites, sitemap)
+            print(f"⏱️ Sitemap processing completed in {phase.duration:.2f} seconds")
             
         # Handle GitHub repositories
         github_repos = sources.get('github_repositories', [])
@@ -97,74 +406,106 @@ class KBBuilder:
         
         if github_username:
             print(f"👤 Processing all repositories for GitHub user: {github_username}")
-            github_start_time = time.time()
-            self.process_github(github_username)
-            github_end_time = time.time()
-            print(f"⏱️ GitHub user processing completed in {github_end_time - github_start_time:.2f} seconds")
+            with span('github') as phase:
+                await to_thread(self.process_github, github_username)
+            print(f"⏱️ GitHub user processing completed in {phase.duration:.2f} seconds")
         elif github_repos:
-            github_start_time = time.time()
-            self.process_github_repos(github_repos)
-            github_end_time = time.time()
-            print(f"⏱️ GitHub repositories processing completed in {github_end_time - github_start_time:.2f} seconds")
+            with span('github') as phase:
+                await to_thread(self.process_github_repos, github_repos)
+            print(f"⏱️ GitHub repositories processing completed in {phase.duration:.2f} seconds")
 
-        # Process all collected content through LLM once
-        if not self.text_contents:
-            print("⚠️ No content collected.")
-            return output_file
+        if git_repos := sources.get('git_repositories', []):
+            with span('git') as phase:
+                await to_thread(self.process_git_repos, git_repos)
+            print(f"⏱️ Git repositories processing completed in {phase.duration:.2f} seconds")
 
-        print("🔀 Processing all collected content through LLM...")
-        llm_start_time = time.time()
-        
-        # Concatenate all text content with clear separators
-        combined_text = "\n\n---\n\n".join(self.text_contents)
-        
-        # Split text into chunks of approximately 20K tokens (leaving room for output)
-        # Assuming average of 4 characters per token for safety
-        chunk_size = 20000 * 4  # characters
-        chunks = [combined_text[i:i + chunk_size] for i in range(0, len(combined_text), chunk_size)]
-        
-        print(f"📚 Processing {len(chunks)} chunks of text...")
-        processed_chunks = []
-        
-        for i, chunk in enumerate(chunks, 1):
-            print(f"  Processing chunk {i}/{len(chunks)}...")
+    async def _process_chunk_async(self, chunk: str, index: int, sources: Dict[str, int]) -> List[str]:
+        """Process one chunk and stream it to the chunk JSONL and llms.txt outputs, if any."""
+        processed = await self._preprocess_chunk_async(chunk, index, sources)
+        self._chunk_sources[index] = sources
+        if self.chunk_writer is not None and processed:
+            self.chunk_writer.write(index, processed, sources)
+        if self.embedding_writer is not None and processed:
+            with span('embed', index=index):
+                await to_thread(self.embedding_writer.add, index, processed, sources)
+        if self.llms_writer is not None and self._pipeline is not None:
+            # Per-document chunks have exactly one source
+            for source in sources:
+                self.llms_writer.add(index, processed, source, self._pipeline.document_chunks[source])
+        return processed
+
+    async def _preprocess_chunk_async(self, chunk: str, index: int, sources: Dict[str, int]) -> List[str]:
+        """Run one chunk through the LLM, retrying in halves if it fails."""
+        with span('chunk', index=index), attribute_usage('chunk', sources):
+            observe('chunk_chars', len(chunk))
+            if self.checkpoint is not None and (cached := self.checkpoint.load_chunk(chunk)) is not None:
+                print(f"  💾 Chunk {index} restored from checkpoint")
+                return [cached]
+
+            if reason := self.usage.exceeded:
+                increment('chunks_skipped_budget')
+                print(f"  ⚠️ Skipping chunk {index}: {reason}")
+                return []
+
+            print(f"  Processing chunk {index}...")
+            complete = True
             try:
-                processed_chunk = asyncio.get_event_loop().run_until_complete(
-                    self.llm.preprocess_text_async(chunk)
-                )
-                processed_chunks.append(processed_chunk)
+                processed = [await self.llm.preprocess_text_async(chunk)]
             except Exception as e:
-                print(f"❌ Error processing chunk {i}: {e}")
+                increment('chunk_failures')
+                print(f"❌ Error processing chunk {index}: {e}")
                 # If a chunk fails, try to process it in smaller pieces
-                sub_chunks = [chunk[i:i + chunk_size//2] for i in range(0, len(chunk), chunk_size//2)]
-                for j, sub_chunk in enumerate(sub_chunks, 1):
+                half = self.chunk_size // 2
+                processed = []
+                for j, start in enumerate(range(0, len(chunk), half), 1):
                     try:
-                        processed_sub_chunk = asyncio.get_event_loop().run_until_complete(
-                            self.llm.preprocess_text_async(sub_chunk)
-                        )
-                        processed_chunks.append(processed_sub_chunk)
+                        processed.append(await self.llm.preprocess_text_async(chunk[start:start + half]))
                     except Exception as e:
-                        print(f"❌ Error processing sub-chunk {j} of chunk {i}: {e}")
-        
-        # Combine all processed chunks
-        processed_content = "\n\n".join(processed_chunks)
-        
-        llm_end_time = time.time()
-        print(f"⏱️ LLM processing completed in {llm_end_time - llm_start_time:.2f} seconds")
+                        complete = False
+                        increment('sub_chunk_failures')
+                        print(f"❌ Error processing sub-chunk {j} of chunk {index}: {e}")
 
-        # Store the processed content
-        self.text_contents = [processed_content]
+            # Partially failed chunks are not saved, so a resumed build retries them
+            if self.checkpoint is not None and complete:
+                self.checkpoint.save_chunk(chunk, "\n\n".join(processed))
+            return processed
 
-        write_start_time = time.time()
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(processed_content)
-        write_end_time = time.time()
-        print(f"⏱️ File writing completed in {write_end_time - write_start_time:.2f} seconds")
+    def _collect(self, text: str, source: str) -> None:
+        """Keep one extracted document; called from worker threads while a build is running."""
+        if self._collector is None:
+            self.text_contents.append(text)
+        else:
+            # Blocks the calling thread while the pipeline is full
+            asyncio.run_coroutine_threadsafe(self._collect_async(text, source), self._loop).result()
 
-        total_end_time = time.time()
-        print(f"✅ Final KB written to: {output_file}")
-        print(f"⏱️ Total processing time: {total_end_time - total_start_time:.2f} seconds")
-        return output_file
+    async def _collect_async(self, text: str, source: str) -> None:
+        """Keep one extracted document, in its reserved slot when it has one."""
+        slot = _current_slot.get()
+        if self.checkpoint is not None:
+            self.checkpoint.save_source(source, text)
+        if self._collector is None:
+            self.text_contents.append(text)
+        elif slot is None:
+            await self._collector.collect(text, source)
+        else:
+            self._collector.add(slot, text, source)
+
+    async def _append_async(self, text: str, source: str) -> None:
+        self.text_contents.append(text)
+
+    async def _run_in_slot(self, slot: int, url: str, task) -> None:
+        """Run a file task with its reserved slot and release the slot however the task ends."""
+        _current_slot.set(slot)
+        try:
+            cached = self.checkpoint.load_source(url) if self.checkpoint is not None else None
+            if cached is not None:
+                print(f"💾 Restored from checkpoint: {url}")
+                task.close()
+                self._collector.add(slot, cached, url)
+            else:
+                await task
+        finally:
+            await self._collector.close(slot)
 
     def _process_legacy_sources(self, sources: Dict[str, Any]) -> None:
         """Process legacy source format for backward compatibility."""
@@ -198,177 +539,181 @@ class KBBuilder:
             print(f"🌐 Processing {len(web_urls)} individual web pages (legacy format)...")
             self.process_web_urls(web_urls)
 
-    async def process_files_async(self, files: List[str]) -> None:
-        """Process files and URLs concurrently based on their type."""
-        tasks = []
-        for url in files:
-            try:
-                # Check if this is a local file path (not starting with http/https and containing a path separator)
-                if not url.startswith(('http://', 'https://', 'file://')) and (os.path.sep in url or os.path.exists(url)):
-                    # Convert local path to file:// URL format for internal processing
-                    local_path = os.path.abspath(url)
-                    
-                    # Handle Windows paths differently
-                    if os.name == 'nt':  # Windows
-                        # For Windows, ensure path starts with / and replace backslashes with forward slashes
-                        local_path = local_path.replace('\\', '/')
-                        if local_path[1] == ':':  # Has drive letter like C:
-                            url = f"file:///{local_path}"
-                        else:
-                            url = f"file:///{local_path}"
-                    else:
-                        # For Unix-like systems
-                        url = f"file://{urllib.parse.quote(local_path)}"
-                    
-                # Determine if this is a web URL or file path
-                if url.startswith(('http://', 'https://')) and not any(url.lower().endswith(ext) for ext in 
-                                                                   ['.pdf', '.docx', '.txt', '.md', '.rtf', 
-                                                                    '.csv', '.tsv', '.xlsx', '.ods',
-                                                                    '.html', '.xml', '.json', '.yaml', '.yml']):
-                    # Handle as a web URL
-                    tasks.append(self._process_web_url_async(url))
-                else:
-                    # Handle based on file extension
-                    file_ext = os.path.splitext(url)[1].lower()
-                    
-                    if file_ext == '.pdf':
-                        tasks.append(self._process_pdf_async(url))
-                    elif file_ext in ['.docx', '.txt', '.md', '.rtf']:
-                        tasks.append(self._process_document_async(url))
-                    elif file_ext in ['.csv', '.tsv', '.xlsx', '.ods']:
-                        tasks.append(self._process_spreadsheet_async(url))
-                    elif file_ext in ['.html', '.xml', '.json', '.yaml', '.yml']:
-                        tasks.append(self._process_web_content_async(url))
-                    else:
-                        # Try to process as a web URL if extension is unknown
-                        tasks.append(self._process_web_url_async(url))
-            except Exception as e:
-                print(f"❌ Error processing file: {url} - {e}")
+    @staticmethod
+    def _local_file_url(path: str) -> str:
+        """Convert a local path to the file:// URL used for internal processing."""
+        local_path = os.path.abspath(path)
         
-        # Wait for all tasks to complete
-        if tasks:
+        # Handle Windows paths differently
+        if os.name == 'nt':  # Windows
+            # For Windows, ensure path starts with / and replace backslashes with forward slashes
+            local_path = local_path.replace('\\', '/')
+            return f"file:///{local_path}"
+        # For Unix-like systems
+        return f"file://{urllib.parse.quote(local_path)}"
+
+    def get_file_walker(self) -> FileWalker:
+        """Walker expanding directory and glob sources into the files this builder can process."""
+        return FileWalker(
+            include=self.file_include,
+            exclude=self.file_exclude,
+            extensions=self.processors.extensions,
+            max_bytes=self.max_file_bytes,
+            gitignore=self.respect_gitignore,
+            workers=self.scan_workers,
+        )
+
+    async def _walk_async(self, source: str):
+        """Stream the files of a directory or glob source while the walk is still running."""
+        walker = self.get_file_walker()
+        loop = asyncio.get_running_loop()
+        # Bounded, so the walk pauses while processing is behind
+        paths: asyncio.Queue = asyncio.Queue(maxsize=self.files_in_flight)
+        stopped = threading.Event()
+
+        def put(path: Optional[str]) -> bool:
+            future = asyncio.run_coroutine_threadsafe(paths.put(path), loop)
+            while True:
+                try:
+                    future.result(timeout=0.5)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    # Nobody is reading any more: the build failed or stopped early
+                    if stopped.is_set() or not loop.is_running():
+                        future.cancel()
+                        return False
+
+        def produce() -> None:
             try:
-                await asyncio.gather(*tasks)
-            except Exception as e:
-                print(f"❌ Error during async processing: {e}")
-                # Continue with other files even if one fails
-                pass
+                for path in walker.walk(source):
+                    if not put(path):
+                        return
+            finally:
+                put(None)
 
-    async def _process_pdf_async(self, url: str) -> None:
-        """Process a PDF file asynchronously."""
+        print(f"📂 Scanning {source}")
+        producer = asyncio.ensure_future(to_thread(produce))
+        found = 0
         try:
-            print(f"📄 PDF: {url}")
-            start_time = time.time()
-            
-            download_start = time.time()
-            path = await asyncio.to_thread(self.pdf_processor.download, url)
-            download_end = time.time()
-            print(f"  ⏱️ Download: {download_end - download_start:.2f} seconds")
-            
-            extract_start = time.time()
-            text = await asyncio.to_thread(self.pdf_processor.extract_text, path)
-            extract_end = time.time()
-            print(f"  ⏱️ Text extraction: {extract_end - extract_start:.2f} seconds")
-            
-            if text.strip():
-                self.text_contents.append(text)
-            
-            end_time = time.time()
-            print(f"  ⏱️ Total PDF processing: {end_time - start_time:.2f} seconds")
-        except Exception as e:
-            print(f"❌ Error processing PDF {url}: {e}")
+            while (path := await paths.get()) is not None:
+                found += 1
+                yield path
+        finally:
+            stopped.set()
+        await producer
+        skipped = f", {walker.skipped} over the size limit skipped" if walker.skipped else ""
+        print(f"📂 {found} files from {source}{skipped}")
 
-    async def _process_document_async(self, url: str) -> None:
-        """Process a document file asynchronously."""
+    async def _file_urls_async(self, files: List[str]):
+        """URLs of the file sources, with directories and globs expanded as they are walked."""
+        for url in files:
+            # Check if this is a local path (not starting with http/https and containing a path separator)
+            if url.startswith(('http://', 'https://', 'file://')) or not (
+                    os.path.sep in url or os.path.exists(url) or has_magic(url)):
+                yield url
+            elif has_magic(url) or os.path.isdir(url):
+                async for path in self._walk_async(url):
+                    yield self._local_file_url(path)
+            else:
+                yield self._local_file_url(url)
+
+    async def process_files_async(self, files: List[str]) -> None:
+        """Process files and URLs concurrently based on their type."""
+        standalone = self._collector is None
+        if standalone:
+            self._collector = OrderedCollector(self._append_async)
+        tasks = []
         try:
-            print(f"📝 Document: {url}")
-            start_time = time.time()
-            
-            download_start = time.time()
-            path = await asyncio.to_thread(self.document_processor.download, url)
-            download_end = time.time()
-            print(f"  ⏱️ Download: {download_end - download_start:.2f} seconds")
-            
-            extract_start = time.time()
-            text = await asyncio.to_thread(self.document_processor.extract_text, path)
-            extract_end = time.time()
-            print(f"  ⏱️ Text extraction: {extract_end - extract_start:.2f} seconds")
-            
-            if text.strip():
-                self.text_contents.append(text)
-            
-            end_time = time.time()
-            print(f"  ⏱️ Total document processing: {end_time - start_time:.2f} seconds")
+            async for url in self._file_urls_async(files):
+                try:
+                    # Known extensions are routed right away; anything else is identified when its task runs
+                    spec = self.processors.for_path(url)
+                    if spec is not None:
+                        task = self._process_source_async(spec, url)
+                    else:
+                        task = self._process_unknown_async(url)
+                except Exception as e:
+                    print(f"❌ Error processing file: {url} - {e}")
+                    continue
+                # Slots are reserved in source (and walk) order, so results keep that order whichever
+                # finishes first; each file starts as soon as it is found rather than after the whole walk,
+                # unless files_in_flight earlier ones are still running or waiting for a slow one
+                await self._collector.wait_for_room(self.files_in_flight)
+                tasks.append(asyncio.ensure_future(self._run_in_slot(self._collector.reserve(url), url, task)))
+            await asyncio.gather(*tasks)
         except Exception as e:
-            print(f"❌ Error processing document {url}: {e}")
+            print(f"❌ Error during async processing: {e}")
+            # Continue with other files even if one fails
+            pass
+        finally:
+            if standalone:
+                self._collector = None
 
-    async def _process_spreadsheet_async(self, url: str) -> None:
-        """Process a spreadsheet file asynchronously."""
+    async def _process_source_async(self, spec: ProcessorSpec, url: str) -> None:
+        """Download and extract a file with its registered processor asynchronously."""
         try:
-            print(f"📊 Spreadsheet: {url}")
-            start_time = time.time()
-            
-            download_start = time.time()
-            path = await asyncio.to_thread(self.spreadsheet_processor.download, url)
-            download_end = time.time()
-            print(f"  ⏱️ Download: {download_end - download_start:.2f} seconds")
-            
-            extract_start = time.time()
-            text = await asyncio.to_thread(self.spreadsheet_processor.extract_text, path)
-            extract_end = time.time()
-            print(f"  ⏱️ Text extraction: {extract_end - extract_start:.2f} seconds")
+            print(f"{spec.icon} {spec.label[:1].upper() + spec.label[1:]}: {url}")
+            with span('source', source=url, kind=spec.name) as source:
+                text = await self._download_and_extract_async(spec.processor, url)
+            print(f"  ⏱️ Total {spec.label} processing: {source.duration:.2f} seconds")
             
             if text.strip():
-                self.text_contents.append(text)
-            
-            end_time = time.time()
-            print(f"  ⏱️ Total spreadsheet processing: {end_time - start_time:.2f} seconds")
+                await self._collect_async(text, url)
         except Exception as e:
-            print(f"❌ Error processing spreadsheet {url}: {e}")
+            increment('source_errors')
+            print(f"❌ Error processing {spec.label} {url}: {e}")
 
-    async def _process_web_content_async(self, url: str) -> None:
-        """Process a web content file asynchronously."""
+    async def _process_unknown_async(self, url: str) -> None:
+        """Identify a source without a known extension by its Content-Type or first bytes, then process it."""
         try:
-            print(f"🌐 Web content: {url}")
-            start_time = time.time()
-            
-            download_start = time.time()
-            path = await asyncio.to_thread(self.web_content_processor.download, url)
-            download_end = time.time()
-            print(f"  ⏱️ Download: {download_end - download_start:.2f} seconds")
-            
-            extract_start = time.time()
-            text = await asyncio.to_thread(self.web_content_processor.extract_text, path)
-            extract_end = time.time()
-            print(f"  ⏱️ Text extraction: {extract_end - extract_start:.2f} seconds")
-            
-            if text.strip():
-                self.text_contents.append(text)
-            
-            end_time = time.time()
-            print(f"  ⏱️ Total web content processing: {end_time - start_time:.2f} seconds")
+            with span('detect', source=url):
+                spec = await to_thread(self.processors.detect, url)
         except Exception as e:
-            print(f"❌ Error processing web content {url}: {e}")
+            print(f"⚠️ Could not detect the type of {url}: {e}")
+            spec = None
+        
+        if spec is not None:
+            print(f"🔎 Detected {spec.label} content: {url}")
+            await self._process_source_async(spec, url)
+        elif url.startswith(('http://', 'https://')):
+            # Pages and anything unrecognised are fetched as websites
+            await self._process_web_url_async(url)
+        else:
+            increment('source_errors')
+            print(f"❌ Unsupported file type: {url}")
 
     async def _process_web_url_async(self, url: str) -> None:
         """Process a web URL asynchronously."""
         try:
             print(f"🔗 Website: {url}")
-            start_time = time.time()
-            
-            download_start = time.time()
-            text = await asyncio.to_thread(self.website_processor.download_and_clean_html, url)
-            download_end = time.time()
-            print(f"  ⏱️ Download and clean: {download_end - download_start:.2f} seconds")
+            with span('source', source=url, kind='website') as source:
+                with span('download') as download:
+                    text = await to_thread(
+                        self.website_processor.download_and_clean_html, url, self.extract_main_content
+                    )
+                print(f"  ⏱️ Download and clean: {download.duration:.2f} seconds")
+            print(f"  ⏱️ Total website processing: {source.duration:.2f} seconds")
             
             if text.strip():
-                self.text_contents.append(text)
-            
-            end_time = time.time()
-            print(f"  ⏱️ Total website processing: {end_time - start_time:.2f} seconds")
+                await self._collect_async(text, url)
         except Exception as e:
+            increment('source_errors')
             print(f"❌ Error processing website {url}: {e}")
 
+    async def _download_and_extract_async(self, processor, url: str) -> str:
+        """Download a file and extract its text in worker threads, timing both steps."""
+        with span('download') as download:
+            path = await to_thread(processor.download, url)
+        print(f"  ⏱️ Download: {download.duration:.2f} seconds")
+        if os.path.isfile(path):
+            increment('bytes_fetched', os.path.getsize(path))
+        
+        with span('extract') as extract:
+            text = await to_thread(processor.extract_text, path)
+        print(f"  ⏱️ Text extraction: {extract.duration:.2f} seconds")
+        observe('extracted_chars', len(text))
+        return text
+
     def process_pdfs(self, pdf_urls: List[str]) -> None:
         """Process and build knowledge bases from PDFs."""
         for url in pdf_urls:
@@ -394,7 +739,7 @@ class KBBuilder:
                 print(f"❌ Spreadsheet error: {e}")
 
     def process_web_content(self, web_content_urls: List[str]) -> None:
-        """Process and build knowledge bases from web content files (.html, .xml, .json, .yaml/.yml)."""
+        """Process and build knowledge bases from web content files (.html, .xml, .json, .jsonl/.ndjson, .yaml/.yml)."""
         for url in web_content_urls:
             try:
                 self._process_web_content(url)
@@ -412,33 +757,61 @@ class KBBuilder:
     def _process_web_url(self, url: str) -> None:
         """Process a web URL synchronously."""
         print(f"🔗 Website: {url}")
-        start_time = time.time()
-        
-        download_start = time.time()
-        text = self.website_processor.download_and_clean_html(url)
-        download_end = time.time()
-        print(f"  ⏱️ Download and clean: {download_end - download_start:.2f} seconds")
+        with span('source', source=url, kind='website') as source:
+            text = self.checkpoint.load_source(url) if self.checkpoint is not None else None
+            if text is None:
+                with span('download') as download:
+                    text = self.website_processor.download_and_clean_html(url, self.extract_main_content)
+                print(f"  ⏱️ Download and clean: {download.duration:.2f} seconds")
+            else:
+                print("  💾 Restored from checkpoint")
+        print(f"  ⏱️ Total website processing: {source.duration:.2f} seconds")
         
         if text.strip():
-            self.text_contents.append(text)  # Changed from kbs.append(self.llm.build(text))
-        
-        end_time = time.time()
-        print(f"  ⏱️ Total website processing: {end_time - start_time:.2f} seconds")
+            self._collect(text, url)
 
     def process_websites(self, sitemap_url: str) -> None:
         """Process and build knowledge bases from websites."""
         try:
             print(f"🌐 Sitemap: {sitemap_url}")
-            sitemap_start = time.time()
-            urls = self.website_processor.get_urls_from_sitemap(sitemap_url)
-            sitemap_end = time.time()
-            print(f"  ⏱️ Sitemap fetching: {sitemap_end - sitemap_start:.2f} seconds")
+            with span('sitemap_fetch') as fetch:
+                urls = self.website_processor.get_urls_from_sitemap(sitemap_url)
+            print(f"  ⏱️ Sitemap fetching: {fetch.duration:.2f} seconds")
             
+            # Render every page first so blocks repeated across the site can be learned
+            boilerplate = SiteBoilerplateFilter(min_pages=self.site_boilerplate_min_pages)
+            pages = []
+            restored: Dict[str, str] = {}
             for url in urls:
                 try:
-                    self._process_web_url(url)
+                    print(f"🔗 Website: {url}")
+                    # Checkpointed pages were filtered when they were first collected
+                    if self.checkpoint is not None and (cached := self.checkpoint.load_source(url)) is not None:
+                        print("  💾 Restored from checkpoint")
+                        restored[url] = cached
+                        pages.append((url, []))
+                        continue
+                    with span('source', source=url, kind='website') as source:
+                        with span('download'):
+                            html = self.website_processor.download_html(url)
+                        increment('bytes_fetched', len(html.encode('utf-8')))
+                        with span('extract'):
+                            blocks = self.website_processor.extract_blocks(html, self.extract_main_content)
+                    print(f"  ⏱️ Download and clean: {source.duration:.2f} seconds")
+                    boilerplate.observe(url, blocks)
+                    pages.append((url, blocks))
                 except Exception as e:
+                    increment('source_errors')
                     print(f"❌ Site error: {e}")
+            
+            for url, blocks in pages:
+                text = restored[url] if url in restored else HTMLCleaner.join_blocks(boilerplate.filter(url, blocks))
+                if text.strip():
+                    self._collect(text, url)
+            
+            if boilerplate.removed_blocks:
+                print(f"  🧹 Dropped {boilerplate.removed_blocks} site-wide repeated blocks "
+                      f"({boilerplate.removed_chars} characters)")
         except Exception as e:
             print(f"❌ Sitemap load error: {e}")
 
@@ -477,56 +850,107 @@ class KBBuilder:
             print("⚠️ GitHub processing skipped - no repositories provided")
             return
             
-        # Initialize GitHub processor if not already done
-        if not self.github_processor:
-            self.github_processor = GitHubProcessor(token=self.config.get('GITHUB_API_KEY'))
+        self.get_github_processor()
         
         for repo in github_repos:
             try:
                 print(f"📂 Processing GitHub repository: {repo}")
-                repo_start_time = time.time()
-                
-                try:
-                    # Parse repository URL to extract username and repo name
-                    username, repo_name = self._parse_github_repo_url(repo)
-                    
-                    # Get markdown files from the specific repo
-                    md_urls_start = time.time()
-                    md_urls = self.github_processor.get_markdown_urls_for_repo(username, repo_name)
-                    md_urls_end = time.time()
-                    print(f"  ⏱️ Fetching markdown URLs: {md_urls_end - md_urls_start:.2f} seconds")
-                    
-                    if not md_urls:
-                        print(f"  ⚠️ No markdown files found in repository {username}/{repo_name}")
-                        continue
+                with span('repository', repo=repo) as repository:
+                    try:
+                        # Parse repository URL to extract username and repo name
+                        username, repo_name = self._parse_github_repo_url(repo)
                         
-                    print(f"  📄 Found {len(md_urls)} markdown files")
-                    
-                    for url in md_urls:
-                        try:
-                            print(f"  📘 GitHub MD: {url}")
-                            url_start = time.time()
-                            
-                            download_start = time.time()
-                            text = self.github_processor.download_markdown(url)
-                            download_end = time.time()
-                            print(f"    ⏱️ Markdown download: {download_end - download_start:.2f} seconds")
-                            
-                            if text.strip():
-                                self.text_contents.append(text)  # Changed from kbs.append(self.llm.build(text))
+                        # Get markdown files from the specific repo
+                        with span('list_files') as listing:
+                            md_urls = self.github_processor.get_markdown_urls_for_repo(username, repo_name)
+                        print(f"  ⏱️ Fetching markdown URLs: {listing.duration:.2f} seconds")
+                        
+                        if not md_urls:
+                            print(f"  ⚠️ No markdown files found in repository {username}/{repo_name}")
+                            continue
                             
-                            url_end = time.time()
-                            print(f"    ⏱️ Total markdown processing: {url_end - url_start:.2f} seconds")
-                        except Exception as e:
-                            print(f"  ❌ Markdown error: {e}")
-                except ValueError as e:
-                    print(f"  ❌ {str(e)}")
+                        print(f"  📄 Found {len(md_urls)} markdown files")
+                        
+                        for url in md_urls:
+                            try:
+                                print(f"  📘 GitHub MD: {url}")
+                                with span('source', source=url, kind='github') as source:
+                                    text = self.checkpoint.load_source(url) if self.checkpoint is not None else None
+                                    if text is None:
+                                        with span('download') as download:
+                                            text = self.github_processor.download_markdown(url)
+                                        increment('bytes_fetched', len(text.encode('utf-8')))
+                                        print(f"    ⏱️ Markdown download: {download.duration:.2f} seconds")
+                                print(f"    ⏱️ Total markdown processing: {source.duration:.2f} seconds")
+                                
+                                if text.strip():
+                                    self._collect(text, url)
+                            except Exception as e:
+                                increment('source_errors')
+                                print(f"  ❌ Markdown error: {e}")
+                    except ValueError as e:
+                        print(f"  ❌ {str(e)}")
                 
-                repo_end_time = time.time()
-                print(f"  ⏱️ Total repository processing: {repo_end_time - repo_start_time:.2f} seconds")
+                print(f"  ⏱️ Total repository processing: {repository.duration:.2f} seconds")
             except Exception as e:
                 print(f"❌ GitHub repository error: {e}")
                 
+    def process_git_repos(self, git_repos: List[Any]) -> None:
+        """
+        Process documentation tracked in local git repositories.
+
+        Each entry is a path to a checkout or bare repository, or a dict with
+        'path' and optionally 'rev' (default HEAD) and 'changed_since', an
+        earlier commit. With 'changed_since' the build is a delta: its KB holds
+        only the files added or modified since that commit, not the whole
+        repository, and the paths removed since then are listed in git_removed.
+        """
+        for entry in git_repos:
+            repo = dict(entry) if isinstance(entry, dict) else {'path': entry}
+            try:
+                print(f"📂 Processing git repository: {repo['path']}")
+                with span('repository', repo=repo['path']) as repository:
+                    processor = LocalGitProcessor(
+                        repo['path'],
+                        rev=repo.get('rev') or 'HEAD',
+                        include=self.file_include,
+                        exclude=self.file_exclude,
+                        max_bytes=self.max_file_bytes,
+                    )
+                    with span('list_files') as listing:
+                        if since := repo.get('changed_since'):
+                            files, removed = processor.changed_files(since)
+                            self.git_removed[repo['path']] = removed
+                            print(f"  🔀 Delta build: only the {len(files)} files changed since {since} are processed")
+                            for path in removed:
+                                print(f"  🗑️ Removed since {since}: {path}")
+                        else:
+                            files = processor.list_files()
+                    print(f"  ⏱️ Listing files: {listing.duration:.2f} seconds")
+                    # The full SHA is what a later delta build passes as 'changed_since'
+                    print(f"  📄 Found {len(files)} files at commit {processor.commit}")
+
+                    # Checkpointed files are skipped; the rest stream through one cat-file process in path order
+                    with processor.blobs() as read:
+                        for file in files:
+                            url = processor.source_url(file.path)
+                            try:
+                                with span('source', source=url, kind='git'):
+                                    text = self.checkpoint.load_source(url) if self.checkpoint is not None else None
+                                    if text is None:
+                                        text = read(file.blob).decode('utf-8', 'replace')
+                                        increment('bytes_fetched', file.size)
+                                if text.strip():
+                                    self._collect(text, url)
+                            except Exception as e:
+                                increment('source_errors')
+                                print(f"  ❌ Git file error: {file.path} - {e}")
+                    self.git_commits[repo['path']] = processor.commit
+
+                print(f"  ⏱️ Total repository processing: {repository.duration:.2f} seconds")
+            except Exception as e:
+                print(f"❌ Git repository error: {e}")
+
     # Keep the old process_github method for backward compatibility
     def process_github(self, github_username: str = None) -> None:
         """
@@ -544,14 +968,19 @@ class KBBuilder:
         repos = [f"{github_username}/{repo}" for repo in self._get_user_repos(github_username)]
         self.process_github_repos(repos)
     
-    def _get_user_repos(self, username: str) -> List[str]:
-        """Get a list of repository names for a user."""
-        # Initialize GitHub processor if needed
+    def get_github_processor(self, username: Optional[str] = None) -> GitHubProcessor:
+        """The GitHub processor, created with the configured token and API URL on first use."""
         if not self.github_processor:
             self.github_processor = GitHubProcessor(
-                username=username, 
-                token=self.config.get('GITHUB_API_KEY')
+                username=username,
+                token=self.config.get('GITHUB_API_KEY'),
+                api_url=self.config.get('GITHUB_API_URL', GitHubProcessor.API_URL),
             )
+        return self.github_processor
+
+    def _get_user_repos(self, username: str) -> List[str]:
+        """Get a list of repository names for a user."""
+        self.get_github_processor(username)
             
         try:
             return self.github_processor.get_user_repos()
@@ -565,10 +994,9 @@ class KBBuilder:
             print("⚠️ No content collected.")
             return
 
-        write_start = time.time()
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(self.text_contents[0])  # Write the processed content
-        write_end = time.time()
-        print(f"⏱️ File writing completed in {write_end - write_start:.2f} seconds")
+        with span('write') as write:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(self.text_contents[0])  # Write the processed content
+        print(f"⏱️ File writing completed in {write.duration:.2f} seconds")
 
         print(f"✅ Final KB written to: {output_path}") 
\ No newline at end of file
@@ -1,7 +1,10 @@
 import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any
-import time
+
+from knowledge_base_builder.compat import LoopSemaphore
+from knowledge_base_builder.metrics import increment, span
+from knowledge_base_builder.usage import record_usage
 
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
@@ -18,7 +21,7 @@ class LLMClient(ABC):
         self.model = model
         self.temperature = temperature
         self.max_retries = max_retries
-        self._sem = asyncio.Semaphore(max_concurrency)
+        self._sem = LoopSemaphore(max_concurrency)
     
     @abstractmethod
     async def run_async(self, prompt: str) -> str:
@@ -27,8 +30,24 @@ class LLMClient(ABC):
     
     def run(self, prompt: str) -> str:
         """Synchronous wrapper for run_async."""
-        start_time = time.time()
-        result = asyncio.get_event_loop().run_until_complete(self.run_async(prompt))
-        end_time = time.time()
-        print(f"    ⏱️ {self.__class__.__name__} API call (sync): {end_time - start_time:.2f} seconds")
-        return result 
\ No newline at end of file
+        with span('llm_sync_call') as call:
+            result = asyncio.get_event_loop().run_until_complete(self.run_async(prompt))
+        print(f"    ⏱️ {self.__class__.__name__} API call (sync): {call.duration:.2f} seconds")
+        return result
+
+    def _record_usage(self, prompt: str, result: Any) -> None:
+        """
+        Count the tokens of a response from its LangChain usage metadata.
+        Responses without metadata are estimated at 4 characters per token.
+        """
+        usage = getattr(result, "usage_metadata", None) or {}
+        input_tokens = usage.get('input_tokens')
+        output_tokens = usage.get('output_tokens')
+        if input_tokens is None or output_tokens is None:
+            increment('llm_estimated_usage')
+            input_tokens = len(prompt) // 4
+            output_tokens = len(str(getattr(result, "content", result))) // 4
+        increment('llm_requests')
+        increment('llm_input_tokens', input_tokens)
+        increment('llm_output_tokens', output_tokens)
+        record_usage(self.model, input_tokens, output_tokens) 
\ No newline at end of file
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import re
+import urllib.parse
+from typing import Dict, List, NamedTuple, Optional
+
+from knowledge_base_builder.chunk_writer import _FENCE, _HEADING
+from knowledge_base_builder.shard_writer import source_group
+
+class Page(NamedTuple):
+    """One per-source Markdown page listed in llms.txt."""
+    source: str
+    title: str
+    description: str
+    path: str
+    first_chunk: int
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')[:60] or 'page'
+
+def page_name(source: str) -> str:
+    """File name of a source's page, readable and unique per source."""
+    parsed = urllib.parse.urlparse(source)
+    stem = os.path.splitext(urllib.parse.unquote(parsed.path).rstrip('/'))[0]
+    digest = hashlib.sha256(source.encode('utf-8')).hexdigest()[:8]
+    return f"{_slug(stem or parsed.netloc)}-{digest}.md"
+
+def _title_from_source(source: str) -> str:
+    parsed = urllib.parse.urlparse(source)
+    name = os.path.basename(urllib.parse.unquote(parsed.path).rstrip('/'))
+    return os.path.splitext(name)[0].replace('-', ' ').replace('_', ' ').strip() or parsed.netloc or source
+
+def _describe(markdown: str, max_chars: int = 160) -> str:
+    """The first line of prose, for the link description."""
+    in_fence = False
+    for line in markdown.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        line = line.strip()
+        if in_fence or not line or _HEADING.match(line) or line.startswith(('>', '|', '---')):
+            continue
+        line = re.sub(r'[*_`]+', '', re.sub(r'^([-*+]|\d+\.)\s+', '', line))
+        return line if len(line) <= max_chars else line[:max_chars - 1].rstrip() + '…'
+    return ''
+
+class LlmsTxtWriter:
+    """
+    Write a knowledge base as an llms.txt site: one Markdown page per source,
+    an llms.txt index linking them, and llms-full.txt with every page inline.
+
+    Chunks are handed over as they complete; a source's page is written as soon
+    as the last of its chunks is in, so only unfinished sources are held in
+    memory. The index follows the llms.txt layout: an H1 title, a blockquote
+    summary, then an H2 section per host (or local directory) listing
+    `- [title](pages/<name>.md): description`. Links are relative unless
+    base_url is given.
+    """
+
+    def __init__(self, directory: str, title: str = "Knowledge Base", summary: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        self.directory = directory
+        self.title = title
+        self.summary = summary
+        self.base_url = base_url.rstrip('/') + '/' if base_url else None
+        self.pages: List[Page] = []
+        self._pending: Dict[str, Dict[int, List[str]]] = {}
+        os.makedirs(os.path.join(directory, 'pages'), exist_ok=True)
+
+    def add(self, index: int, outputs: List[str], source: str, indexes: List[int]) -> Optional[Page]:
+        """Keep one processed chunk of a source; write the source's page once all its chunks (indexes) are in."""
+        pending = self._pending.setdefault(source, {})
+        pending[index] = outputs
+        if not set(indexes) <= set(pending):
+            return None
+        return self._write_page(source, self._pending.pop(source))
+
+    def _write_page(self, source: str, chunks: Dict[int, List[str]]) -> Optional[Page]:
+        body = "\n\n".join(output for index in sorted(chunks) for output in chunks[index]).strip()
+        if not body:
+            return None
+        lines = body.splitlines()
+        heading = _HEADING.match(lines[0])
+        if heading and len(heading.group(1)) == 1:
+            title, body = heading.group(2), "\n".join(lines[1:]).strip()
+        else:
+            title = _title_from_source(source)
+        path = f"pages/{page_name(source)}"
+        with open(os.path.join(self.directory, path), 'w', encoding='utf-8') as f:
+            f.write(f"# {title}\n\n> Source: {source}\n\n{body}\n")
+        page = Page(source, title, _describe(body), path, min(chunks))
+        self.pages.append(page)
+        return page
+
+    def close(self) -> str:
+        """Write pages still missing chunks, then llms.txt and llms-full.txt; return the llms.txt path."""
+        for source in list(self._pending):
+            self._write_page(source, self._pending.pop(source))
+        pages = sorted(self.pages, key=lambda page: page.first_chunk)
+        summary = self.summary or f"Knowledge base built from {len(pages)} sources."
+
+        sections: Dict[str, List[Page]] = {}
+        for page in pages:
+            sections.setdefault(source_group(page.source), []).append(page)
+        lines = [f"# {self.title}", "", f"> {summary}"]
+        for group, members in sections.items():
+            lines += ["", f"## {group}", ""]
+            for page in members:
+                link = (self.base_url or '') + page.path
+                lines.append(f"- [{page.title}]({link})" + (f": {page.description}" if page.description else ""))
+        index_path = os.path.join(self.directory, 'llms.txt')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        # Pages are copied from disk one at a time rather than kept in memory
+        with open(os.path.join(self.directory, 'llms-full.txt'), 'w', encoding='utf-8') as full:
+            full.write(f"# {self.title}\n\n> {summary}\n")
+            for page in pages:
+                with open(os.path.join(self.directory, page.path), 'r', encoding='utf-8') as f:
+                    full.write("\n" + f.read())
+        return index_path
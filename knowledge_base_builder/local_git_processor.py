@@ -0,0 +1,127 @@
+import os
+import subprocess
+import urllib.parse
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from knowledge_base_builder.walker import PathPattern
+
+class GitFile(NamedTuple):
+    """A tracked file of a commit."""
+    path: str
+    blob: str
+    size: int
+
+class LocalGitProcessor:
+    """
+    Read documentation straight from a local git checkout or bare repository.
+
+    Files are listed from the commit's tree (`git ls-tree`), so a bare repository
+    works as well as a checkout and the result does not depend on the working
+    tree. Their contents are read as blobs through a single `git cat-file --batch`
+    process, and with a previous commit only the files changed since then are
+    listed (`git diff --raw`). No network access is involved.
+    """
+    DEFAULT_EXTENSIONS = ('.md', '.markdown', '.mdx', '.rst', '.txt')
+
+    def __init__(
+        self,
+        repo_path: str,
+        rev: str = 'HEAD',
+        extensions: Optional[Iterable[str]] = None,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.repo_path = os.path.abspath(repo_path)
+        self.extensions = tuple(extension.lower() for extension in (extensions or self.DEFAULT_EXTENSIONS))
+        self.include = [PathPattern(pattern) for pattern in include or []]
+        self.exclude = [PathPattern(pattern) for pattern in exclude or []]
+        self.max_bytes = max_bytes
+        self.commit = self.resolve(rev)
+
+    def _git(self, *args: str) -> bytes:
+        try:
+            result = subprocess.run(['git', '-C', self.repo_path, *args], capture_output=True, check=True)
+        except FileNotFoundError:
+            raise Exception("Error running git: git is not installed")
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Error running git {args[0]} in {self.repo_path}: {e.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+    def resolve(self, rev: str) -> str:
+        """Full SHA of the commit a revision names."""
+        return self._git('rev-parse', '--verify', '--end-of-options', f"{rev}^{{commit}}").decode('ascii').strip()
+
+    def _wanted(self, path: str, size: int) -> bool:
+        if not path.lower().endswith(self.extensions):
+            return False
+        if self.include and not any(include.match(path) for include in self.include):
+            return False
+        if any(exclude.match(path) for exclude in self.exclude):
+            return False
+        return self.max_bytes is None or size <= self.max_bytes
+
+    def list_files(self) -> List[GitFile]:
+        """Tracked documentation files of the commit, in path order."""
+        files = []
+        for record in self._git('ls-tree', '-r', '-l', '-z', self.commit).split(b'\0'):
+            if not record:
+                continue
+            info, path = record.split(b'\t', 1)
+            _mode, kind, blob, size = info.decode('ascii').split()
+            path = path.decode('utf-8', 'surrogateescape')
+            # Submodules are commits and symbolic links have no size worth reading
+            if kind == 'blob' and size != '-' and self._wanted(path, int(size)):
+                files.append(GitFile(path, blob, int(size)))
+        return files
+
+    def changed_files(self, since: str) -> Tuple[List[GitFile], List[str]]:
+        """Documentation files added or modified since a commit, and the paths removed since then."""
+        since = self.resolve(since)
+        if since == self.commit:
+            return [], []
+        changed, removed = set(), []
+        fields = self._git('diff', '--raw', '-z', '--no-renames', '--no-abbrev', since, self.commit).split(b'\0')
+        # Each change is ':<modes> <shas> <status>' followed by its path
+        for info, path in zip(fields[0::2], fields[1::2]):
+            path = path.decode('utf-8', 'surrogateescape')
+            if info.decode('ascii').split()[-1] == 'D':
+                if path.lower().endswith(self.extensions):
+                    removed.append(path)
+            else:
+                changed.add(path)
+        # Sizes and blobs come from the tree, which also applies the filters
+        return [file for file in self.list_files() if file.path in changed], removed
+
+    @contextmanager
+    def blobs(self) -> Iterator[Callable[[str], bytes]]:
+        """A reader of blob contents by SHA, backed by one `git cat-file --batch` process."""
+        process = subprocess.Popen(['git', '-C', self.repo_path, 'cat-file', '--batch'],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        def read(blob: str) -> bytes:
+            process.stdin.write(f"{blob}\n".encode('ascii'))
+            process.stdin.flush()
+            header = process.stdout.readline().decode('ascii').split()
+            if len(header) != 3:
+                raise Exception(f"Error reading blob {blob}: {' '.join(header) or 'git cat-file exited'}")
+            content = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Newline after the content
+            return content
+
+        try:
+            yield read
+        finally:
+            process.stdin.close()
+            process.wait()
+            process.stdout.close()
+
+    def read_files(self, files: Iterable[GitFile]) -> Iterator[Tuple[GitFile, str]]:
+        """Decoded contents of files, in the order given."""
+        with self.blobs() as read:
+            for file in files:
+                yield file, read(file.blob).decode('utf-8', 'replace')
+
+    def source_url(self, path: str) -> str:
+        """Source name of a file at this commit."""
+        return f"git+file://{urllib.parse.quote(self.repo_path)}/{urllib.parse.quote(path)}@{self.commit[:12]}"
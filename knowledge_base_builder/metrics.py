@@ -0,0 +1,205 @@
+import contextvars
+import json
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+class Span:
+    """One timed stage of a run, nested under the span that was open when it started."""
+
+    def __init__(self, name: str, parent: Optional['Span'], attrs: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        """Slash-separated names from the root span down to this one."""
+        return f"{self.parent.path}/{self.name}" if self.parent else self.name
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the span started, or its duration once it has finished."""
+        return self.duration if self.duration is not None else time.perf_counter() - self.start
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of values (q in [0, 1])."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(values),
+        'sum': sum(values),
+        'p50': percentile(values, 0.5),
+        'p95': percentile(values, 0.95),
+        'max': max(values) if values else 0.0,
+    }
+
+class Metrics:
+    """
+    Spans, counters and histograms of one run, with JSON and Prometheus exporters.
+
+    Spans use the monotonic perf_counter clock and nest through a context
+    variable, so concurrent asyncio tasks and worker threads each keep their
+    own parent chain. Recording is thread-safe.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.histograms: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Time a block as a child of the current span."""
+        current = Span(name, _current_span.get(), attrs)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = type(e).__name__
+            raise
+        finally:
+            current.duration = time.perf_counter() - current.start
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(current)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one value of a histogram."""
+        with self._lock:
+            self.histograms[name].append(value)
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        """Duration summary (count, sum, p50, p95, max in seconds) per span name."""
+        durations: Dict[str, List[float]] = defaultdict(list)
+        for span in self.spans:
+            durations[span.name].append(span.duration)
+        return {name: _summarize(values) for name, values in durations.items()}
+
+    def report(self) -> Dict[str, Any]:
+        """The whole run as a JSON-serializable dict."""
+        return {
+            'wall_seconds': time.perf_counter() - self.started,
+            'stages': self.stages(),
+            'counters': dict(self.counters),
+            'histograms': {name: _summarize(values) for name, values in self.histograms.items()},
+            'spans': [
+                {
+                    'name': span.name,
+                    'path': span.path,
+                    'start': span.start - self.started,
+                    'duration': span.duration,
+                    'error': span.error,
+                    'attrs': {key: str(value) for key, value in span.attrs.items()},
+                }
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+        }
+
+    def write_json(self, path: str, **sections: Any) -> None:
+        """Write the JSON run report, with any extra top-level sections."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(self.report(), **sections), f, indent=2)
+
+    def to_prometheus(self, prefix: str = "kb") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Duration of pipeline stages.",
+            f"# TYPE {prefix}_stage_duration_seconds summary",
+        ]
+        for stage, summary in sorted(self.stages().items()):
+            lines.extend(_summary_lines(f"{prefix}_stage_duration_seconds", summary, f'stage="{stage}"'))
+
+        for name, value in sorted(self.counters.items()):
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.extend([f"# TYPE {metric} counter", f"{metric} {_format(value)}"])
+
+        for name, values in sorted(self.histograms.items()):
+            metric = f"{prefix}_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} summary")
+            lines.extend(_summary_lines(metric, _summarize(values), ""))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus text export (e.g. for the node_exporter textfile collector)."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+def _metric_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.6f}"
+
+def _summary_lines(metric: str, summary: Dict[str, float], labels: str) -> List[str]:
+    """Quantile, sum and count samples of a summary; labels is e.g. 'stage="download"' or ''."""
+    def with_labels(extra: str = "") -> str:
+        joined = ",".join(part for part in (labels, extra) if part)
+        return "{" + joined + "}" if joined else ""
+    median, p95 = with_labels('quantile="0.5"'), with_labels('quantile="0.95"')
+    return [
+        f"{metric}{median} {_format(summary['p50'])}",
+        f"{metric}{p95} {_format(summary['p95'])}",
+        f"{metric}_sum{with_labels()} {_format(summary['sum'])}",
+        f"{metric}_count{with_labels()} {summary['count']}",
+    ]
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+# No run outside use_metrics: long-lived processes (the build service, watch mode) must not
+# accumulate spans recorded between runs
+_current_metrics: contextvars.ContextVar = contextvars.ContextVar('current_metrics', default=None)
+
+def current_metrics() -> Optional[Metrics]:
+    """The Metrics instance of the run in the current context, if any."""
+    return _current_metrics.get()
+
+@contextmanager
+def use_metrics(metrics: Metrics) -> Iterator[Metrics]:
+    """Record everything done in this context (including tasks and threads started from it) into metrics."""
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+@contextmanager
+def _unrecorded_span(name: str, attrs: Dict[str, Any]) -> Iterator[Span]:
+    """Time a block without recording it, for callers that read the duration."""
+    current = Span(name, None, attrs)
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - current.start
+
+def span(name: str, **attrs: Any):
+    """Time a block in the current run's metrics; outside a run it is only timed."""
+    metrics = current_metrics()
+    return metrics.span(name, **attrs) if metrics is not None else _unrecorded_span(name, attrs)
+
+def increment(name: str, value: float = 1) -> None:
+    """Add to a counter of the current run, if any."""
+    if (metrics := current_metrics()) is not None:
+        metrics.increment(name, value)
+
+def observe(name: str, value: float) -> None:
+    """Record a histogram value in the current run, if any."""
+    if (metrics := current_metrics()) is not None:
+        metrics.observe(name, value)
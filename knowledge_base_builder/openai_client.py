@@ -1,9 +1,9 @@
 import asyncio
-import time
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage
 
 from knowledge_base_builder.llm_client import LLMClient
+from knowledge_base_builder.metrics import increment, span
 
 class OpenAIClient(LLMClient):
     """Asynchronous client for OpenAI's models via LangChain."""
@@ -27,20 +27,22 @@ class OpenAIClient(LLMClient):
         Send prompt to OpenAI and return the response.
         Uses retries + exponential backoff.
         """
-        start_time = time.time()
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                async with self._sem:
-                    result = await self.llm.ainvoke([HumanMessage(content=prompt)])
-                    end_time = time.time()
-                    print(f"    ⏱️ OpenAI API call: {end_time - start_time:.2f} seconds")
-                    return result.content if hasattr(result, "content") else result
-            except Exception as e:
-                if attempt == self.max_retries:
-                    end_time = time.time()
-                    print(f"    ⏱️ OpenAI API call failed after {end_time - start_time:.2f} seconds and {attempt} attempts")
-                    raise
-                # backoff: 2, 4, 8, ...
-                backoff_time = 2 ** attempt
-                print(f"    ⚠️ OpenAI API call attempt {attempt} failed, retrying in {backoff_time} seconds...")
-                await asyncio.sleep(backoff_time) 
\ No newline at end of file
+        with span('llm_request', provider='openai', model=self.model) as request:
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    async with self._sem:
+                        with span('attempt', attempt=attempt):
+                            result = await self.llm.ainvoke([HumanMessage(content=prompt)])
+                        self._record_usage(prompt, result)
+                        print(f"    ⏱️ OpenAI API call: {request.elapsed:.2f} seconds")
+                        return result.content if hasattr(result, "content") else result
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        increment('llm_failures')
+                        print(f"    ⏱️ OpenAI API call failed after {request.elapsed:.2f} seconds and {attempt} attempts")
+                        raise
+                    # backoff: 2, 4, 8, ...
+                    increment('llm_retries')
+                    backoff_time = 2 ** attempt
+                    print(f"    ⚠️ OpenAI API call attempt {attempt} failed, retrying in {backoff_time} seconds...")
+                    await asyncio.sleep(backoff_time) 
\ No newline at end of file
@@ -1,21 +1,23 @@
 import os
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from knowledge_base_builder.base_processor import BaseProcessor
 
 class PDFProcessor(BaseProcessor):
     """Handle PDF document processing."""
     
     SUPPORTED_EXTENSIONS = ['.pdf']
+    MIME_TYPES = {'application/pdf': '.pdf'}
     
     @staticmethod
     def download(url: str) -> str:
         """Download a PDF from a URL or load from local file."""
-        return BaseProcessor.download(url, PDFProcessor.SUPPORTED_EXTENSIONS)
+        return BaseProcessor.download(url, PDFProcessor.SUPPORTED_EXTENSIONS, PDFProcessor.MIME_TYPES)
 
     @staticmethod
     def extract_text(pdf_path: str) -> str:
         """Extract text from a PDF file."""
+        from langchain_community.document_loaders import PyPDFLoader
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
         loader = PyPDFLoader(pdf_path)
         documents = loader.load()
         splitter = RecursiveCharacterTextSplitter(chunk_size=20000, chunk_overlap=100)
@@ -0,0 +1,183 @@
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from knowledge_base_builder.compat import to_thread
+
+if TYPE_CHECKING:
+    from knowledge_base_builder.dedup import Deduplicator
+    from knowledge_base_builder.grouping import TopicGrouper
+
+_DONE = object()
+
+class StreamingPipeline:
+    """
+    Overlap source collection, chunking and LLM calls.
+
+    Producers push extracted documents into a bounded queue with `put`. A single
+    chunker task joins them with the separator and cuts chunk_size slices exactly
+    as slicing the concatenation of every document would, and a pool of worker
+    tasks sends each chunk to the LLM as soon as it is cut. Both queues are
+    bounded, so a fast producer waits for the LLM instead of buffering the whole
+    corpus in memory. Each chunk is passed along with the number of characters
+    every source contributed to it.
+
+    With per_document, documents are never joined: each one is sliced on its
+    own, so every chunk comes from a single source, and document_chunks lists
+    the chunk indexes of each source before the first of them is processed.
+
+    With a grouper, chunking waits until every document is collected and takes
+    them in the grouper's topic order, so each chunk holds related material.
+    This trades the overlap of collection and LLM calls for fewer repeated topics.
+    """
+
+    def __init__(
+        self,
+        process_chunk: Callable[[str, int, Dict[str, int]], Awaitable[List[str]]],
+        chunk_size: int = 20000 * 4,
+        separator: str = "\n\n---\n\n",
+        queue_size: int = 16,
+        workers: int = 8,
+        deduplicator: Optional["Deduplicator"] = None,
+        per_document: bool = False,
+        grouper: Optional["TopicGrouper"] = None,
+    ):
+        self.process_chunk = process_chunk
+        self.chunk_size = chunk_size
+        self.separator = separator
+        self.queue_size = queue_size
+        self.workers = workers
+        self.deduplicator = deduplicator
+        self.per_document = per_document
+        self.grouper = grouper
+        self.document_chunks: Dict[str, List[int]] = {}
+        self.documents = 0
+        self.chunks = 0
+        self._documents: Optional[asyncio.Queue] = None
+        self._chunks: Optional[asyncio.Queue] = None
+        self._results: Dict[int, List[str]] = {}
+
+    async def put(self, text: str, source: str) -> None:
+        """Hand one extracted document to the pipeline, waiting while the queue is full."""
+        await self._documents.put((text, source))
+
+    async def run(self, produce: Callable[[], Awaitable[None]]) -> List[str]:
+        """Run produce() while chunking and processing what it puts; return outputs in chunk order."""
+        self._documents = asyncio.Queue(maxsize=self.queue_size)
+        self._chunks = asyncio.Queue(maxsize=self.workers * 2)
+        self._results = {}
+        self.document_chunks = {}
+        self.documents = self.chunks = 0
+
+        producer = asyncio.create_task(self._produce(produce))
+        chunker = asyncio.create_task(self._chunk())
+        workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        tasks = [producer, chunker, *workers]
+        try:
+            # Any failing task would otherwise leave the others blocked on a full queue
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [output for index in sorted(self._results) for output in self._results[index]]
+
+    def chunk_results(self) -> List[Tuple[int, List[str]]]:
+        """Outputs of the last run per chunk index, in chunk order."""
+        return sorted(self._results.items())
+
+    async def _produce(self, produce: Callable[[], Awaitable[None]]) -> None:
+        # On failure run() cancels the chunker, so only success needs the end marker
+        await produce()
+        await self._documents.put(_DONE)
+
+    async def _collected(self) -> AsyncIterator[Tuple[str, str]]:
+        """Documents as they are put, without duplicates."""
+        while True:
+            item = await self._documents.get()
+            if item is _DONE:
+                return
+            text, source = item
+            if self.deduplicator is not None:
+                text = self.deduplicator.add(text, source)
+                if not text or not text.strip():
+                    continue
+            self.documents += 1
+            yield text, source
+
+    async def _grouped(self) -> AsyncIterator[Tuple[str, str]]:
+        """Every document, once all are collected, in topic order."""
+        documents = [document async for document in self._collected()]
+        order = await to_thread(self.grouper.order, documents)
+        for position in order:
+            yield documents[position]
+
+    async def _chunk(self) -> None:
+        buffer = ""
+        first = True
+        # (start, end, source) of the documents in the joined text, and the offset of buffer in it
+        segments: Deque[Tuple[int, int, str]] = deque()
+        offset = 0
+        documents = self._grouped() if self.grouper is not None else self._collected()
+        async for text, source in documents:
+            if self.per_document:
+                await self._emit_document(text, source)
+                continue
+
+            if not first:
+                buffer += self.separator
+            start = offset + len(buffer)
+            buffer += text
+            segments.append((start, start + len(text), source))
+            first = False
+            position = 0
+            while len(buffer) - position >= self.chunk_size:
+                chunk_start = offset + position
+                await self._emit(buffer[position:position + self.chunk_size],
+                                 self._contributions(segments, chunk_start, chunk_start + self.chunk_size))
+                position += self.chunk_size
+            buffer = buffer[position:]
+            offset += position
+
+        if buffer:
+            await self._emit(buffer, self._contributions(segments, offset, offset + len(buffer)))
+        for _ in range(self.workers):
+            await self._chunks.put(_DONE)
+
+    async def _emit_document(self, text: str, source: str) -> None:
+        """Cut one document into its own chunks."""
+        pieces = [text[start:start + self.chunk_size] for start in range(0, len(text), self.chunk_size)]
+        indexes = self.document_chunks.setdefault(source, [])
+        indexes.extend(range(self.chunks + 1, self.chunks + 1 + len(pieces)))
+        for piece in pieces:
+            await self._emit(piece, {source: len(piece)})
+
+    @staticmethod
+    def _contributions(segments: Deque[Tuple[int, int, str]], start: int, end: int) -> Dict[str, int]:
+        """Characters each source contributes to [start, end); drops segments that end before it."""
+        while segments and segments[0][1] <= start:
+            segments.popleft()
+        contributions: Dict[str, int] = {}
+        for segment_start, segment_end, source in segments:
+            if segment_start >= end:
+                break
+            overlap = min(segment_end, end) - max(segment_start, start)
+            if overlap > 0:
+                contributions[source] = contributions.get(source, 0) + overlap
+        return contributions
+
+    async def _emit(self, chunk: str, sources: Dict[str, int]) -> None:
+        self.chunks += 1
+        await self._chunks.put((self.chunks, chunk, sources))
+
+    async def _work(self) -> None:
+        while True:
+            item = await self._chunks.get()
+            if item is _DONE:
+                return
+            index, chunk, sources = item
+            self._results[index] = await self.process_chunk(chunk, index, sources)
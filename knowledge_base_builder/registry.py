@@ -0,0 +1,182 @@
+import os
+import urllib.parse
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+# File signatures, matched against the first bytes of a file
+MAGIC_NUMBERS: Dict[bytes, str] = {
+    b'%PDF-': '.pdf',
+    b'{\\rtf': '.rtf',
+}
+
+# Office formats are ZIP containers; the names of their first entries tell them apart
+_ZIP_MAGIC = b'PK\x03\x04'
+_ZIP_MARKERS: List[Tuple[bytes, str]] = [
+    (b'application/vnd.oasis.opendocument.spreadsheet', '.ods'),
+    (b'word/', '.docx'),
+    (b'xl/', '.xlsx'),
+]
+
+# Bytes read to detect a file's type
+SNIFF_BYTES = 4096
+
+def sniff_extension(head: bytes) -> Optional[str]:
+    """Extension implied by a file's first bytes, if it has a known signature."""
+    for magic, extension in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return extension
+    if head.startswith(_ZIP_MAGIC):
+        for marker, extension in _ZIP_MARKERS:
+            if marker in head:
+                return extension
+    return None
+
+def _mime_type(content_type: Optional[str]) -> str:
+    return (content_type or '').split(';')[0].strip().lower()
+
+class ProcessorSpec(NamedTuple):
+    """A registered processor and what it handles."""
+    name: str
+    processor: Any
+    extensions: Tuple[str, ...]
+    mime_types: Dict[str, str]
+    label: str
+    icon: str
+
+class ProcessorRegistry:
+    """
+    Maps file extensions, MIME types and magic bytes to document processors.
+
+    A processor is anything with `download(url) -> path` and `extract_text(path) -> str`,
+    like the BaseProcessor subclasses; its SUPPORTED_EXTENSIONS and MIME_TYPES
+    ({mime type: extension}) class attributes are used unless given explicitly.
+    Later registrations take over extensions and MIME types from earlier ones, so a
+    plugin can replace a built-in extractor. Third-party packages register processors
+    under the `knowledge_base_builder.processors` entry point group.
+    """
+    ENTRY_POINT_GROUP = "knowledge_base_builder.processors"
+
+    def __init__(self):
+        self._specs: Dict[str, ProcessorSpec] = {}
+        self._by_extension: Dict[str, str] = {}
+        self._by_mime_type: Dict[str, str] = {}
+
+    def register(
+        self,
+        name: str,
+        processor: Any,
+        extensions: Optional[List[str]] = None,
+        mime_types: Optional[Dict[str, str]] = None,
+        label: Optional[str] = None,
+        icon: str = "📄",
+    ) -> ProcessorSpec:
+        """Register a processor under a name, replacing any earlier one with that name."""
+        if extensions is None:
+            extensions = getattr(processor, 'SUPPORTED_EXTENSIONS', [])
+        if mime_types is None:
+            mime_types = getattr(processor, 'MIME_TYPES', {})
+        spec = ProcessorSpec(
+            name=name,
+            processor=processor,
+            extensions=tuple(extension.lower() for extension in extensions),
+            mime_types={_mime_type(mime_type): extension for mime_type, extension in mime_types.items()},
+            label=label or name.replace('_', ' '),
+            icon=icon,
+        )
+        self._specs[name] = spec
+        for extension in spec.extensions:
+            self._by_extension[extension] = name
+        for mime_type in spec.mime_types:
+            self._by_mime_type[mime_type] = name
+        return spec
+
+    def get(self, name: str) -> Optional[ProcessorSpec]:
+        return self._specs.get(name)
+
+    @property
+    def extensions(self) -> List[str]:
+        """Every extension some processor handles."""
+        return sorted(self._by_extension)
+
+    def for_extension(self, extension: str) -> Optional[ProcessorSpec]:
+        name = self._by_extension.get(extension.lower())
+        return self._specs[name] if name else None
+
+    def for_path(self, path: str) -> Optional[ProcessorSpec]:
+        """The processor for a path or URL by its extension."""
+        return self.for_extension(os.path.splitext(urllib.parse.urlparse(path).path)[1])
+
+    def for_mime_type(self, content_type: Optional[str]) -> Optional[ProcessorSpec]:
+        name = self._by_mime_type.get(_mime_type(content_type))
+        return self._specs[name] if name else None
+
+    def for_bytes(self, head: bytes) -> Optional[ProcessorSpec]:
+        """The processor for content with these first bytes, by its file signature."""
+        extension = sniff_extension(head)
+        return self.for_extension(extension) if extension else None
+
+    def detect(self, url: str, timeout: float = 10.0) -> Optional[ProcessorSpec]:
+        """
+        The processor for a file:// or http(s) URL.
+
+        The extension decides when it is a registered one. Otherwise local files
+        are identified by their first bytes, and remote ones by the Content-Type of
+        a HEAD request, falling back to the first bytes of a ranged GET when the
+        server does not say. Returns None for anything else, such as an HTML page
+        without an extension, which callers handle as a website.
+        """
+        spec = self.for_path(url)
+        if spec is not None:
+            return spec
+
+        if url.startswith('file://'):
+            path = urllib.parse.unquote(urllib.parse.urlparse(url).path)
+            with open(path, 'rb') as f:
+                return self.for_bytes(f.read(SNIFF_BYTES))
+
+        content_type = None
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=timeout)
+            if response.status_code < 400:
+                content_type = response.headers.get('content-type')
+        except requests.RequestException:
+            pass
+        spec = self.for_mime_type(content_type)
+        if spec is not None or _mime_type(content_type) == 'text/html':
+            return spec
+
+        with requests.get(url, headers={'Range': f'bytes=0-{SNIFF_BYTES - 1}'}, stream=True, timeout=timeout) as response:
+            if response.status_code >= 400:
+                return None
+            spec = self.for_mime_type(response.headers.get('content-type'))
+            if spec is not None:
+                return spec
+            return self.for_bytes(response.raw.read(SNIFF_BYTES, decode_content=True))
+
+    def load_entry_points(self) -> List[str]:
+        """
+        Register the processors third-party packages declare, e.g. in pyproject.toml:
+
+            [project.entry-points."knowledge_base_builder.processors"]
+            epub = "my_package.epub:EpubProcessor"
+
+        The entry point name becomes the processor name; a class is instantiated.
+        """
+        from importlib.metadata import entry_points
+
+        found = entry_points()
+        if hasattr(found, 'select'):
+            candidates = found.select(group=self.ENTRY_POINT_GROUP)
+        else:
+            candidates = found.get(self.ENTRY_POINT_GROUP, [])
+
+        loaded = []
+        for entry_point in candidates:
+            try:
+                processor = entry_point.load()
+                self.register(entry_point.name, processor() if isinstance(processor, type) else processor)
+                loaded.append(entry_point.name)
+            except Exception as e:
+                print(f"⚠️ Could not load processor plugin {entry_point.name}: {e}")
+        return loaded
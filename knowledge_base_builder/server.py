@@ -0,0 +1,423 @@
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import re
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+# Per-job settings a request may override; anything else (API keys, providers) is the server's
+JOB_OPTIONS = {
+    'FILE_INCLUDE', 'FILE_EXCLUDE', 'MAX_FILE_MB', 'RESPECT_GITIGNORE',
+    'EXTRACT_MAIN_CONTENT', 'SITE_BOILERPLATE_MIN_PAGES', 'DEDUP_THRESHOLD', 'GROUP_BY_TOPIC', 'TOPIC_GROUPS',
+    'CHUNKS_JSONL', 'CHUNK_RECORD_CHARS', 'SHARD_DIR', 'SHARD_MAX_MB', 'SHARD_COMPRESSION', 'SHARD_BY_SOURCE',
+    'LLMS_TXT_DIR', 'LLMS_TXT_TITLE', 'LLMS_TXT_SUMMARY', 'LLMS_TXT_BASE_URL', 'EMBEDDINGS', 'EMBEDDING_DIMENSIONS',
+    'MAX_COST', 'MAX_TOKENS', 'METRICS_JSON', 'METRICS_PROM', 'BUILD_ID',
+}
+# Job options naming files or directories, kept inside the server's output directory
+PATH_OPTIONS = {'CHUNKS_JSONL', 'SHARD_DIR', 'LLMS_TXT_DIR', 'METRICS_JSON', 'METRICS_PROM'}
+# A build ID names a directory under the checkpoint directory: one safe path component
+_BUILD_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
+# Job whose build is running in the current thread or task
+_current_job: contextvars.ContextVar = contextvars.ContextVar('current_job', default=None)
+
+class Job:
+    """One queued or finished build and its progress events."""
+
+    def __init__(self, sources: Dict[str, Any], output_file: str, tenant: str = 'default', priority: int = 0,
+                 config: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.sources = sources
+        self.output_file = output_file
+        self.tenant = tenant
+        self.priority = priority
+        self.config = config or {}
+        self.status = 'queued'
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self._partial = ''
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('succeeded', 'failed', 'cancelled')
+
+    def emit(self, kind: str, message: str) -> None:
+        """Record a progress event and wake anyone following the job."""
+        with self._changed:
+            self.events.append({'seq': len(self.events), 'time': time.time(), 'type': kind, 'message': message})
+            self._changed.notify_all()
+
+    def write(self, text: str) -> None:
+        """Turn printed output into one log event per line."""
+        self._partial += text
+        *lines, self._partial = self._partial.split('\n')
+        for line in lines:
+            if line.strip():
+                self.emit('log', line)
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        if self._partial.strip():
+            self.emit('log', self._partial)
+        self._partial = ''
+        self.status, self.error = status, error
+        if status == 'running':
+            self.started = time.time()
+        elif self.done:
+            self.finished = time.time()
+        self.emit('status', status if error is None else f"{status}: {error}")
+
+    def wait_events(self, after: int, timeout: float) -> List[Dict[str, Any]]:
+        """Events after seq `after`, waiting up to timeout for new ones while the job runs."""
+        with self._changed:
+            if len(self.events) <= after + 1 and not self.done:
+                self._changed.wait(timeout)
+            return self.events[after + 1:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'tenant': self.tenant,
+            'priority': self.priority,
+            'output_file': self.output_file,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'error': self.error,
+            'events': len(self.events),
+        }
+
+class _JobOutput:
+    """sys.stdout replacement sending prints made while a job runs to that job's events."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        job = _current_job.get()
+        if job is None:
+            return self.stream.write(text)
+        job.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+class JobQueue:
+    """
+    Run build jobs on a fixed pool of worker threads.
+
+    The highest priority queued job runs first (first come, first served within
+    a priority), skipping jobs whose tenant already has tenant_limit builds
+    running. Each worker keeps its own KBBuilder, and with it the provider
+    client and processors, across jobs; a job that overrides options gets a
+    builder of its own that shares the worker's LLM client. Finished jobs are
+    kept up to `history`, oldest dropped first.
+    """
+
+    def __init__(self, make_builder: Callable[..., Any], workers: int = 2, tenant_limit: int = 1, history: int = 1000):
+        self.make_builder = make_builder
+        self.workers = workers
+        self.tenant_limit = tenant_limit
+        self.history = history
+        self.jobs: Dict[str, Job] = {}
+        self._sequence = itertools.count()
+        self._queued: List[tuple] = []
+        self._running: Dict[str, int] = {}
+        self._ready = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"kb-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        with self._ready:
+            self._stopping = True
+            self._ready.notify_all()
+
+    def submit(self, job: Job) -> Job:
+        with self._ready:
+            self.jobs[job.id] = job
+            self._queued.append((-job.priority, next(self._sequence), job))
+            self._queued.sort(key=lambda entry: entry[:2])
+            self._prune()
+            job.emit('status', 'queued')
+            self._ready.notify_all()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started; running builds cannot be interrupted."""
+        with self._ready:
+            for entry in self._queued:
+                if entry[2].id == job_id:
+                    self._queued.remove(entry)
+                    entry[2].set_status('cancelled')
+                    return True
+        return False
+
+    def position(self, job: Job) -> Optional[int]:
+        with self._ready:
+            return next((i for i, entry in enumerate(self._queued) if entry[2] is job), None)
+
+    def _prune(self) -> None:
+        finished = [job for job in self.jobs.values() if job.done]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job.id]
+
+    def _next(self) -> Optional[Job]:
+        for entry in self._queued:
+            job = entry[2]
+            if self._running.get(job.tenant, 0) < self.tenant_limit:
+                self._queued.remove(entry)
+                self._running[job.tenant] = self._running.get(job.tenant, 0) + 1
+                return job
+        return None
+
+    def _work(self) -> None:
+        # Before Python 3.10 asyncio objects bind to the thread's loop when created, and only
+        # the main thread has one: the warm builder and every build of this worker share this one
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        builder = None
+        try:
+            while True:
+                with self._ready:
+                    while not self._stopping and (job := self._next()) is None:
+                        self._ready.wait()
+                    if self._stopping:
+                        return
+                try:
+                    builder = self._run(job, builder)
+                finally:
+                    with self._ready:
+                        self._running[job.tenant] -= 1
+                        self._ready.notify_all()
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def _run(self, job: Job, builder: Any) -> Any:
+        """Build one job and return the worker's (possibly newly created) warm builder."""
+        job.set_status('running')
+        token = _current_job.set(job)
+        try:
+            if builder is None:
+                builder = self.make_builder()
+            job_builder = self.make_builder(job.config, builder.llm_client) if job.config else builder
+            job_builder.build(job.sources, job.output_file)
+            job.set_status('succeeded')
+        except Exception as e:
+            job.set_status('failed', str(e))
+        finally:
+            _current_job.reset(token)
+        return builder
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ('unix', 0)
+
+class BuildServer:
+    """
+    Long-running build service: a JobQueue behind a local JSON API, on a TCP
+    port or a Unix socket.
+
+        POST   /jobs                 {"sources", "output_file", "tenant", "priority", "config"}
+        GET    /jobs                 every known job
+        GET    /jobs/<id>            one job and its queue position
+        GET    /jobs/<id>/events     progress events as NDJSON (?after=<seq>, ?follow=1 to stream until done)
+        DELETE /jobs/<id>            cancel a queued job
+        GET    /health
+
+    Relative output paths are resolved in output_dir and no job may write outside
+    it. The process's stdout is routed to the events of the job that printed.
+    """
+
+    def __init__(self, config: Dict[str, Any], output_dir: str = '.', workers: int = 2, tenant_limit: int = 1,
+                 llm_client: Any = None):
+        self.config = config
+        self.output_dir = os.path.abspath(output_dir)
+        self.llm_client = llm_client
+        self.queue = JobQueue(self._make_builder, workers=workers, tenant_limit=tenant_limit)
+        self._server = None
+        self._stdout = None
+
+    def _make_builder(self, overrides: Optional[Dict[str, Any]] = None, llm_client: Any = None):
+        from knowledge_base_builder.kb_builder import KBBuilder
+
+        return KBBuilder({**self.config, **(overrides or {})}, llm_client=llm_client or self.llm_client)
+
+    def _resolve(self, path: str) -> str:
+        resolved = os.path.abspath(os.path.join(self.output_dir, path))
+        if os.path.commonpath([resolved, self.output_dir]) != self.output_dir:
+            raise ValueError(f"Path outside the output directory: {path}")
+        return resolved
+
+    def create_job(self, request: Dict[str, Any]) -> Job:
+        """Validate a job request and queue it."""
+        sources = request.get('sources')
+        if not isinstance(sources, dict) or not any(sources.values()):
+            raise ValueError("sources must be a non-empty object, as for KBBuilder.build")
+        config = dict(request.get('config') or {})
+        if unknown := sorted(set(config) - JOB_OPTIONS):
+            raise ValueError(f"Options not allowed per job: {', '.join(unknown)}")
+        for key in PATH_OPTIONS & set(config):
+            if config[key]:
+                config[key] = self._resolve(str(config[key]))
+        # A delta KB holds only the changed files, so it must not silently replace the full one
+        repos = sources.get('git_repositories') or []
+        if not request.get('output_file') and any(isinstance(repo, dict) and repo.get('changed_since') for repo in repos):
+            raise ValueError("A delta build (changed_since) needs an explicit output_file")
+        tenant = str(request.get('tenant') or 'default')
+        if config.get('BUILD_ID'):
+            build_id = str(config['BUILD_ID'])
+            if not _BUILD_ID.match(build_id) or '..' in build_id:
+                raise ValueError(f"Invalid BUILD_ID: {build_id}")
+            # Scoped to the tenant, so one tenant cannot resume another's build
+            config['BUILD_ID'] = f"{re.sub(r'[^A-Za-z0-9_-]', '_', tenant)}.{build_id}"
+        job = Job(
+            sources=sources,
+            output_file=self._resolve(str(request.get('output_file') or 'final_knowledge_base.md')),
+            tenant=tenant,
+            priority=int(request.get('priority') or 0),
+            config=config,
+        )
+        return self.queue.submit(job)
+
+    def start(self, host: str = '127.0.0.1', port: int = 8765, socket_path: Optional[str] = None) -> 'BuildServer':
+        handler = self._handler()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self._server = _UnixHTTPServer(socket_path, handler)
+        else:
+            self._server = ThreadingHTTPServer((host, port), handler)
+            self._server.daemon_threads = True
+        self._stdout, sys.stdout = sys.stdout, _JobOutput(sys.stdout)
+        self.queue.start()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def address(self) -> str:
+        address = self._server.server_address
+        return address if isinstance(address, str) else f"http://{address[0]}:{address[1]}"
+
+    def stop(self) -> None:
+        self.queue.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self._server.server_address, str) and os.path.exists(self._server.server_address):
+                os.remove(self._server.server_address)
+            self._server = None
+        if self._stdout is not None:
+            sys.stdout, self._stdout = self._stdout, None
+
+    def __enter__(self) -> 'BuildServer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, body: Any) -> None:
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _job(self, parts: List[str]) -> Optional[Job]:
+                job = server.queue.jobs.get(parts[1]) if len(parts) > 1 else None
+                if job is None:
+                    self._send(404, {'error': 'No such job'})
+                return job
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(parsed.query)
+                parts = parsed.path.strip('/').split('/')
+                if parts == ['health']:
+                    self._send(200, {'status': 'ok', 'jobs': len(server.queue.jobs)})
+                elif parts == ['jobs']:
+                    self._send(200, [job.to_dict() for job in list(server.queue.jobs.values())])
+                elif parts[0] == 'jobs' and len(parts) == 2:
+                    if job := self._job(parts):
+                        self._send(200, {**job.to_dict(), 'position': server.queue.position(job)})
+                elif parts[0] == 'jobs' and parts[2:] == ['events']:
+                    try:
+                        after = int(query.get('after', ['-1'])[0])
+                    except ValueError:
+                        self._send(400, {'error': 'after must be an integer'})
+                        return
+                    if job := self._job(parts):
+                        self._events(job, after, query.get('follow', ['0'])[0] == '1')
+                else:
+                    self._send(404, {'error': 'Not found'})
+
+            def _events(self, job: Job, after: int, follow: bool) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.end_headers()
+                while True:
+                    events = job.wait_events(after, timeout=15.0) if follow else job.events[after + 1:]
+                    for event in events:
+                        self.wfile.write((json.dumps(event) + '\n').encode('utf-8'))
+                        after = event['seq']
+                    self.wfile.flush()
+                    if not follow or (job.done and after == len(job.events) - 1):
+                        return
+
+            def do_POST(self):
+                if self.path.rstrip('/') != '/jobs':
+                    self._send(404, {'error': 'Not found'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    job = server.create_job(json.loads(self.rfile.read(length) or b'{}'))
+                except (ValueError, TypeError) as e:
+                    self._send(400, {'error': str(e)})
+                    return
+                self._send(202, job.to_dict())
+
+            def do_DELETE(self):
+                parts = self.path.strip('/').split('/')
+                if parts[0] != 'jobs' or len(parts) != 2:
+                    self._send(404, {'error': 'Not found'})
+                elif job := self._job(parts):
+                    if server.queue.cancel(job.id):
+                        self._send(200, job.to_dict())
+                    else:
+                        self._send(409, {'error': f"Job is {job.status}"})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
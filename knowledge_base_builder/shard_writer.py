@@ -0,0 +1,197 @@
+import gzip
+import json
+import mmap
+import os
+import urllib.parse
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from knowledge_base_builder.chunk_writer import split_sections
+
+_EXTENSIONS = {None: ".md", "gzip": ".md.gz", "zstd": ".md.zst"}
+
+def _compressor(compression: Optional[str]) -> Callable[[bytes], bytes]:
+    if compression is None:
+        return lambda data: data
+    if compression == "gzip":
+        return lambda data: gzip.compress(data, mtime=0)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd shards need the zstandard package: pip install knowledge-base-builder[zstd]")
+        return zstandard.ZstdCompressor(level=10).compress
+    raise ValueError(f"Unsupported shard compression: {compression}. Expected gzip or zstd")
+
+def _decompressor(compression: Optional[str]) -> Callable[[bytes], bytes]:
+    if compression is None:
+        return lambda data: data
+    if compression == "gzip":
+        return gzip.decompress
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unsupported shard compression: {compression}")
+
+def source_group(source: str) -> str:
+    """The group a source belongs to: the host of a URL, or the directory of a local file."""
+    parsed = urllib.parse.urlparse(source)
+    if parsed.scheme in ("http", "https"):
+        return parsed.netloc
+    return os.path.dirname(urllib.parse.unquote(parsed.path)) if parsed.scheme == "file" else source
+
+class ShardedKBWriter:
+    """
+    Write a knowledge base as size-bounded shards plus an index.json.
+
+    The KB is cut into Markdown sections at its headings. Sections are appended to
+    shard files of at most max_shard_bytes, and with by_source a new shard also
+    starts whenever the main source of a chunk moves to another host or directory.
+    Compressed shards are sequences of independent gzip members or zstd frames of
+    about frame_bytes each, so any section can be read without decompressing the
+    rest of its shard. For every section the index records its heading path and
+    sources, the shard, the `offset`/`length` of the bytes to read from the shard
+    and the `start`/`size` of the section within them once decompressed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_shard_bytes: int = 64 * 1024 * 1024,
+        compression: Optional[str] = None,
+        by_source: bool = False,
+        frame_bytes: int = 256 * 1024,
+    ):
+        self.directory = directory
+        self.max_shard_bytes = max_shard_bytes
+        self.compression = compression
+        self.by_source = by_source
+        self.frame_bytes = frame_bytes
+        self._compress = _compressor(compression)
+        self.shards: List[Dict[str, Any]] = []
+        self.sections: List[Dict[str, Any]] = []
+        self._file = None
+        self._group: Optional[str] = None
+        # Sections waiting for the current frame to be compressed and written
+        self._frame = bytearray()
+        self._frame_sections: List[Dict[str, Any]] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, text: str, sources: Optional[Dict[str, int]] = None) -> None:
+        """Append one processed chunk, given the characters each source contributed to it."""
+        sources = sources or {}
+        urls = [url for url, _ in sorted(sources.items(), key=lambda item: (-item[1], item[0]))]
+        if self.by_source and urls:
+            group = source_group(urls[0])
+            if self._group is not None and group != self._group:
+                self._next_shard()
+            self._group = group
+
+        for section in split_sections(text, max_chars=max(self.frame_bytes, 1)):
+            data = (section.text + "\n\n").encode("utf-8")
+            if self._file is None or (self.shards[-1]["raw_bytes"] and
+                                      self.shards[-1]["raw_bytes"] + len(data) > self.max_shard_bytes):
+                self._next_shard()
+            entry = {
+                "heading_path": section.heading_path,
+                "sources": urls,
+                "shard": len(self.shards) - 1,
+                "start": len(self._frame),
+                "size": len(data),
+            }
+            self._frame += data
+            self._frame_sections.append(entry)
+            self.shards[-1]["raw_bytes"] += len(data)
+            self.shards[-1]["sections"] += 1
+            self.sections.append(entry)
+            if self.compression is None or len(self._frame) >= self.frame_bytes:
+                self._flush_frame()
+
+    def _flush_frame(self) -> None:
+        if not self._frame:
+            return
+        block = self._compress(bytes(self._frame))
+        offset = self._file.tell()
+        self._file.write(block)
+        for entry in self._frame_sections:
+            if self.compression is None:
+                entry["offset"], entry["length"], entry["start"] = offset + entry["start"], entry["size"], 0
+            else:
+                entry["offset"], entry["length"] = offset, len(block)
+        self.shards[-1]["bytes"] += len(block)
+        self._frame = bytearray()
+        self._frame_sections = []
+
+    def _next_shard(self) -> None:
+        self._close_shard()
+        name = f"kb-{len(self.shards):05d}{_EXTENSIONS[self.compression]}"
+        self._file = open(os.path.join(self.directory, name), "wb")
+        self.shards.append({"file": name, "bytes": 0, "raw_bytes": 0, "sections": 0})
+
+    def _close_shard(self) -> None:
+        if self._file is not None:
+            self._flush_frame()
+            self._file.close()
+            self._file = None
+
+    def close(self) -> str:
+        """Finish the last shard, write index.json and return its path."""
+        self._close_shard()
+        sources: Dict[str, List[int]] = {}
+        for entry in self.sections:
+            for url in entry["sources"]:
+                shards = sources.setdefault(url, [])
+                if entry["shard"] not in shards:
+                    shards.append(entry["shard"])
+        index = {
+            "version": 1,
+            "compression": self.compression,
+            "shards": self.shards,
+            "sections": self.sections,
+            "sources": sources,
+        }
+        path = os.path.join(self.directory, "index.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        return path
+
+class ShardedKB:
+    """Read sections of a sharded knowledge base through its index, memory-mapping the shards."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        self._decompress = _decompressor(self.index["compression"])
+        self._maps: Dict[int, mmap.mmap] = {}
+
+    @property
+    def sections(self) -> List[Dict[str, Any]]:
+        return self.index["sections"]
+
+    def find(self, heading: str) -> Iterator[Dict[str, Any]]:
+        """Index entries of the sections with this heading anywhere in their heading path."""
+        return (entry for entry in self.sections if heading in entry["heading_path"])
+
+    def for_source(self, source: str) -> Iterator[Dict[str, Any]]:
+        """Index entries of the sections built from this source."""
+        return (entry for entry in self.sections if source in entry["sources"])
+
+    def read(self, entry: Dict[str, Any]) -> str:
+        """The Markdown of one section."""
+        shard = entry["shard"]
+        if shard not in self._maps:
+            with open(os.path.join(self.directory, self.index["shards"][shard]["file"]), "rb") as f:
+                self._maps[shard] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        block = self._decompress(self._maps[shard][entry["offset"]:entry["offset"] + entry["length"]])
+        return block[entry["start"]:entry["start"] + entry["size"]].decode("utf-8")
+
+    def close(self) -> None:
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+
+    def __enter__(self) -> "ShardedKB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
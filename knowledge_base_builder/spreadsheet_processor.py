@@ -2,21 +2,37 @@ import os
 import requests
 import tempfile
 import urllib.parse
-import pandas as pd
 import re
-import ezodf
+import zipfile
+import itertools
+import xml.etree.ElementTree as ET
 from io import StringIO
+from typing import TYPE_CHECKING, Iterator, List, Tuple, Any
 from knowledge_base_builder.base_processor import BaseProcessor
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# OpenDocument namespaces used when streaming content.xml
+_ODS_TABLE = '{urn:oasis:names:tc:opendocument:xmlns:table:1.0}'
+_ODS_OFFICE = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+_ODS_TEXT = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+
 class SpreadsheetProcessor(BaseProcessor):
     """Handle spreadsheet processing for .csv, .tsv, .xlsx, and .ods files."""
     
     SUPPORTED_EXTENSIONS = ['.csv', '.tsv', '.xlsx', '.ods']
+    MIME_TYPES = {
+        'text/csv': '.csv',
+        'text/tab-separated-values': '.tsv',
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
+        'application/vnd.oasis.opendocument.spreadsheet': '.ods',
+    }
     
     @staticmethod
     def download(url: str) -> str:
         """Download a spreadsheet from a URL or load from local file."""
-        return BaseProcessor.download(url, SpreadsheetProcessor.SUPPORTED_EXTENSIONS)
+        return BaseProcessor.download(url, SpreadsheetProcessor.SUPPORTED_EXTENSIONS, SpreadsheetProcessor.MIME_TYPES)
 
     @staticmethod
     def extract_text(file_path: str) -> str:
@@ -37,6 +53,8 @@ class SpreadsheetProcessor(BaseProcessor):
     @staticmethod
     def _extract_from_csv(file_path: str) -> str:
         """Extract text from a .csv file."""
+        import pandas as pd
+
         try:
             df = pd.read_csv(file_path, encoding='utf-8', on_bad_lines='skip')
             return SpreadsheetProcessor._dataframe_to_markdown(df)
@@ -46,6 +64,8 @@ class SpreadsheetProcessor(BaseProcessor):
     @staticmethod
     def _extract_from_tsv(file_path: str) -> str:
         """Extract text from a .tsv file."""
+        import pandas as pd
+
         try:
             df = pd.read_csv(file_path, sep='\t', encoding='utf-8', on_bad_lines='skip')
             return SpreadsheetProcessor._dataframe_to_markdown(df)
@@ -55,6 +75,8 @@ class SpreadsheetProcessor(BaseProcessor):
     @staticmethod
     def _extract_from_xlsx(file_path: str) -> str:
         """Extract text from a .xlsx file."""
+        import pandas as pd
+
         try:
             # Read all sheets
             xlsx = pd.ExcelFile(file_path)
@@ -75,18 +97,21 @@ class SpreadsheetProcessor(BaseProcessor):
     @staticmethod
     def _extract_from_ods(file_path: str) -> str:
         """Extract text from a .ods file."""
+        import pandas as pd
+
         try:
-            doc = ezodf.opendoc(file_path)
             results = []
             
-            for sheet in doc.sheets:
-                sheet_name = sheet.name
-                # Convert sheet to DataFrame
-                df = pd.DataFrame({col: [sheet[row, col].value for row in range(sheet.nrows())] 
-                                 for col in range(sheet.ncols())})
+            for sheet_name, rows in SpreadsheetProcessor._iter_ods_sheets(file_path):
+                if not rows:
+                    continue
+                # Build the whole sheet in one go instead of cell by cell
+                df = pd.DataFrame(rows)
                 
                 # Use first row as header if it contains string values
-                if all(isinstance(val, str) for val in df.iloc[0].values):
+                # (rows are ragged, so ignore the padding past the last cell)
+                header = df.iloc[0].dropna()
+                if len(header) and all(isinstance(val, str) for val in header.values):
                     df.columns = df.iloc[0]
                     df = df.iloc[1:]
                 
@@ -100,8 +125,109 @@ class SpreadsheetProcessor(BaseProcessor):
             raise Exception(f"Error extracting text from .ods file: {e}")
 
     @staticmethod
-    def _dataframe_to_markdown(df: pd.DataFrame) -> str:
+    def _iter_ods_sheets(file_path: str) -> Iterator[Tuple[str, List[List[Any]]]]:
+        """
+        Stream the tables of an .ods file as (sheet name, rows) pairs.
+        
+        content.xml is read with an incremental parser and every finished row is
+        cleared right away. Repeated rows/columns are only expanded when they are
+        followed by real data, so the trailing blank padding written by office
+        suites (often a million repeated rows) never gets materialized.
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open('content.xml') as content:
+                sheet_name = None
+                rows: List[List[Any]] = []
+                row: List[Tuple[Any, int]] = []
+                pending_empty_rows = 0
+                parents = []
+                
+                for event, elem in ET.iterparse(content, events=('start', 'end')):
+                    if event == 'start':
+                        if elem.tag == f'{_ODS_TABLE}table':
+                            sheet_name = elem.get(f'{_ODS_TABLE}name', '')
+                            rows = []
+                            pending_empty_rows = 0
+                        elif elem.tag == f'{_ODS_TABLE}table-row':
+                            row = []
+                        parents.append(elem)
+                        continue
+                    
+                    parents.pop()
+                    if elem.tag in (f'{_ODS_TABLE}table-cell', f'{_ODS_TABLE}covered-table-cell'):
+                        repeat = int(elem.get(f'{_ODS_TABLE}number-columns-repeated', 1))
+                        row.append((SpreadsheetProcessor._ods_cell_value(elem), repeat))
+                    elif elem.tag == f'{_ODS_TABLE}table-row':
+                        repeat = int(elem.get(f'{_ODS_TABLE}number-rows-repeated', 1))
+                        # Drop trailing empty cells before expanding repeats
+                        while row and row[-1][0] is None:
+                            row.pop()
+                        if not row:
+                            pending_empty_rows += repeat
+                        else:
+                            values = list(itertools.chain.from_iterable(
+                                itertools.repeat(value, count) for value, count in row
+                            ))
+                            # Blank rows only count once real data follows them
+                            rows.extend([] for _ in range(pending_empty_rows))
+                            pending_empty_rows = 0
+                            rows.extend(list(values) for _ in range(repeat))
+                    elif elem.tag == f'{_ODS_TABLE}table':
+                        yield sheet_name, rows
+                        rows = []
+                    else:
+                        continue
+                    
+                    # Release finished rows/cells so memory stays flat
+                    elem.clear()
+                    if parents:
+                        parents[-1].remove(elem)
+
+    @staticmethod
+    def _ods_cell_value(cell: ET.Element) -> Any:
+        """Convert a table cell element into a Python value (None when empty)."""
+        value_type = cell.get(f'{_ODS_OFFICE}value-type')
+        if value_type in ('float', 'percentage', 'currency'):
+            try:
+                return float(cell.get(f'{_ODS_OFFICE}value'))
+            except (TypeError, ValueError):
+                pass  # No usable office:value: fall back to the displayed text
+        if value_type == 'boolean':
+            return cell.get(f'{_ODS_OFFICE}boolean-value') == 'true'
+        if value_type == 'date':
+            return cell.get(f'{_ODS_OFFICE}date-value')
+        if value_type == 'time':
+            return cell.get(f'{_ODS_OFFICE}time-value')
+        
+        paragraphs = [
+            SpreadsheetProcessor._ods_text(paragraph)
+            for paragraph in cell.iter(f'{_ODS_TEXT}p')
+        ]
+        if value_type is None and not paragraphs:
+            return None
+        return '\n'.join(paragraphs)
+
+    @staticmethod
+    def _ods_text(node: ET.Element) -> str:
+        """Flatten an ODF text node, expanding space/tab/line-break markers."""
+        if node.tag == f'{_ODS_TEXT}s':
+            text = ' ' * int(node.get(f'{_ODS_TEXT}c', 1))
+        elif node.tag == f'{_ODS_TEXT}tab':
+            text = '\t'
+        elif node.tag == f'{_ODS_TEXT}line-break':
+            text = '\n'
+        else:
+            text = node.text or ''
+        children = ''.join(
+            SpreadsheetProcessor._ods_text(child) + (child.tail or '') for child in node
+        )
+        return text + children
+
+    @staticmethod
+    def _dataframe_to_markdown(df: "pd.DataFrame") -> str:
         """Convert a pandas DataFrame to a markdown table."""
+        import pandas as pd
+
         try:
             # Handle large dataframes by sampling or truncating
             if len(df) > 100:
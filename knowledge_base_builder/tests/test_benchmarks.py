@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from knowledge_base_builder.benchmarks import FakeLLMClient, FixtureServer, Scenario, SyntheticCorpus, compare, run_scenario
+from knowledge_base_builder.github_processor import GitHubProcessor
+
+class TestFakeLLMClient(unittest.TestCase):
+    """Test the FakeLLMClient class functionality."""
+
+    def test_responses_and_rate_limits_are_deterministic(self):
+        """Test the same prompts give the same outputs and 429s in any order."""
+        prompts = [f"document {i} " * 50 for i in range(20)]
+
+        async def run(order):
+            client = FakeLLMClient(latency=0.001, rate_limit_rate=0.3, backoff=0.001, max_retries=10)
+            outputs = await asyncio.gather(*(client.run_async(prompts[i]) for i in order))
+            return dict(zip(order, outputs)), client.rate_limited
+
+        forward, limited = asyncio.run(run(list(range(20))))
+        backward, limited_again = asyncio.run(run(list(reversed(range(20)))))
+        self.assertEqual(forward, backward)
+        self.assertEqual(limited, limited_again)
+        self.assertGreater(limited, 0)
+        self.assertLess(len(forward[0]), len(prompts[0]))
+
+class TestFixtureServer(unittest.TestCase):
+    """Test the FixtureServer class functionality."""
+
+    def test_github_stand_in(self):
+        """Test GitHubProcessor lists and downloads the fake repository."""
+        corpus = SyntheticCorpus(github_files=4)
+        with FixtureServer(corpus) as server:
+            processor = GitHubProcessor(username=FixtureServer.OWNER, api_url=server.github_api_url)
+            self.assertEqual(processor.get_user_repos(), [FixtureServer.REPO])
+            urls = processor.get_markdown_urls_for_repo(FixtureServer.OWNER, FixtureServer.REPO)
+            self.assertEqual(len(urls), 4)
+            self.assertEqual(processor.download_markdown(urls[0]), corpus.markdown(urls[0].split("/docs/", 1)[1]))
+
+class TestRunner(unittest.TestCase):
+    """Test scenario runs and report comparison."""
+
+    def test_run_scenario(self):
+        """Test a small scenario collects every source and reports percentiles."""
+        result = run_scenario(Scenario("tiny", pages=2, pdfs=1, spreadsheets=2, github_files=2,
+                                       http_latency=0, llm_latency=0.001, tokens_per_second=1e9))
+        self.assertEqual(result['documents'], 7)
+        self.assertGreater(result['output_bytes'], 0)
+        self.assertIn('p95', result['latency']['llm_request'])
+
+    def test_compare_flags_regressions(self):
+        """Test slower runs are flagged and faster ones are not."""
+        baseline = {'results': {'s': {'wall_seconds': 1.0, 'throughput': {'documents_per_second': 10.0}}}}
+        current = {'results': {'s': {'wall_seconds': 1.5, 'throughput': {'documents_per_second': 12.0}}}}
+        rows = {row['metric']: row for row in compare(baseline, current)}
+        self.assertTrue(rows['wall_seconds']['regression'])
+        self.assertFalse(rows['throughput.documents_per_second']['regression'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from knowledge_base_builder.benchmarks import FakeLLMClient
+from knowledge_base_builder.checkpoint import BuildCheckpoint
+from knowledge_base_builder.kb_builder import KBBuilder
+
+class TestBuildCheckpoint(unittest.TestCase):
+    """Test the BuildCheckpoint class functionality."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_sources_and_chunks_survive_a_restart(self):
+        """Test a second checkpoint with the same build ID sees the first one's work."""
+        checkpoint = BuildCheckpoint(self.root)
+        checkpoint.save_source("https://example.com/a.pdf", "extracted text")
+        checkpoint.save_chunk("chunk text", "# Processed")
+        checkpoint.save_manifest({'files': ["https://example.com/a.pdf"]}, "out.md")
+
+        resumed = BuildCheckpoint(self.root, checkpoint.build_id)
+
+        self.assertEqual(resumed.load_source("https://example.com/a.pdf"), "extracted text")
+        self.assertIsNone(resumed.load_source("https://example.com/b.pdf"))
+        self.assertEqual(resumed.load_chunk("chunk text"), "# Processed")
+        self.assertIsNone(resumed.load_chunk("other chunk"))
+        self.assertEqual((resumed.reused_sources, resumed.reused_chunks), (1, 1))
+        self.assertEqual(resumed.load_manifest()['sources'], {'files': ["https://example.com/a.pdf"]})
+
+    def test_writes_leave_no_temporary_files(self):
+        """Test entries are written atomically through a temporary file."""
+        checkpoint = BuildCheckpoint(self.root, "build-1")
+        checkpoint.save_chunk("chunk", "output")
+
+        self.assertEqual(os.path.basename(checkpoint.path), "build-1")
+        self.assertTrue(all(name.endswith(".md") for name in os.listdir(checkpoint.chunks_dir)))
+
+    def test_finished_build_removes_its_checkpoint(self):
+        """Test a build that finishes deletes its checkpoint unless asked to keep it."""
+        source = os.path.join(self.root, "doc.md")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("# Doc\n\nSome text.")
+        for keep in (False, True):
+            builder = KBBuilder({'CHECKPOINT_DIR': os.path.join(self.root, "builds"), 'KEEP_CHECKPOINTS': keep},
+                                llm_client=FakeLLMClient(latency=0, tokens_per_second=1e9))
+            builder.build({'files': [source]}, os.path.join(self.root, "kb.md"))
+            self.assertEqual(os.path.isdir(builder.checkpoint.path), keep)
+
+    def test_resumed_sitemap_skips_checkpointed_pages(self):
+        """Test pages of a sitemap already in the checkpoint are not downloaded again."""
+        builder = KBBuilder({}, llm_client=FakeLLMClient(latency=0, tokens_per_second=1e9))
+        builder.checkpoint = BuildCheckpoint(self.root, "build-1")
+        builder.checkpoint.save_source("https://example.com/a", "Page A from the first run")
+        processor = builder.website_processor
+        with patch.object(processor, 'get_urls_from_sitemap', return_value=["https://example.com/a", "https://example.com/b"]), \
+                patch.object(processor, 'download_html', return_value="<html><body><p>Page B</p></body></html>") as download:
+            builder.process_websites("https://example.com/sitemap.xml")
+        download.assert_called_once_with("https://example.com/b")
+        self.assertEqual(builder.text_contents[0], "Page A from the first run")
+        self.assertIn("Page B", builder.text_contents[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import unittest
+from knowledge_base_builder.chunk_writer import ChunkJSONLWriter, split_sections
+
+class TestSplitSections(unittest.TestCase):
+    """Test Markdown section splitting."""
+
+    def test_heading_paths(self):
+        """Test sections carry their enclosing headings and fenced headings are ignored."""
+        markdown = (
+            "Intro text\n"
+            "# Guide\nOverview\n"
+            "## Install\nRun it\n```\n# not a heading\n```\n"
+            "## Usage\nCall it\n"
+            "# Reference\nAPI\n"
+        )
+        sections = split_sections(markdown)
+        self.assertEqual([section.heading_path for section in sections],
+                         [[], ['Guide'], ['Guide', 'Install'], ['Guide', 'Usage'], ['Reference']])
+        self.assertIn("# not a heading", sections[2].text)
+
+    def test_long_sections_are_split(self):
+        """Test sections above max_chars are split at paragraphs without losing text."""
+        paragraphs = [f"paragraph {i} " + "x" * 30 for i in range(10)]
+        sections = split_sections("# Title\n\n" + "\n\n".join(paragraphs), max_chars=100)
+        self.assertTrue(all(len(section.text) <= 100 for section in sections))
+        self.assertTrue(all(section.heading_path == ['Title'] for section in sections))
+        self.assertEqual("".join(section.text for section in sections).count("paragraph"), 10)
+
+class TestChunkJSONLWriter(unittest.TestCase):
+    """Test the ChunkJSONLWriter class functionality."""
+
+    def test_records(self):
+        """Test records are written per section with stable ids and content hashes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "chunks.jsonl")
+            with ChunkJSONLWriter(path) as writer:
+                writer.write(2, ["# A\none\n# B\ntwo"], {'b.pdf': 10, 'a.pdf': 30})
+                writer.write(1, ["# A\none"], {'b.pdf': 5})
+            with open(path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(writer.records, 3)
+        self.assertEqual([record['chunk'] for record in records], [2, 2, 1])
+        self.assertEqual(records[0]['sources'], ['a.pdf', 'b.pdf'])
+        self.assertEqual(records[1]['heading_path'], ['B'])
+        self.assertEqual(records[0]['hash'], records[2]['hash'])
+        self.assertEqual(len({record['id'] for record in records}), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+from knowledge_base_builder.collector import OrderedCollector, source_id
+
+class TestOrderedCollector(unittest.TestCase):
+    """Test the OrderedCollector class functionality."""
+
+    def test_releases_in_slot_order(self):
+        """Test documents are emitted in reservation order whatever order they finish in."""
+        emitted = []
+
+        async def emit(text, source):
+            await asyncio.sleep(0)
+            emitted.append(text)
+
+        async def fetch(collector, slot, source, delay, texts):
+            await asyncio.sleep(delay)
+            for text in texts:
+                collector.add(slot, text, source)
+            await collector.close(slot)
+
+        async def run():
+            collector = OrderedCollector(emit)
+            jobs = [("a", 0.03, ["a1", "a2"]), ("b", 0.0, ["b1"]), ("c", 0.02, []), ("d", 0.01, ["d1"])]
+            await asyncio.gather(*(fetch(collector, collector.reserve(source), source, delay, texts)
+                                   for source, delay, texts in jobs))
+            await collector.collect("e1", "e")
+            return collector
+
+        collector = asyncio.run(run())
+
+        self.assertEqual(emitted, ["a1", "a2", "b1", "d1", "e1"])
+        self.assertEqual(collector.pending, 0)
+        self.assertEqual([source for _, source in collector.sources], ["a", "b", "c", "d", "e"])
+
+    def test_wait_for_room(self):
+        """Test reservations wait while too many slots are unreleased."""
+        async def emit(text, source):
+            pass
+
+        async def run():
+            collector = OrderedCollector(emit)
+            first = collector.reserve("a")
+            collector.reserve("b")
+            waiter = asyncio.ensure_future(collector.wait_for_room(2))
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            await collector.close(first)
+            await asyncio.wait_for(waiter, timeout=1)
+
+        asyncio.run(run())
+
+    def test_source_id_is_stable(self):
+        """Test source IDs depend only on the source."""
+        self.assertEqual(source_id("https://example.com/a.pdf"), source_id("https://example.com/a.pdf"))
+        self.assertNotEqual(source_id("https://example.com/a.pdf"), source_id("https://example.com/b.pdf"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import asyncio
+import threading
+import unittest
+from knowledge_base_builder.compat import LoopSemaphore
+
+class TestLoopSemaphore(unittest.TestCase):
+    """Test the LoopSemaphore class functionality."""
+
+    def test_caps_concurrency_in_every_loop(self):
+        """Test a semaphore made in a thread without a loop works in several loops."""
+        semaphores = []
+        thread = threading.Thread(target=lambda: semaphores.append(LoopSemaphore(2)))
+        thread.start()
+        thread.join()
+        semaphore = semaphores[0]
+
+        async def run():
+            active, peak = 0, 0
+
+            async def task():
+                nonlocal active, peak
+                async with semaphore:
+                    active += 1
+                    peak = max(peak, active)
+                    await asyncio.sleep(0.01)
+                    active -= 1
+
+            await asyncio.gather(*(task() for _ in range(6)))
+            return peak
+
+        for _ in range(2):
+            self.assertEqual(asyncio.run(run()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
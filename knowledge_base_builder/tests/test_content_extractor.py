@@ -0,0 +1,82 @@
+import unittest
+from knowledge_base_builder.html_cleaner import HTMLCleaner, Block
+from knowledge_base_builder.content_extractor import MainContentExtractor, SiteBoilerplateFilter
+
+BODY_TEXT = " ".join(["The builder turns documents into a structured knowledge base."] * 5)
+
+PAGE_HTML = f"""
+<html><body>
+  <div class="topbar"><a href="/">Home</a> <a href="/docs">Docs</a> <a href="/blog">Blog</a></div>
+  <div class="cookie-banner"><p>We use cookies to improve your experience.</p></div>
+  <main>
+    <h1>Getting Started</h1>
+    <p>{BODY_TEXT}</p>
+    <div class="note"><p>Short note inside the article.</p></div>
+    <ul><li>Install the package</li><li>Set an API key</li></ul>
+    <p>{BODY_TEXT}</p>
+  </main>
+  <div class="sidebar"><p>Related posts and other things.</p></div>
+  <footer><p>Copyright 2025 Example Inc.</p></footer>
+</body></html>
+"""
+
+class TestMainContentExtractor(unittest.TestCase):
+    """Test the MainContentExtractor class functionality."""
+
+    def test_select_drops_chrome(self):
+        """Test link-heavy and chrome blocks are removed while the article stays."""
+        blocks = MainContentExtractor().select(HTMLCleaner().to_blocks(PAGE_HTML))
+        text = HTMLCleaner.join_blocks(blocks)
+
+        self.assertTrue(text.startswith("# Getting Started"))
+        self.assertIn("- Install the package", text)
+        self.assertIn("Short note inside the article.", text)
+        self.assertNotIn("Home", text)
+        self.assertNotIn("cookies", text)
+        self.assertNotIn("Related posts", text)
+        self.assertNotIn("Copyright", text)
+
+    def test_select_keeps_short_sections_after_dense_text(self):
+        """Test headings, code, lists and short paragraphs after the last dense block are kept."""
+        for wrapper in ('{}', '<main>{}</main>'):
+            html = wrapper.format(
+                f"<h1>Tool</h1><p>{BODY_TEXT}</p><h2>Usage</h2><pre>pip install tool</pre>"
+                "<p>Then run it.</p><h2>Options</h2><ul><li>--verbose</li></ul>"
+            )
+            text = HTMLCleaner.join_blocks(MainContentExtractor().select(HTMLCleaner().to_blocks(html)))
+
+            for expected in ("# Tool", "## Usage", "pip install tool", "Then run it.", "## Options", "- --verbose"):
+                self.assertIn(expected, text)
+
+    def test_select_short_page(self):
+        """Test pages without dense text only lose their chrome."""
+        blocks = HTMLCleaner().to_blocks("<h1>Hi</h1><p>Short page.</p><footer>Footer</footer>")
+
+        self.assertEqual([block.text for block in MainContentExtractor().select(blocks)], ["# Hi", "Short page."])
+
+class TestSiteBoilerplateFilter(unittest.TestCase):
+    """Test the SiteBoilerplateFilter class functionality."""
+
+    def test_filter_repeated_blocks(self):
+        """Test blocks repeated on most pages of a host are dropped."""
+        site_filter = SiteBoilerplateFilter(min_pages=3, min_ratio=0.5)
+        pages = {
+            f"https://docs.example.com/page{i}": [
+                Block('paragraph', "Subscribe to our newsletter!"),
+                Block('paragraph', f"Unique content {i}"),
+            ]
+            for i in range(4)
+        }
+        pages["https://other.example.com/"] = [Block('paragraph', "Subscribe to our newsletter!")]
+        for url, blocks in pages.items():
+            site_filter.observe(url, blocks)
+
+        kept = site_filter.filter("https://docs.example.com/page0", pages["https://docs.example.com/page0"])
+
+        self.assertEqual([block.text for block in kept], ["Unique content 0"])
+        self.assertEqual(site_filter.removed_blocks, 1)
+        # Another host has not seen the block often enough
+        self.assertEqual(len(site_filter.filter("https://other.example.com/", pages["https://other.example.com/"])), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from knowledge_base_builder.dedup import Deduplicator, SimHashIndex, simhash
+
+ARTICLE = (
+    "The knowledge base builder downloads documents from many sources, extracts their text "
+    "and sends it to a language model that merges everything into one structured Markdown file. "
+    "Each source type has its own processor that knows how to read the format."
+)
+
+class TestSimHash(unittest.TestCase):
+    """Test the SimHash fingerprint and its LSH index."""
+
+    def test_similar_texts_have_close_fingerprints(self):
+        """Test a small edit changes few bits while an unrelated text changes many."""
+        edited = ARTICLE.replace("many sources", "several sources")
+        unrelated = "Completely different words about cooking pasta with tomatoes, garlic, basil and olive oil tonight."
+
+        self.assertEqual(simhash(ARTICLE), simhash(ARTICLE))
+        self.assertLessEqual(bin(simhash(ARTICLE) ^ simhash(edited)).count('1'), 6)
+        self.assertGreater(bin(simhash(ARTICLE) ^ simhash(unrelated)).count('1'), 12)
+        self.assertIsNone(simhash("!!!"))
+
+    def test_index_finds_neighbours_within_distance(self):
+        """Test band lookups find fingerprints within the distance and nothing further away."""
+        index = SimHashIndex(max_distance=3)
+        index.add(0b1011, 'a')
+
+        self.assertEqual(index.query(0b1011 ^ 0b111), ('a', 3))
+        self.assertIsNone(index.query(0b1011 ^ 0b1111))
+
+class TestDeduplicator(unittest.TestCase):
+    """Test the Deduplicator class functionality."""
+
+    def test_drops_near_duplicate_documents(self):
+        """Test the later copy of a near-identical document is dropped and reported."""
+        deduplicator = Deduplicator(threshold=0.9)
+        texts = [ARTICLE, ARTICLE.replace("many sources", "several sources"), "Another unrelated page."]
+
+        result = deduplicator.deduplicate(texts, ["v1", "v2", "other"])
+
+        self.assertEqual(result, [ARTICLE, "Another unrelated page."])
+        self.assertEqual([(r.kind, r.source, r.duplicate_of) for r in deduplicator.report], [('document', 'v2', 'v1')])
+        self.assertIn("1 duplicate documents", deduplicator.summary())
+
+    def test_drops_repeated_paragraphs(self):
+        """Test paragraphs repeated in a different document are removed, the rest is kept."""
+        deduplicator = Deduplicator()
+        first = f"# Intro\n\n{ARTICLE}"
+        second = ("# Changelog\n\nVersion two adds support for spreadsheets, YAML files and JSON Lines "
+                  f"exports from several tools.\n\n---\n\n{ARTICLE}")
+
+        result = deduplicator.deduplicate([first, second])
+
+        self.assertEqual(result[1], "# Changelog\n\nVersion two adds support for spreadsheets, YAML files "
+                                    "and JSON Lines exports from several tools.\n\n---")
+        self.assertEqual([r.kind for r in deduplicator.report], ['paragraph'])
+
+    def test_keeps_short_paragraphs(self):
+        """Test headings and short lines are kept even when they repeat."""
+        deduplicator = Deduplicator()
+        readme = "# Tool\n\n## Installation\n\npip install tool\n\n## License\n\nMIT\n\n## License\n\nMIT"
+
+        result = deduplicator.deduplicate([readme.replace("Tool", "First"), readme.replace("tool", "other")])
+
+        self.assertEqual(result[1], readme.replace("tool", "other"))
+        self.assertEqual(deduplicator.report, [])
+
+    def test_fenced_code_block_is_one_paragraph(self):
+        """Test a repeated code block is dropped whole, never leaving half a fence behind."""
+        deduplicator = Deduplicator()
+        usage = ("# Usage\n\nRun the command line tool with a sitemap, a list of files or a GitHub user "
+                 "and it writes the merged result to the output path you pass.")
+
+        result = deduplicator.deduplicate([ARTICLE, f"{usage}\n\n```text\n{ARTICLE}\n\nmore code here\n```"])
+
+        self.assertEqual(result[1], usage)
+
+    def test_invalid_threshold(self):
+        """Test thresholds outside (0, 1] are rejected."""
+        with self.assertRaises(ValueError):
+            Deduplicator(threshold=0)
+
+if __name__ == '__main__':
+    unittest.main()
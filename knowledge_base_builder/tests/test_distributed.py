@@ -0,0 +1,62 @@
+import os
+import tempfile
+import threading
+import unittest
+from knowledge_base_builder.benchmarks import FakeLLMClient, FixtureServer, SyntheticCorpus
+from knowledge_base_builder.distributed import DistributedKBBuilder, SQLiteTaskQueue, Worker
+
+class TestDistributedBuild(unittest.TestCase):
+    """Test the SQLite task queue and a coordinator with a worker."""
+
+    def test_queue_leases_retries_and_idempotent_put(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = SQLiteTaskQueue(os.path.join(tmp, "tasks.db"), lease_seconds=60, max_attempts=2)
+            key = queue.put('website', {'url': 'https://example.com'})
+            self.assertEqual(queue.put('website', {'url': 'https://example.com'}), key)
+            self.assertEqual(queue.counts(), {'queued': 1})
+
+            task = queue.claim('w1')
+            self.assertIsNone(queue.claim('w2'))
+            queue.fail(task, 'timeout')
+            task = queue.claim('w2')
+            self.assertEqual(task.attempts, 2)
+            queue.fail(task, 'timeout again')
+            self.assertEqual(queue.results([key])[key].status, 'failed')
+
+            # Putting a failed task again retries it
+            queue.put('website', {'url': 'https://example.com'})
+            task = queue.claim('w1')
+            queue.complete(task, 'text')
+            queue.complete(task, 'other text')
+            self.assertEqual(queue.wait([key])[key].result, 'text')
+
+            # A task whose lease ran out goes to the next worker
+            queue.lease_seconds = -1
+            queue.put('llm', {'prompt': 'x'})
+            abandoned = queue.claim('w1', kinds=['llm'])
+            self.assertEqual(queue.claim('w2').key, abandoned.key)
+
+    def test_coordinator_with_worker(self):
+        corpus = SyntheticCorpus(pages=4, pdfs=1, spreadsheets=1, github_files=2)
+        with FixtureServer(corpus) as fixtures, tempfile.TemporaryDirectory() as tmp:
+            queue = SQLiteTaskQueue(os.path.join(tmp, "tasks.db"))
+            config = {'GITHUB_API_URL': fixtures.github_api_url, 'QUEUE_POLL_SECONDS': 0.02}
+            worker = Worker(queue, config, llm_client=FakeLLMClient(latency=0.001, tokens_per_second=1e9))
+            thread = threading.Thread(target=worker.run, kwargs={'poll': 0.02})
+            thread.start()
+            try:
+                builder = DistributedKBBuilder(config, queue)
+                builder.build({'files': corpus.files(fixtures.url), 'sitemap_url': f"{fixtures.url}/sitemap.xml",
+                               'github_repositories': [fixtures.github_repository]}, os.path.join(tmp, "kb.md"))
+            finally:
+                worker.stop()
+                thread.join()
+
+            self.assertEqual(builder.metrics.counters['documents'], 8)
+            self.assertEqual(queue.counts(), {'done': worker.completed})
+            self.assertGreater(builder.usage.total['input_tokens'], 0)
+            with open(os.path.join(tmp, "kb.md"), encoding="utf-8") as f:
+                self.assertIn("Knowledge base", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
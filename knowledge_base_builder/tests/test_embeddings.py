@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from knowledge_base_builder.embeddings import EmbeddingIndex, EmbeddingIndexWriter, HashingEmbedder, load_embedder
+
+class TestEmbeddings(unittest.TestCase):
+    """Test the hashing embedder and the stored similarity index."""
+
+    def test_hashing_embedder(self):
+        embedder = HashingEmbedder(dimensions=64)
+        vectors = embedder.embed(["cache latency cache", "", "cache latency cache"])
+        self.assertEqual(vectors.shape, (3, 64))
+        self.assertFalse(vectors[1].any())
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+        self.assertIs(load_embedder(embedder), embedder)
+        self.assertIsInstance(load_embedder('hashing', 32), HashingEmbedder)
+        with self.assertRaises(ValueError):
+            load_embedder('no-such-embedder')
+
+    def test_index_roundtrip_and_query(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, "kb")
+            writer = EmbeddingIndexWriter(prefix, HashingEmbedder(dimensions=256))
+            writer.add(1, ["# Caching\n\nThe cache keeps responses in memory to cut latency.\n\n"
+                           "# Billing\n\nInvoices are sent to the account owner every month."], {"a": 10})
+            writer.add(2, ["# Workers\n\nThe queue hands jobs to worker threads."], {"b": 5, "c": 9})
+            vectors_path = writer.close()
+            self.assertFalse(os.path.exists(vectors_path + ".part"))
+
+            index = EmbeddingIndex(prefix)
+            self.assertEqual(len(index), 3)
+            self.assertIsInstance(index.vectors, np.memmap)
+            np.testing.assert_allclose(np.linalg.norm(index.vectors, axis=1), 1, rtol=1e-5)
+
+            results = index.query("invoices for the account", k=2)
+            self.assertEqual(len(results), 2)
+            self.assertEqual(results[0].heading_path, ["Billing"])
+            self.assertGreater(results[0].score, results[1].score)
+            self.assertEqual(index.query("worker queue", k=1)[0].sources, ["c", "b"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+from knowledge_base_builder.grouping import TopicGrouper, kmeans, tfidf
+from knowledge_base_builder.pipeline import StreamingPipeline
+
+CACHE = "cache eviction memory latency hit ratio cache keys expire "
+BILLING = "invoice payment billing account refund subscription price "
+
+class TestTopicGrouping(unittest.TestCase):
+    """Test k-means grouping and the grouped pipeline order."""
+
+    def test_kmeans_separates_topics(self):
+        vectors = tfidf([CACHE * 3, BILLING * 3, CACHE * 2 + "ttl", BILLING * 2 + "tax"])
+        labels = kmeans(vectors, 2)
+        self.assertEqual(labels[0], labels[2])
+        self.assertEqual(labels[1], labels[3])
+        self.assertNotEqual(labels[0], labels[1])
+
+    def test_grouped_pipeline_order(self):
+        seen = []
+
+        async def process(chunk, index, sources):
+            seen.append(list(sources))
+            return [chunk]
+
+        async def produce():
+            for i, text in enumerate([CACHE, BILLING, CACHE + "ttl", BILLING + "tax", CACHE + "lru"]):
+                await pipeline.put(text * 4, f"doc{i}")
+
+        grouper = TopicGrouper(clusters=2)
+        pipeline = StreamingPipeline(process, chunk_size=10000, workers=1, grouper=grouper)
+        asyncio.run(pipeline.run(produce))
+        self.assertEqual(grouper.groups, [["doc0", "doc2", "doc4"], ["doc1", "doc3"]])
+        self.assertEqual(seen, [["doc0", "doc2", "doc4", "doc1", "doc3"]])
+        self.assertEqual(pipeline.documents, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from knowledge_base_builder.html_cleaner import HTMLCleaner
+
+SAMPLE_HTML = """<!DOCTYPE html>
+<html>
+  <head><title>Page</title><style>body { color: red; }</style></head>
+  <body>
+    <nav><a href="/">Home</a> <a href="/docs">Docs</a></nav>
+    <h1>Main  Title</h1>
+    <p>Hello <b>world</b>,<br>second line &amp; more</p>
+    <ul><li>one</li><li>two<ul><li>nested</li></ul></li></ul>
+    <ol><li>first</li><li>second</li></ol>
+    <table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>x|y</td></tr></table>
+    <pre>code
+  indented</pre>
+    <script>console.log('test');</script>
+    <svg><path d="M0 0"/></svg>
+  </body>
+</html>
+"""
+
+EXPECTED_MARKDOWN = """# Main Title
+
+Hello world,
+second line & more
+
+- one
+- two
+  - nested
+1. first
+2. second
+
+| A | B |
+| --- | --- |
+| 1 | x\\|y |
+
+```
+code
+  indented
+```"""
+
+class TestHTMLCleaner(unittest.TestCase):
+    """Test the HTMLCleaner class functionality."""
+
+    def test_to_markdown_with_each_engine(self):
+        """Test every registered engine renders the same Markdown structure."""
+        for engine in HTMLCleaner._engines:
+            with self.subTest(engine=engine):
+                self.assertEqual(HTMLCleaner(engine).to_markdown(SAMPLE_HTML), EXPECTED_MARKDOWN)
+
+    def test_void_embed_does_not_swallow_page(self):
+        """Test content after a void <embed> survives with every engine."""
+        html = "<p>Intro</p><embed src=x.swf><p>After</p><h2>Next</h2>"
+        for engine in HTMLCleaner._engines:
+            with self.subTest(engine=engine):
+                self.assertEqual(HTMLCleaner(engine).to_markdown(html), "Intro\n\nAfter\n\n## Next")
+
+    def test_default_engine_prefers_lxml(self):
+        """Test lxml is picked when it is installed."""
+        self.assertEqual(HTMLCleaner().engine, 'lxml')
+
+    def test_unknown_engine(self):
+        """Test an unknown engine name is rejected."""
+        with self.assertRaises(ValueError):
+            HTMLCleaner('missing')
+
+    def test_register_engine(self):
+        """Test a custom engine can be plugged in."""
+        HTMLCleaner.register_engine('fake', lambda html: iter([
+            ('start', 'h2', {}), ('text', None, html), ('end', 'h2', None),
+        ]))
+        try:
+            self.assertEqual(HTMLCleaner('fake').to_markdown("Custom"), "## Custom")
+        finally:
+            del HTMLCleaner._engines['fake']
+
+    def test_empty_document(self):
+        """Test empty input produces empty output."""
+        self.assertEqual(HTMLCleaner().to_markdown(""), "")
+
+if __name__ == '__main__':
+    unittest.main()
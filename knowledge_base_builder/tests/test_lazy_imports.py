@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import unittest
+
+def _loaded_modules(statement: str) -> set:
+    """Top-level modules loaded by a fresh interpreter after running statement."""
+    code = f"{statement}\nimport sys\nprint(' '.join(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+class TestLazyImports(unittest.TestCase):
+    """Test heavy dependencies load only when they are used."""
+
+    def test_package_import_is_light(self):
+        """Test importing the package and KBBuilder loads no provider SDK or document library."""
+        loaded = _loaded_modules("from knowledge_base_builder import KBBuilder")
+        for heavy in ['langchain_google_genai', 'langchain_openai', 'langchain_anthropic', 'langchain',
+                      'pandas', 'docx', 'yaml', 'bs4', 'numpy']:
+            self.assertNotIn(heavy, loaded)
+
+    def test_public_api_is_intact(self):
+        """Test every name in __all__ still resolves."""
+        import knowledge_base_builder
+        for name in knowledge_base_builder.__all__:
+            self.assertTrue(callable(getattr(knowledge_base_builder, name)))
+        self.assertIn('KBBuilder', dir(knowledge_base_builder))
+        with self.assertRaises(AttributeError):
+            knowledge_base_builder.NoSuchThing
+
+if __name__ == '__main__':
+    unittest.main()
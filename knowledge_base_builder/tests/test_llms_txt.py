@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from knowledge_base_builder.llms_txt import LlmsTxtWriter, page_name
+from knowledge_base_builder.pipeline import StreamingPipeline
+
+class TestLlmsTxtWriter(unittest.TestCase):
+    """Test the LlmsTxtWriter class and the per-document pipeline mode."""
+
+    def test_pages_written_when_source_complete(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = LlmsTxtWriter(tmp, title="Docs", summary="Product docs.", base_url="https://example.com/kb")
+            guide = "https://example.com/docs/guide.html"
+            self.assertIsNone(writer.add(2, ["More guide text."], guide, [1, 2]))
+            page = writer.add(1, ["# Guide\n\nHow to *install* it."], guide, [1, 2])
+            self.assertEqual(page.title, "Guide")
+            self.assertEqual(page.description, "How to install it.")
+            writer.add(3, ["Notes without a heading."], "file:///data/release_notes.md", [3])
+            index_path = writer.close()
+
+            with open(index_path, encoding="utf-8") as f:
+                index = f.read()
+            self.assertTrue(index.startswith("# Docs\n\n> Product docs.\n\n## example.com\n"))
+            self.assertIn(f"- [Guide](https://example.com/kb/pages/{page_name(guide)}): How to install it.", index)
+            self.assertIn("## /data\n", index)
+            self.assertIn("- [release notes](", index)
+
+            with open(os.path.join(tmp, page.path), encoding="utf-8") as f:
+                self.assertEqual(f.read(), f"# Guide\n\n> Source: {guide}\n\nHow to *install* it.\n\nMore guide text.\n")
+            with open(os.path.join(tmp, "llms-full.txt"), encoding="utf-8") as f:
+                full = f.read()
+            self.assertLess(full.index("# Guide"), full.index("# release notes"))
+
+    def test_per_document_chunks(self):
+        seen = []
+
+        async def process(chunk, index, sources):
+            seen.append((index, chunk, sources))
+            return [chunk]
+
+        async def produce():
+            await pipeline.put("abcdefgh", "a")
+            await pipeline.put("xyz", "b")
+
+        pipeline = StreamingPipeline(process, chunk_size=5, workers=1, per_document=True)
+        asyncio.run(pipeline.run(produce))
+        self.assertEqual(seen, [(1, "abcde", {"a": 5}), (2, "fgh", {"a": 3}), (3, "xyz", {"b": 3})])
+        self.assertEqual(pipeline.document_chunks, {"a": [1, 2], "b": [3]})
+
+if __name__ == '__main__':
+    unittest.main()
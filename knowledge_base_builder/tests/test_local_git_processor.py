@@ -0,0 +1,73 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from knowledge_base_builder.benchmarks import FakeLLMClient
+from knowledge_base_builder.kb_builder import KBBuilder
+from knowledge_base_builder.local_git_processor import LocalGitProcessor
+
+class TestLocalGitProcessor(unittest.TestCase):
+    """Test the LocalGitProcessor class against a temporary repository."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.tmp.name, "repo")
+        os.mkdir(self.repo)
+        self._git("init", "-q")
+        self.first = self._commit({"README.md": "# Readme", "docs/guide.md": "# Guide", "src/main.py": "print()"})
+        self.second = self._commit({"docs/guide.md": "# Guide v2", "docs/new.rst": "New"}, remove=["README.md"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _git(self, *args, cwd=None):
+        return subprocess.run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+                              cwd=cwd or self.repo, check=True, capture_output=True, text=True).stdout.strip()
+
+    def _commit(self, files, remove=()):
+        for path, text in files.items():
+            full = os.path.join(self.repo, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "w", encoding="utf-8") as f:
+                f.write(text)
+        for path in remove:
+            self._git("rm", "-q", path)
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", "change")
+        return self._git("rev-parse", "HEAD")
+
+    def test_list_and_read(self):
+        processor = LocalGitProcessor(self.repo, rev=self.first)
+        files = processor.list_files()
+        self.assertEqual([file.path for file in files], ["README.md", "docs/guide.md"])
+        self.assertEqual([text for _, text in processor.read_files(files)], ["# Readme", "# Guide"])
+
+    def test_changes_since_commit_in_bare_repo(self):
+        bare = os.path.join(self.tmp.name, "bare.git")
+        self._git("clone", "-q", "--bare", self.repo, bare, cwd=self.tmp.name)
+        processor = LocalGitProcessor(bare)
+        self.assertEqual(processor.commit, self.second)
+        files, removed = processor.changed_files(self.first)
+        self.assertEqual([file.path for file in files], ["docs/guide.md", "docs/new.rst"])
+        self.assertEqual(removed, ["README.md"])
+        self.assertEqual(processor.changed_files(self.second), ([], []))
+
+    def test_builder_reads_repository(self):
+        builder = KBBuilder({'FILE_EXCLUDE': ['*.rst']}, llm_client=FakeLLMClient(latency=0, tokens_per_second=1e9))
+        builder.process_git_repos([{'path': self.repo, 'changed_since': self.first}])
+        self.assertEqual(builder.text_contents, ["# Guide v2"])
+        self.assertEqual(builder.git_commits, {self.repo: self.second})
+        self.assertEqual(builder.git_removed, {self.repo: ["README.md"]})
+
+    def test_delta_build_holds_only_changed_files(self):
+        client = FakeLLMClient(latency=0, tokens_per_second=1e9, output_ratio=10)
+        output = os.path.join(self.tmp.name, "delta.md")
+        KBBuilder({}, llm_client=client).build({'git_repositories': [{'path': self.repo, 'changed_since': self.first}]}, output)
+        with open(output, encoding="utf-8") as f:
+            kb = f.read()
+        self.assertIn("Guide v2", kb)
+        self.assertIn("New", kb)
+        self.assertNotIn("Readme", kb)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import unittest
+from knowledge_base_builder.compat import to_thread
+from knowledge_base_builder.metrics import Metrics, current_metrics, increment, percentile, span, use_metrics
+
+class TestMetrics(unittest.TestCase):
+    """Test the Metrics class functionality."""
+
+    def test_spans_nest_per_task(self):
+        """Test concurrent tasks keep their own parent chain."""
+        metrics = Metrics()
+
+        async def source(name):
+            with span('source', source=name):
+                await asyncio.sleep(0)
+                with span('download'):
+                    await asyncio.sleep(0)
+
+        async def run():
+            with span('build'):
+                await asyncio.gather(source('a'), source('b'))
+
+        with use_metrics(metrics):
+            asyncio.run(run())
+
+        paths = sorted(span.path for span in metrics.spans)
+        self.assertEqual(paths, ['build', 'build/source', 'build/source', 'build/source/download', 'build/source/download'])
+        self.assertEqual(metrics.stages()['download']['count'], 2)
+
+    def test_use_metrics_reaches_threads_and_restores(self):
+        """Test counters from copied contexts land in the run's metrics and the default is restored."""
+        metrics = Metrics()
+        default = current_metrics()
+        with use_metrics(metrics):
+            asyncio.run(to_thread(increment, 'bytes_fetched', 10))
+            thread = threading.Thread(target=increment, args=('ignored',))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(dict(metrics.counters), {'bytes_fetched': 10})
+        self.assertIs(current_metrics(), default)
+
+    def test_nothing_is_recorded_outside_a_run(self):
+        """Test spans and counters outside use_metrics are not kept anywhere."""
+        self.assertIsNone(current_metrics())
+        with span('idle') as idle:
+            increment('ignored')
+        self.assertIsNotNone(idle.duration)
+        self.assertIsNone(current_metrics())
+
+    def test_errors_are_recorded(self):
+        """Test a span that raises is still recorded with the exception type."""
+        metrics = Metrics()
+        with self.assertRaises(ValueError):
+            with metrics.span('extract'):
+                raise ValueError("bad file")
+
+        self.assertEqual(metrics.spans[0].error, 'ValueError')
+        self.assertIsNotNone(metrics.spans[0].duration)
+
+    def test_prometheus_export(self):
+        """Test the text export contains stage quantiles, counters and histograms."""
+        metrics = Metrics()
+        with metrics.span('chunk'):
+            pass
+        metrics.increment('llm_retries', 2)
+        metrics.observe('chunk_chars', 100)
+
+        text = metrics.to_prometheus()
+
+        self.assertIn('kb_stage_duration_seconds{stage="chunk",quantile="0.95"}', text)
+        self.assertIn('kb_stage_duration_seconds_count{stage="chunk"} 1', text)
+        self.assertIn('kb_llm_retries_total 2', text)
+        self.assertIn('kb_chunk_chars_sum 100', text)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from knowledge_base_builder.pipeline import StreamingPipeline
+
+class TestStreamingPipeline(unittest.TestCase):
+    """Test the StreamingPipeline class functionality."""
+
+    def test_chunks_match_batch_slicing(self):
+        """Test streamed chunks are exactly the slices of the joined documents."""
+        documents = ["a" * 7, "b" * 30, "", "c" * 3, "d" * 12]
+        seen = []
+        attributed = []
+
+        async def process_chunk(chunk, index, sources):
+            seen.append((index, chunk))
+            attributed.append((index, sources))
+            return [chunk.upper()]
+
+        async def produce():
+            for i, text in enumerate(documents):
+                await pipeline.put(text, f"doc{i}")
+
+        pipeline = StreamingPipeline(process_chunk, chunk_size=10, separator="|", queue_size=1, workers=3)
+        outputs = asyncio.run(pipeline.run(produce))
+
+        combined = "|".join(documents)
+        expected = [combined[i:i + 10] for i in range(0, len(combined), 10)]
+        self.assertEqual(outputs, [chunk.upper() for chunk in expected])
+        self.assertEqual(sorted(seen), list(enumerate(expected, 1)))
+        # Separators count for no source; the empty document contributes nothing
+        self.assertEqual(sorted(attributed), [
+            (1, {'doc0': 7, 'doc1': 2}),
+            (2, {'doc1': 10}),
+            (3, {'doc1': 10}),
+            (4, {'doc1': 8}),
+            (5, {'doc3': 3, 'doc4': 6}),
+            (6, {'doc4': 6}),
+        ])
+
+    def test_llm_overlaps_collection(self):
+        """Test chunks reach the LLM before the producer has finished."""
+        events = []
+
+        async def process_chunk(chunk, index, sources):
+            events.append(('llm', index))
+            return [chunk]
+
+        async def produce():
+            for i in range(3):
+                await pipeline.put("x" * 10, f"doc{i}")
+                await asyncio.sleep(0.01)
+                events.append(('fetched', i))
+
+        pipeline = StreamingPipeline(process_chunk, chunk_size=10, separator="", workers=1)
+        asyncio.run(pipeline.run(produce))
+
+        self.assertLess(events.index(('llm', 1)), events.index(('fetched', 2)))
+
+    def test_producer_error_propagates(self):
+        """Test a failing producer stops the pipeline instead of hanging it."""
+        async def process_chunk(chunk, index, sources):
+            return [chunk]
+
+        async def produce():
+            await pipeline.put("text", "doc")
+            raise RuntimeError("fetch failed")
+
+        pipeline = StreamingPipeline(process_chunk, chunk_size=10)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(pipeline.run(produce))
+
+    def test_worker_error_propagates(self):
+        """Test a chunk that fails to process stops the pipeline instead of hanging it."""
+        async def process_chunk(chunk, index, sources):
+            raise RuntimeError("write failed")
+
+        async def produce():
+            for i in range(50):
+                await pipeline.put("x" * 10, f"doc{i}")
+
+        pipeline = StreamingPipeline(process_chunk, chunk_size=10, queue_size=1, workers=2)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(asyncio.wait_for(pipeline.run(produce), timeout=10))
+
+if __name__ == '__main__':
+    unittest.main()
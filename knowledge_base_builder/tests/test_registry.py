@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from knowledge_base_builder.document_processor import DocumentProcessor
+from knowledge_base_builder.pdf_processor import PDFProcessor
+from knowledge_base_builder.registry import ProcessorRegistry, sniff_extension
+from knowledge_base_builder.spreadsheet_processor import SpreadsheetProcessor
+
+_RESPONSES = {
+    '/report': ('application/pdf', b'%PDF-1.4 ...'),
+    '/export': ('application/octet-stream', b'PK\x03\x04\x14\x00\x00\x00\x08\x00xl/workbook.xml'),
+    '/about': ('text/html; charset=utf-8', b'<html></html>'),
+}
+
+class _Handler(BaseHTTPRequestHandler):
+    def _respond(self, body: bool):
+        content_type, content = _RESPONSES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if body:
+            self.wfile.write(content)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestProcessorRegistry(unittest.TestCase):
+    """Test the ProcessorRegistry class functionality."""
+
+    def setUp(self):
+        self.registry = ProcessorRegistry()
+        self.registry.register('pdf', PDFProcessor())
+        self.registry.register('document', DocumentProcessor())
+        self.registry.register('spreadsheet', SpreadsheetProcessor())
+
+    def test_extension_and_mime_type(self):
+        """Test lookups by extension (ignoring query strings) and MIME type parameters."""
+        self.assertEqual(self.registry.for_path('https://example.com/a/Report.PDF?x=1').name, 'pdf')
+        self.assertEqual(self.registry.for_mime_type('text/csv; charset=utf-8').name, 'spreadsheet')
+        self.assertIsNone(self.registry.for_path('https://example.com/page'))
+
+    def test_later_registration_takes_over(self):
+        """Test a plugin registered for an extension replaces the built-in processor."""
+        self.registry.register('fast_csv', object(), extensions=['.csv'], mime_types={})
+        self.assertEqual(self.registry.for_extension('.csv').name, 'fast_csv')
+        self.assertEqual(self.registry.for_extension('.xlsx').name, 'spreadsheet')
+
+    def test_magic_bytes(self):
+        """Test file signatures, including telling Office ZIP containers apart."""
+        self.assertEqual(sniff_extension(b'%PDF-1.7'), '.pdf')
+        self.assertEqual(sniff_extension(b'PK\x03\x04....word/document.xml'), '.docx')
+        self.assertEqual(sniff_extension(b'PK\x03\x04....mimetypeapplication/vnd.oasis.opendocument.spreadsheet'), '.ods')
+        self.assertIsNone(sniff_extension(b'plain text'))
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b'%PDF-1.4 body')
+        try:
+            self.assertEqual(self.registry.detect(f'file://{f.name}').name, 'pdf')
+        finally:
+            os.unlink(f.name)
+
+    def test_detect_remote(self):
+        """Test extension-less URLs are routed by Content-Type, then by their first bytes."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            self.assertEqual(self.registry.detect(f'{base}/report').name, 'pdf')
+            self.assertEqual(self.registry.detect(f'{base}/export').name, 'spreadsheet')
+            self.assertIsNone(self.registry.detect(f'{base}/about'))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
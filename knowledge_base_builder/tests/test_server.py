@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from knowledge_base_builder.benchmarks import FakeLLMClient, FixtureServer, SyntheticCorpus
+from knowledge_base_builder.server import BuildServer, Job, JobQueue
+
+class _RecordingBuilder:
+    """Stand-in builder that records build order and blocks until released."""
+
+    def __init__(self, order, release):
+        self.order = order
+        self.release = release
+        self.llm_client = None
+
+    def build(self, sources, output_file):
+        self.order.append(output_file)
+        self.release.wait(5)
+
+class TestBuildServer(unittest.TestCase):
+    """Test the job queue and the build service API."""
+
+    def test_priority_and_tenant_limit(self):
+        order, release = [], threading.Event()
+        queue = JobQueue(lambda *args: _RecordingBuilder(order, release), workers=2, tenant_limit=1)
+        jobs = [queue.submit(Job({'files': ['x']}, name, tenant, priority))
+                for name, tenant, priority in [('cancelled', 'a', 9), ('low', 'b', 0), ('high', 'a', 5), ('mid', 'a', 1)]]
+        self.assertTrue(queue.cancel(jobs[0].id))
+        queue.start()
+        while len(order) < 2:
+            jobs[1].wait_events(len(jobs[1].events) - 1, 0.1)
+        # The second worker skips tenant a's next job while its first one runs
+        self.assertEqual(sorted(order), ['high', 'low'])
+        release.set()
+        for job in jobs[1:]:
+            while not job.done:
+                job.wait_events(len(job.events) - 1, 1)
+        queue.stop()
+        self.assertEqual(order[2:], ['mid'])
+        self.assertEqual(jobs[0].status, 'cancelled')
+
+    def test_job_over_http(self):
+        client = FakeLLMClient(latency=0.001, tokens_per_second=1e9)
+        with FixtureServer(SyntheticCorpus(pages=0, pdfs=1, spreadsheets=1, github_files=0)) as fixtures, \
+                tempfile.TemporaryDirectory() as tmp, BuildServer({}, output_dir=tmp, llm_client=client) as server:
+            server.start(port=0)
+
+            def request(method, path, body=None):
+                data = json.dumps(body).encode('utf-8') if body is not None else None
+                with urllib.request.urlopen(urllib.request.Request(server.address + path, data, method=method)) as r:
+                    return r.read().decode('utf-8')
+
+            job = json.loads(request('POST', '/jobs', {'sources': {'files': fixtures.corpus.files(fixtures.url)},
+                                                      'output_file': 'kb.md', 'config': {'MAX_COST': 1}}))
+            events = [json.loads(line) for line in request('GET', f"/jobs/{job['id']}/events?follow=1").splitlines()]
+            self.assertEqual(events[-1], {**events[-1], 'type': 'status', 'message': 'succeeded'})
+            self.assertTrue(any('Final KB written' in event['message'] for event in events))
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'kb.md')))
+
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                request('POST', '/jobs', {'sources': {'files': ['a.pdf']}, 'output_file': '../escape.md'})
+            self.assertEqual(error.exception.code, 400)
+            for build_id in ('/tmp/escaped', '../other', 'a/b'):
+                with self.assertRaises(urllib.error.HTTPError) as error:
+                    request('POST', '/jobs', {'sources': {'files': ['a.pdf']}, 'config': {'BUILD_ID': build_id}})
+                self.assertEqual(error.exception.code, 400)
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                request('GET', f"/jobs/{job['id']}/events?after=x")
+            self.assertEqual(error.exception.code, 400)
+
+    def test_build_id_is_scoped_to_tenant(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            server = BuildServer({}, output_dir=tmp, llm_client=FakeLLMClient())
+            job = server.create_job({'sources': {'files': ['a.pdf']}, 'tenant': 'team-a', 'config': {'BUILD_ID': 'nightly'}})
+            self.assertEqual(job.config['BUILD_ID'], 'team-a.nightly')
+
+    def test_delta_build_needs_output_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            server = BuildServer({}, output_dir=tmp, llm_client=FakeLLMClient())
+            sources = {'git_repositories': [{'path': tmp, 'changed_since': 'v1'}]}
+            with self.assertRaises(ValueError):
+                server.create_job({'sources': sources})
+            self.assertEqual(server.create_job({'sources': sources, 'output_file': 'delta.md'}).output_file,
+                             os.path.join(tmp, 'delta.md'))
+
+if __name__ == '__main__':
+    unittest.main()
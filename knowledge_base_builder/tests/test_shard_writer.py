@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+from knowledge_base_builder.shard_writer import ShardedKB, ShardedKBWriter
+
+def _chunk(i: int) -> str:
+    return f"# Topic {i}\n\n" + f"Details about topic {i}. " * 20 + f"\n\n## Notes {i}\n\nMore on {i}."
+
+class TestShardedKBWriter(unittest.TestCase):
+    """Test the ShardedKBWriter and ShardedKB classes."""
+
+    def _roundtrip(self, compression):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = ShardedKBWriter(tmp, max_shard_bytes=1500, compression=compression, frame_bytes=700)
+            for i in range(10):
+                writer.add(_chunk(i), {f"https://example.com/{i}": 100})
+            writer.close()
+            self.assertGreater(len(writer.shards), 1)
+            self.assertTrue(all(shard['raw_bytes'] <= 1500 for shard in writer.shards))
+
+            with ShardedKB(tmp) as kb:
+                entry = next(kb.find('Notes 7'))
+                self.assertEqual(entry['heading_path'], ['Topic 7', 'Notes 7'])
+                self.assertEqual(kb.read(entry), "## Notes 7\n\nMore on 7.\n\n")
+                texts = [kb.read(entry) for entry in kb.sections]
+                self.assertEqual(len(texts), 20)
+                self.assertTrue(texts[0].startswith("# Topic 0"))
+                self.assertEqual([e['heading_path'] for e in kb.for_source("https://example.com/3")],
+                                 [['Topic 3'], ['Topic 3', 'Notes 3']])
+
+    def test_uncompressed(self):
+        """Test plain shards can be read section by section through the index."""
+        self._roundtrip(None)
+
+    def test_gzip(self):
+        """Test gzip shards are readable one member at a time."""
+        self._roundtrip("gzip")
+
+    def test_zstd(self):
+        """Test zstd shards are readable one frame at a time."""
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            self.skipTest("zstandard is not installed")
+        self._roundtrip("zstd")
+
+    def test_shards_by_source(self):
+        """Test a new shard starts when the main source moves to another host."""
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = ShardedKBWriter(tmp, by_source=True)
+            writer.add(_chunk(0), {"https://a.com/x": 10})
+            writer.add(_chunk(1), {"https://a.com/y": 10, "https://b.com/z": 2})
+            writer.add(_chunk(2), {"https://b.com/z": 10})
+            index_path = writer.close()
+            with open(index_path, encoding='utf-8') as f:
+                index = json.load(f)
+        self.assertEqual([shard['sections'] for shard in index['shards']], [4, 2])
+        self.assertEqual(index['sources']['https://b.com/z'], [0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
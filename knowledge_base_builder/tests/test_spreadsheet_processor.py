@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from knowledge_base_builder.spreadsheet_processor import SpreadsheetProcessor
+
+ODS_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content
+    xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:spreadsheet>
+      <table:table table:name="People">
+        <table:table-column table:number-columns-repeated="1024"/>
+        <table:table-row>
+          <table:table-cell office:value-type="string"><text:p>Name</text:p></table:table-cell>
+          <table:table-cell office:value-type="string"><text:p>Age</text:p></table:table-cell>
+          <table:table-cell table:number-columns-repeated="1022"/>
+        </table:table-row>
+        <table:table-row table:number-rows-repeated="2">
+          <table:table-cell office:value-type="string"><text:p>Ada<text:s text:c="2"/>L</text:p></table:table-cell>
+          <table:table-cell office:value-type="float" office:value="36"><text:p>36</text:p></table:table-cell>
+        </table:table-row>
+        <table:table-row table:number-rows-repeated="3">
+          <table:table-cell table:number-columns-repeated="1024"/>
+        </table:table-row>
+        <table:table-row>
+          <table:table-cell office:value-type="string"><text:p>Bob</text:p></table:table-cell>
+          <table:table-cell table:number-columns-repeated="2" office:value-type="float" office:value="1"/>
+        </table:table-row>
+        <table:table-row table:number-rows-repeated="1048570">
+          <table:table-cell table:number-columns-repeated="1024"/>
+        </table:table-row>
+      </table:table>
+      <table:table table:name="Empty">
+        <table:table-row table:number-rows-repeated="1048576">
+          <table:table-cell table:number-columns-repeated="1024"/>
+        </table:table-row>
+      </table:table>
+    </office:spreadsheet>
+  </office:body>
+</office:document-content>
+"""
+
+class TestSpreadsheetProcessor(unittest.TestCase):
+    """Test the SpreadsheetProcessor class functionality."""
+
+    def setUp(self):
+        """Write a small .ods archive with repeated rows/columns and an empty sheet."""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".ods")
+        temp_file.close()
+        self.ods_path = temp_file.name
+        with zipfile.ZipFile(self.ods_path, 'w') as archive:
+            archive.writestr('mimetype', 'application/vnd.oasis.opendocument.spreadsheet')
+            archive.writestr('content.xml', ODS_CONTENT)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        if os.path.exists(self.ods_path):
+            os.unlink(self.ods_path)
+
+    def test_iter_ods_sheets_expands_repeats_lazily(self):
+        """Test that repeated rows/cells are expanded and trailing padding is dropped."""
+        sheets = list(SpreadsheetProcessor._iter_ods_sheets(self.ods_path))
+
+        self.assertEqual([name for name, _ in sheets], ["People", "Empty"])
+        people = sheets[0][1]
+        self.assertEqual(people[0], ["Name", "Age"])
+        self.assertEqual(people[1], ["Ada  L", 36.0])
+        self.assertEqual(people[2], ["Ada  L", 36.0])
+        self.assertEqual(people[3:6], [[], [], []])
+        self.assertEqual(people[6], ["Bob", 1.0, 1.0])
+        self.assertEqual(len(people), 7)
+        self.assertEqual(sheets[1][1], [])
+
+    def test_extract_text_from_ods(self):
+        """Test converting an .ods file to markdown, skipping empty sheets."""
+        text = SpreadsheetProcessor.extract_text(self.ods_path)
+
+        self.assertIn("## Sheet: People", text)
+        self.assertTrue(text.split("\n")[2].startswith("| Name | Age |"))
+        self.assertIn("| Bob | 1.0 | 1.0 |", text)
+        self.assertNotIn("## Sheet: Empty", text)
+
+    def test_ods_number_without_value_uses_text(self):
+        """Test a numeric cell missing office:value falls back to its text instead of failing."""
+        cell = ET.fromstring(
+            '<table:table-cell xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+            'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+            'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+            'office:value-type="currency"><text:p>$12.50</text:p></table:table-cell>'
+        )
+
+        self.assertEqual(SpreadsheetProcessor._ods_cell_value(cell), "$12.50")
+
+if __name__ == '__main__':
+    unittest.main()
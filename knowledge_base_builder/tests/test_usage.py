@@ -0,0 +1,40 @@
+import unittest
+from knowledge_base_builder.usage import UsageTracker, attribute_usage, record_usage, use_tracker
+
+class TestUsageTracker(unittest.TestCase):
+    """Test the UsageTracker class functionality."""
+
+    def test_prices_match_longest_prefix(self):
+        """Test dated model names use the most specific listed price."""
+        tracker = UsageTracker(prices={'gpt-4o': (2.0, 8.0), 'gpt-4o-mini': (0.2, 0.8)})
+        self.assertEqual(tracker.price('gpt-4o-mini-2024-07-18'), (0.2, 0.8))
+        self.assertAlmostEqual(tracker.cost('gpt-4o-2024-08-06', 1_000_000, 500_000), 6.0)
+        self.assertEqual(tracker.cost('unknown-model', 1000, 1000), 0.0)
+        self.assertIn('unknown-model', tracker.unpriced_models)
+
+    def test_usage_is_split_between_sources(self):
+        """Test a call is attributed to its stage and split by source weight."""
+        tracker = UsageTracker(prices={'model': (1.0, 1.0)})
+        with use_tracker(tracker), attribute_usage('chunk', {'a.pdf': 3, 'b.pdf': 1}):
+            record_usage('model', 800, 200)
+        report = tracker.report()
+        self.assertEqual(report['total']['calls'], 1)
+        self.assertEqual(report['by_stage']['chunk']['input_tokens'], 800)
+        self.assertEqual(report['by_source']['a.pdf']['input_tokens'], 600)
+        self.assertAlmostEqual(report['by_source']['b.pdf']['cost'], 0.00025)
+        self.assertEqual(list(report['by_source']), ['a.pdf', 'b.pdf'])
+
+    def test_budget(self):
+        """Test the budget is reported as exceeded once tokens or cost reach the limit."""
+        tracker = UsageTracker(prices={'model': (1.0, 1.0)}, max_tokens=1000)
+        tracker.record('model', 600, 300)
+        self.assertIsNone(tracker.exceeded)
+        tracker.record('model', 100, 0)
+        self.assertIn('token budget', tracker.exceeded)
+
+    def test_record_without_tracker_is_noop(self):
+        """Test usage recorded outside a build is ignored."""
+        record_usage('model', 10, 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from knowledge_base_builder.benchmarks import FakeLLMClient
+from knowledge_base_builder.kb_builder import KBBuilder
+from knowledge_base_builder.walker import FileWalker, PathPattern, split_glob
+
+class TestWalker(unittest.TestCase):
+    """Test the FileWalker class and directory and glob file sources."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for path, text in {
+            ".gitignore": "build/\n*.log\n!keep.log\n",
+            "README.md": "# Readme",
+            "docs/a.md": "# A",
+            "docs/b.txt": "B",
+            "docs/api/c.md": "# C",
+            "docs/api/.gitignore": "/draft.md\n",
+            "docs/api/draft.md": "# Draft",
+            "docs/big.md": "x" * 4096,
+            "build/out.md": "# Built",
+            "debug.log": "noise",
+            "keep.log": "kept",
+            ".git/HEAD": "ref",
+            "image.bin": "binary",
+        }.items():
+            full = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "w", encoding="utf-8") as f:
+                f.write(text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _walk(self, source, **options):
+        return [os.path.relpath(path, self.root).replace(os.sep, '/')
+                for path in FileWalker(**options).walk(os.path.join(self.root, source))]
+
+    def test_gitignore_and_order(self):
+        # Files of a directory come before its subdirectories, each in name order
+        self.assertEqual(self._walk(""), [
+            ".gitignore", "README.md", "image.bin", "keep.log",
+            "docs/a.md", "docs/b.txt", "docs/big.md", "docs/api/.gitignore", "docs/api/c.md",
+        ])
+        self.assertIn("build/out.md", self._walk("", gitignore=False))
+
+    def test_filters(self):
+        self.assertEqual(self._walk("docs/**/*.md"), ["docs/a.md", "docs/big.md", "docs/api/c.md"])
+        # Without ** a glob does not descend into subdirectories
+        self.assertEqual(self._walk("docs/*.md"), ["docs/a.md", "docs/big.md"])
+        self.assertEqual(self._walk("*.md"), ["README.md"])
+        self.assertEqual(self._walk("docs", extensions=[".md"], exclude=["api"], max_bytes=1024), ["docs/a.md"])
+        self.assertEqual(self._walk("", include=["docs/*"], exclude=["*.txt"]), ["docs/a.md", "docs/big.md"])
+        self.assertEqual(split_glob("./docs/**/*.md"), ("./docs", "**/*.md"))
+        self.assertTrue(PathPattern("**/api/*.md").match("docs/api/c.md"))
+        self.assertFalse(PathPattern("docs/*.md").match("docs/api/c.md"))
+
+    def test_directory_source(self):
+        client = FakeLLMClient(latency=0, tokens_per_second=1e9)
+        builder = KBBuilder({'FILE_EXCLUDE': ['big.md']}, llm_client=client)
+        asyncio.run(builder.process_files_async([os.path.join(self.root, "docs")]))
+        self.assertEqual(builder.text_contents, ["# A", "B", "# C"])
+
+    def test_files_in_flight_are_bounded(self):
+        client = FakeLLMClient(latency=0, tokens_per_second=1e9)
+        builder = KBBuilder({'FILES_IN_FLIGHT': 2}, llm_client=client)
+        pending = []
+        run_in_slot = builder._run_in_slot
+
+        async def recording_run_in_slot(slot, url, task):
+            pending.append(builder._collector.pending)
+            await run_in_slot(slot, url, task)
+
+        builder._run_in_slot = recording_run_in_slot
+        asyncio.run(builder.process_files_async([self.root]))
+        self.assertEqual(len(builder.text_contents), 5)
+        self.assertLessEqual(max(pending), 2)
+
+if __name__ == '__main__':
+    unittest.main()
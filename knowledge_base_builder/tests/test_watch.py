@@ -0,0 +1,64 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from knowledge_base_builder.benchmarks import FakeLLMClient
+from knowledge_base_builder.kb_builder import KBBuilder
+from knowledge_base_builder.watch import FileWatcher, KBWatcher
+
+class TestWatch(unittest.TestCase):
+    """Test the FileWatcher and KBWatcher classes."""
+
+    def _write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # Coarse filesystem timestamps could otherwise hide the change
+        stamp = time.time() + len(text)
+        os.utime(path, (stamp, stamp))
+
+    def test_file_watcher(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self._write(os.path.join(tmp, "a.md"), "alpha")
+            self._write(os.path.join(tmp, "skip.bin"), "binary")
+            watcher = FileWatcher([tmp], [".md"], debounce=0.01)
+            self.assertEqual(watcher.files(), [os.path.join(tmp, "a.md")])
+            self.assertIsNone(watcher.poll())
+
+            # Same content with a new timestamp is not a change
+            os.utime(os.path.join(tmp, "a.md"), (1, 1))
+            self.assertIsNone(watcher.poll())
+
+            self._write(os.path.join(tmp, "a.md"), "alpha 2")
+            self._write(os.path.join(tmp, "b.md"), "beta")
+            changes = watcher.poll()
+            self.assertEqual(changes.modified, [os.path.join(tmp, "a.md")])
+            self.assertEqual(changes.added, [os.path.join(tmp, "b.md")])
+
+            os.remove(os.path.join(tmp, "a.md"))
+            self.assertEqual(watcher.poll().removed, [os.path.join(tmp, "a.md")])
+
+    def test_only_changed_files_are_summarized(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = os.path.join(tmp, "docs")
+            os.mkdir(docs)
+            self._write(os.path.join(docs, "a.md"), "# Alpha\n\nFirst document.")
+            self._write(os.path.join(docs, "b.md"), "# Beta\n\nSecond document.")
+            client = FakeLLMClient(latency=0, tokens_per_second=1e9)
+            output = os.path.join(tmp, "kb.md")
+            watcher = KBWatcher(KBBuilder({}, llm_client=client), [docs], output, debounce=0.01)
+
+            asyncio.run(watcher.update(watcher.watcher.files()))
+            self.assertEqual(client.calls, 2)
+            self._write(os.path.join(docs, "b.md"), "# Beta\n\nSecond document, edited.")
+            changes = watcher.watcher.poll()
+            asyncio.run(watcher.update(changes.modified + changes.added, changes.removed))
+            self.assertEqual(client.calls, 3)
+
+            with open(output, encoding="utf-8") as f:
+                kb = f.read()
+            self.assertEqual(kb, "\n\n".join(watcher.sections[path] for path in sorted(watcher.sections)))
+            self.assertFalse(os.path.exists(output + ".tmp"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import tempfile
+import io
+from knowledge_base_builder import json_stream
+from knowledge_base_builder.web_content_processor import WebContentProcessor
+
+class TestWebContentProcessor(unittest.TestCase):
+    """Test the WebContentProcessor class functionality."""
+
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.temp_files = []
+
+    def tearDown(self):
+        """Clean up after tests."""
+        for path in self.temp_files:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _write(self, suffix: str, content: str) -> str:
+        temp_file = tempfile.NamedTemporaryFile('w', delete=False, suffix=suffix, encoding='utf-8')
+        temp_file.write(content)
+        temp_file.close()
+        self.temp_files.append(temp_file.name)
+        return temp_file.name
+
+    def test_extract_from_xml(self):
+        """Test XML is formatted as indented tag/text lines."""
+        path = self._write(".xml", '<root id="1">hello<child k="v">inner</child><empty/></root>')
+
+        text = WebContentProcessor.extract_text(path)
+
+        self.assertEqual(text, 'root [id="1"]\n  hello\n  child [k="v"]\n    inner\n  empty')
+
+    def test_extract_from_deep_xml(self):
+        """Test deeply nested XML does not hit the recursion limit."""
+        depth = 5000
+        path = self._write(".xml", "<n>" * depth + "leaf" + "</n>" * depth)
+
+        lines = list(WebContentProcessor._iter_xml_lines(path))
+
+        self.assertEqual(len(lines), depth + 1)
+        self.assertEqual(lines[-1], "  " * depth + "leaf")
+
+    def test_extract_from_invalid_xml_falls_back_to_raw(self):
+        """Test unparseable XML falls back to the raw file content."""
+        path = self._write(".xml", "<root><open></root>")
+
+        self.assertEqual(WebContentProcessor.extract_text(path), "<root><open></root>")
+
+    def test_extract_from_json_streams_small_buffers(self):
+        """Test the incremental JSON walker matches the layout regardless of buffer size."""
+        document = '{"name": "kb", "tags": ["a", {"k": 1.5}], "meta": {"ok": true, "none": null}}'
+        expected = "name: kb\ntags:\n  a\n  k: 1.5\nmeta:\n  ok: True\n  none: None"
+
+        for buffer_size in (1, 4, 1024):
+            events = json_stream.iter_json_events(io.StringIO(document), buffer_size=buffer_size)
+            self.assertEqual('\n'.join(json_stream.iter_formatted_lines(events)), expected)
+        self.assertEqual(WebContentProcessor.extract_text(self._write(".json", document)), expected)
+
+    def test_json_stream_rejects_invalid_json(self):
+        """Test malformed JSON that json.load rejects also fails the incremental walker."""
+        for document in ('{"a" 1}', '[1 2]', '{"a":1,}', '[,1]', '{1:2}', '[1,]', '{"a":}', '1 2', '', '[1'):
+            for buffer_size in (1, 1024):
+                with self.subTest(document=document, buffer_size=buffer_size):
+                    with self.assertRaises(ValueError):
+                        list(json_stream.iter_json_events(io.StringIO(document), buffer_size=buffer_size))
+
+    def test_json_stream_reads_nan_and_infinity(self):
+        """Test the non-standard constants json.load accepts also stream across buffers."""
+        document = '{"a": NaN, "b": [Infinity, -Infinity], "c": -1}'
+        expected = "a: nan\nb:\n  inf\n  -inf\nc: -1"
+
+        for buffer_size in (1, 4, 1024):
+            events = json_stream.iter_json_events(io.StringIO(document), buffer_size=buffer_size)
+            self.assertEqual('\n'.join(json_stream.iter_formatted_lines(events)), expected)
+
+    def test_extract_from_jsonl(self):
+        """Test JSON Lines files are formatted record by record, skipping bad lines."""
+        path = self._write(".jsonl", '{"id": 1, "t": "a"}\n\nnot json\n{"id": 2, "t": "b"}\n')
+
+        self.assertEqual(WebContentProcessor.extract_text(path), "id: 1\nt: a\nid: 2\nt: b")
+
+    def test_iter_jsonl_chunks(self):
+        """Test JSON Lines records are batched without splitting a record."""
+        path = self._write(".ndjson", "".join(f'{{"id": {i}}}\n' for i in range(10)))
+
+        chunks = list(WebContentProcessor.iter_jsonl_chunks(path, chunk_size=12))
+
+        self.assertEqual(chunks[0], "id: 0\nid: 1")
+        self.assertEqual(len(chunks), 5)
+
+    def test_extract_from_multi_document_yaml(self):
+        """Test every document of a YAML stream is formatted, skipping empty ones."""
+        path = self._write(".yaml", "kind: Service\nports:\n  - 80\n---\n---\nkind: Deployment\nspec:\n  replicas: 2\n")
+
+        text = WebContentProcessor.extract_text(path)
+
+        self.assertEqual(text, "kind: Service\nports:\n  - 80\n---\nkind: Deployment\nspec:\n  replicas: 2")
+
+if __name__ == '__main__':
+    unittest.main()
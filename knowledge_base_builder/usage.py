@@ -0,0 +1,156 @@
+import contextvars
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from knowledge_base_builder.metrics import increment
+
+# USD per million (input, output) tokens. Dated or suffixed model names match
+# the longest listed prefix, e.g. "gpt-4o-2024-08-06" uses the "gpt-4o" price.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    'gemini-2.0-flash-lite': (0.075, 0.30),
+    'gemini-2.0-flash': (0.10, 0.40),
+    'gemini-1.5-flash': (0.075, 0.30),
+    'gemini-1.5-pro': (1.25, 5.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1': (2.00, 8.00),
+    'o3-mini': (1.10, 4.40),
+    'claude-3-7-sonnet': (3.00, 15.00),
+    'claude-3-5-sonnet': (3.00, 15.00),
+    'claude-3-5-haiku': (0.80, 4.00),
+    'claude-3-opus': (15.00, 75.00),
+    'claude-3-haiku': (0.25, 1.25),
+}
+
+def _empty() -> Dict[str, float]:
+    return {'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0}
+
+class UsageTracker:
+    """
+    Token and cost accounting for one build, with an optional budget.
+
+    Every LLM response is recorded once with its model and token counts and
+    aggregated in total, per model, per stage and per source. When a call
+    covers text from several sources (a chunk mixes documents) its usage is
+    split between them in proportion to the characters each contributed.
+    """
+
+    def __init__(
+        self,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_cost: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        self.prices = dict(MODEL_PRICES, **(prices or {}))
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.total = _empty()
+        self.by_model: Dict[str, Dict[str, float]] = defaultdict(_empty)
+        self.by_stage: Dict[str, Dict[str, float]] = defaultdict(_empty)
+        self.by_source: Dict[str, Dict[str, float]] = defaultdict(_empty)
+        self.unpriced_models: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def price(self, model: str) -> Optional[Tuple[float, float]]:
+        """(input, output) USD per million tokens for a model, by longest matching prefix."""
+        matches = [name for name in self.prices if model.startswith(name)]
+        return self.prices[max(matches, key=len)] if matches else None
+
+    def cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """USD cost of one call; 0 for models without a known price."""
+        price = self.price(model)
+        if price is None:
+            if model not in self.unpriced_models:
+                self.unpriced_models.add(model)
+                print(f"⚠️ No price known for model {model}; its cost is counted as 0")
+            return 0.0
+        return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+    def record(self, model: str, input_tokens: int, output_tokens: int,
+               stage: str = 'other', sources: Optional[Dict[str, float]] = None) -> float:
+        """Record one LLM call and return its cost."""
+        cost = self.cost(model, input_tokens, output_tokens)
+        with self._lock:
+            for bucket in (self.total, self.by_model[model], self.by_stage[stage]):
+                bucket['calls'] += 1
+                bucket['input_tokens'] += input_tokens
+                bucket['output_tokens'] += output_tokens
+                bucket['cost'] += cost
+
+            weights = sources or {}
+            total_weight = sum(weights.values())
+            for source, weight in weights.items():
+                share = weight / total_weight if total_weight else 1 / len(weights)
+                bucket = self.by_source[source]
+                bucket['calls'] += share
+                bucket['input_tokens'] += input_tokens * share
+                bucket['output_tokens'] += output_tokens * share
+                bucket['cost'] += cost * share
+
+        increment('llm_cost_usd', cost)
+        return cost
+
+    @property
+    def exceeded(self) -> Optional[str]:
+        """Description of the exhausted budget, or None while there is budget left."""
+        tokens = self.total['input_tokens'] + self.total['output_tokens']
+        if self.max_tokens is not None and tokens >= self.max_tokens:
+            return f"token budget of {self.max_tokens} reached ({int(tokens)} tokens used)"
+        if self.max_cost is not None and self.total['cost'] >= self.max_cost:
+            return f"cost budget of ${self.max_cost:.2f} reached (${self.total['cost']:.4f} spent)"
+        return None
+
+    def report(self) -> Dict[str, Any]:
+        """Usage totals and breakdowns as a JSON-serializable dict."""
+        def rounded(bucket: Dict[str, float]) -> Dict[str, float]:
+            return {key: round(value, 6) for key, value in bucket.items()}
+        return {
+            'total': rounded(self.total),
+            'by_model': {name: rounded(bucket) for name, bucket in self.by_model.items()},
+            'by_stage': {name: rounded(bucket) for name, bucket in self.by_stage.items()},
+            'by_source': {name: rounded(bucket) for name, bucket in
+                          sorted(self.by_source.items(), key=lambda item: -item[1]['cost'])},
+            'budget': {'max_cost': self.max_cost, 'max_tokens': self.max_tokens, 'exceeded': self.exceeded},
+        }
+
+    def summary(self) -> str:
+        """One-line description of the build's LLM usage."""
+        total = self.total
+        return (f"{total['calls']} calls, {int(total['input_tokens'])} input / "
+                f"{int(total['output_tokens'])} output tokens, ${total['cost']:.4f}")
+
+_current_tracker: contextvars.ContextVar = contextvars.ContextVar('current_usage_tracker', default=None)
+_current_attribution: contextvars.ContextVar = contextvars.ContextVar('current_usage_attribution', default=('other', None))
+
+@contextmanager
+def use_tracker(tracker: UsageTracker) -> Iterator[UsageTracker]:
+    """Record LLM usage in this context into tracker."""
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+
+@contextmanager
+def attribute_usage(stage: str, sources: Optional[Dict[str, float]] = None) -> Iterator[None]:
+    """Attribute LLM calls made in this context to a stage and to sources weighted by size."""
+    token = _current_attribution.set((stage, sources))
+    try:
+        yield
+    finally:
+        _current_attribution.reset(token)
+
+def current_tracker() -> Optional[UsageTracker]:
+    """The usage tracker of the build in the current context, if any."""
+    return _current_tracker.get()
+
+def record_usage(model: str, input_tokens: int, output_tokens: int) -> None:
+    """Record one call in the current tracker under the current attribution."""
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        stage, sources = _current_attribution.get()
+        tracker.record(model, input_tokens, output_tokens, stage, sources)
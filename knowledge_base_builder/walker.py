@@ -0,0 +1,219 @@
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple
+
+_MAGIC = re.compile(r'[*?[]')
+
+# Version control metadata is never a document
+SKIPPED_DIRECTORIES = {'.git', '.hg', '.svn'}
+
+def has_magic(path: str) -> bool:
+    """Whether a path is a glob pattern."""
+    return _MAGIC.search(path) is not None
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Regex source for a glob over '/'-separated relative paths: `*` and `?` stay
+    within one path component, `**` spans any number of them and `[...]` is a
+    character class (`[!...]` negated).
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[' and (end := pattern.find(']', i + 2)) != -1:
+            body = pattern[i + 1:end]
+            out.append('[' + ('^' + body[1:] if body.startswith('!') else body).replace('\\', '\\\\') + ']')
+            i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return ''.join(out)
+
+class PathPattern:
+    """An include/exclude glob: with a '/' it matches the relative path, otherwise any file name."""
+
+    def __init__(self, pattern: str):
+        pattern = pattern.replace(os.sep, '/')
+        if pattern.startswith('./'):
+            pattern = pattern[2:]
+        self.pattern = pattern
+        prefix = '' if '/' in pattern else '(?:.*/)?'
+        self.regex: Pattern = re.compile(f"^{prefix}{glob_to_regex(pattern)}$")
+
+    def match(self, relative: str) -> bool:
+        return self.regex.match(relative) is not None
+
+class IgnoreRule(NamedTuple):
+    """One line of a .gitignore file."""
+    base: str        # directory of the .gitignore
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+
+def parse_gitignore(text: str, base: str) -> List[IgnoreRule]:
+    """Rules of a .gitignore file in the directory base."""
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate or line.startswith('\\'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+        anchored = '/' in line
+        line = line.lstrip('/')
+        prefix = '' if anchored else '(?:.*/)?'
+        rules.append(IgnoreRule(base, re.compile(f"^{prefix}{glob_to_regex(line)}$"), negate, dir_only))
+    return rules
+
+def is_ignored(rules: Iterable[IgnoreRule], path: str, is_dir: bool) -> bool:
+    """Whether the last rule matching a path ignores it."""
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        relative = os.path.relpath(path, rule.base).replace(os.sep, '/')
+        if rule.regex.match(relative):
+            ignored = not rule.negate
+    return ignored
+
+def split_glob(source: str) -> Tuple[str, Optional[str]]:
+    """Root directory and relative pattern of a glob source, e.g. ('docs', '**/*.md'); no pattern for a plain path."""
+    if not has_magic(source):
+        return source, None
+    parts = source.replace(os.sep, '/').split('/')
+    for position, part in enumerate(parts):
+        if has_magic(part):
+            root = '/'.join(parts[:position]) or ('/' if source.startswith('/') else '.')
+            return root, '/'.join(parts[position:])
+    return source, None
+
+class _Listing(NamedTuple):
+    files: List[Tuple[str, str, int]]  # name, path, size (0 unless needed)
+    directories: List[Tuple[str, str]]
+    gitignore: Optional[str]
+
+class FileWalker:
+    """
+    Expand directories and glob patterns into file paths.
+
+    Directories are listed with os.scandir on a pool of threads: as soon as a
+    directory is listed, all of its subdirectories are queued for listing, while
+    paths are yielded in sorted depth-first order as the listings they need come
+    in. Paths stream out while the rest of the tree is still being scanned, and
+    the order is the same on every run. Files are kept when their extension is
+    one of `extensions` (if given), they match the source pattern and an include
+    pattern (if any), match no exclude pattern, are not ignored by a .gitignore
+    on the way down from the root and are at most max_bytes long. Symbolic links
+    to directories are not followed.
+    """
+
+    def __init__(
+        self,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        extensions: Optional[Iterable[str]] = None,
+        max_bytes: Optional[int] = None,
+        gitignore: bool = True,
+        workers: int = 8,
+    ):
+        self.include = [PathPattern(pattern) for pattern in include or []]
+        self.exclude = [PathPattern(pattern) for pattern in exclude or []]
+        self.extensions = {extension.lower() for extension in extensions} if extensions is not None else None
+        self.max_bytes = max_bytes
+        self.gitignore = gitignore
+        self.workers = workers
+        self.skipped = 0
+
+    def _list(self, directory: str) -> _Listing:
+        files, directories = [], []
+        gitignore = None
+        try:
+            with os.scandir(directory) as entries:
+                for entry in sorted(entries, key=lambda entry: entry.name):
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRECTORIES:
+                            directories.append((entry.name, entry.path))
+                    elif entry.is_file():
+                        if entry.name == '.gitignore' and self.gitignore:
+                            with open(entry.path, 'r', encoding='utf-8', errors='replace') as f:
+                                gitignore = f.read()
+                        size = entry.stat().st_size if self.max_bytes is not None else 0
+                        files.append((entry.name, entry.path, size))
+        except OSError as e:
+            print(f"⚠️ Could not list {directory}: {e}")
+        return _Listing(files, directories, gitignore)
+
+    def _wanted(self, name: str, relative: str, size: int, pattern: Optional[Pattern]) -> bool:
+        if self.extensions is not None and os.path.splitext(name)[1].lower() not in self.extensions:
+            return False
+        if pattern is not None and not pattern.match(relative):
+            return False
+        if self.include and not any(include.match(relative) for include in self.include):
+            return False
+        if any(exclude.match(relative) for exclude in self.exclude):
+            return False
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.skipped += 1
+            return False
+        return True
+
+    def walk(self, source: str) -> Iterator[str]:
+        """Paths of the files under a directory or matching a glob such as docs/**/*.md."""
+        root, glob = split_glob(source)
+        if os.path.isfile(root):
+            yield root
+            return
+        if not os.path.isdir(root):
+            return
+        # The source glob is anchored at its root: only `**` descends into subdirectories
+        pattern = re.compile(f"^{glob_to_regex(glob)}$") if glob is not None else None
+        # Nor does the walk, so docs/*.md never lists docs/sub/
+        max_depth = glob.count('/') if glob is not None and '**' not in glob else None
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='kb-scan') as pool:
+            stack: List[Tuple[str, List[IgnoreRule], Future]] = [(root, [], pool.submit(self._list, root))]
+            while stack:
+                directory, rules, future = stack.pop()
+                listing = future.result()
+                if listing.gitignore:
+                    rules = rules + parse_gitignore(listing.gitignore, directory)
+
+                for name, path, size in listing.files:
+                    relative = os.path.relpath(path, root).replace(os.sep, '/')
+                    if rules and is_ignored(rules, path, False):
+                        continue
+                    if self._wanted(name, relative, size, pattern):
+                        yield path
+
+                # Every subdirectory is listed ahead; they are visited in name order
+                children = []
+                for name, path in listing.directories:
+                    if rules and is_ignored(rules, path, True):
+                        continue
+                    relative = os.path.relpath(path, root).replace(os.sep, '/')
+                    if max_depth is not None and relative.count('/') >= max_depth:
+                        continue
+                    if any(exclude.match(relative) for exclude in self.exclude):
+                        continue
+                    children.append((path, rules, pool.submit(self._list, path)))
+                stack.extend(reversed(children))
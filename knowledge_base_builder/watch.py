@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import os
+import time
+import urllib.parse
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from knowledge_base_builder.compat import to_thread
+from knowledge_base_builder.metrics import Metrics, span, use_metrics
+from knowledge_base_builder.usage import use_tracker
+
+class Changes(NamedTuple):
+    """Paths that changed between two scans."""
+    modified: List[str]
+    added: List[str]
+    removed: List[str]
+
+def _fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class FileWatcher:
+    """
+    Poll files and directories for changes.
+
+    Directories are scanned recursively for files with one of the extensions.
+    A change is reported once the tree has been quiet for `debounce` seconds,
+    so an editor's save (often several writes and renames) becomes one event,
+    and files whose content hash did not change (a touch, a save without edits)
+    are left out. Paths in `ignore`, such as the KB being written, are never reported.
+    """
+
+    def __init__(self, paths: Iterable[str], extensions: Iterable[str], interval: float = 1.0, debounce: float = 0.5,
+                 ignore: Iterable[str] = ()):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.extensions = {extension.lower() for extension in extensions}
+        self.ignore = {os.path.abspath(path) for path in ignore}
+        self.interval = interval
+        self.debounce = debounce
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._hashes: Dict[str, str] = {}
+        self.files()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        found: Dict[str, Tuple[int, int]] = {}
+        for path in self.paths:
+            if os.path.isdir(path):
+                for root, dirs, names in os.walk(path):
+                    dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+                    for name in sorted(names):
+                        full = os.path.join(root, name)
+                        if os.path.splitext(name)[1].lower() in self.extensions and full not in self.ignore:
+                            if (stat := _fingerprint(full)) is not None:
+                                found[full] = stat
+            elif (stat := _fingerprint(path)) is not None:
+                found[path] = stat
+        return found
+
+    @staticmethod
+    def _hash(path: str) -> Optional[str]:
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def files(self) -> List[str]:
+        """Every watched file, recording its current state as the baseline."""
+        self._stats = self._scan()
+        self._hashes = {path: self._hash(path) for path in self._stats}
+        return list(self._stats)
+
+    def poll(self) -> Optional[Changes]:
+        """Changes since the last baseline once they have settled, or None."""
+        current = self._scan()
+        if current == self._stats:
+            return None
+        # Wait for the writes to stop before reading the files
+        while True:
+            time.sleep(self.debounce)
+            settled = self._scan()
+            if settled == current:
+                break
+            current = settled
+
+        modified, added, removed = [], [], []
+        hashes = {}
+        for path in current:
+            hashes[path] = self._hash(path) if current[path] != self._stats.get(path) else self._hashes.get(path)
+            if path not in self._stats:
+                added.append(path)
+            elif hashes[path] != self._hashes.get(path):
+                modified.append(path)
+        removed = [path for path in self._stats if path not in current]
+        self._stats, self._hashes = current, hashes
+        if not (modified or added or removed):
+            return None
+        return Changes(modified, added, removed)
+
+def _file_url(path: str) -> str:
+    return f"file://{urllib.parse.quote(os.path.abspath(path))}"
+
+class KBWatcher:
+    """
+    Keep a knowledge base up to date with local files.
+
+    Every file is extracted and summarized on its own, and the KB is the
+    concatenation of the per-file sections in path order. After the first build,
+    each settled change re-extracts and re-summarizes only the files that
+    changed, drops removed ones and rewrites the KB atomically, so readers never
+    see a half-written file. Deduplication and topic grouping, which work across
+    files, are not applied in watch mode.
+    """
+
+    def __init__(self, builder, paths: List[str], output_file: str, interval: float = 1.0, debounce: float = 0.5):
+        self.builder = builder
+        self.output_file = output_file
+        # The KB itself may live in a watched directory
+        self.watcher = FileWatcher(paths, builder.processors.extensions, interval, debounce,
+                                   ignore=[output_file, f"{output_file}.tmp"])
+        self.sections: Dict[str, str] = {}
+        self.rebuilds = 0
+
+    async def _summarize(self, path: str) -> str:
+        """Extract and summarize one file into its KB section."""
+        url = _file_url(path)
+        spec = self.builder.processors.for_path(url)
+        if spec is None:
+            raise ValueError(f"Unsupported file type: {path}")
+        print(f"{spec.icon} {path}")
+        with span('source', source=url, kind=spec.name):
+            text = await self.builder._download_and_extract_async(spec.processor, url)
+        size = self.builder.chunk_size
+        outputs = []
+        for start in range(0, len(text), size):
+            chunk = text[start:start + size]
+            outputs.extend(await self.builder._preprocess_chunk_async(chunk, start // size + 1, {url: len(chunk)}))
+        return "\n\n".join(outputs)
+
+    async def update(self, paths: Iterable[str], removed: Iterable[str] = ()) -> Set[str]:
+        """Re-summarize paths, drop removed ones and rewrite the KB; return the paths that failed."""
+        paths = list(paths)
+        results = await asyncio.gather(*(self._summarize(path) for path in paths), return_exceptions=True)
+        failed = set()
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                # Keep the last good section so one broken save does not empty the KB
+                failed.add(path)
+                print(f"❌ Error processing {path}: {result}")
+            else:
+                self.sections[path] = result
+        for path in removed:
+            self.sections.pop(path, None)
+        self.write()
+        return failed
+
+    def write(self) -> None:
+        content = "\n\n".join(self.sections[path] for path in sorted(self.sections) if self.sections[path])
+        temporary = f"{self.output_file}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temporary, self.output_file)
+
+    async def run_async(self, cycles: Optional[int] = None) -> None:
+        """Build, then apply changes as they settle; stop after `cycles` rebuilds if given."""
+        files = self.watcher.files()
+        with span('build') as build:
+            await self.update(files)
+        print(f"✅ KB of {len(files)} files written to {self.output_file} in {build.duration:.2f} seconds")
+        print(f"👀 Watching {len(files)} files for changes (Ctrl+C to stop)")
+        while cycles is None or self.rebuilds < cycles:
+            changes = await to_thread(self.watcher.poll)
+            if changes is None:
+                await asyncio.sleep(self.watcher.interval)
+                continue
+            changed = changes.modified + changes.added
+            print(f"🔄 {len(changes.modified)} modified, {len(changes.added)} added, {len(changes.removed)} removed")
+            with span('rebuild') as rebuild:
+                await self.update(changed, changes.removed)
+            self.rebuilds += 1
+            print(f"✅ KB updated in {rebuild.duration:.2f} seconds")
+
+    def run(self, cycles: Optional[int] = None) -> None:
+        """Watch until interrupted, with the builder's metrics and usage accounting."""
+        self.builder.metrics = Metrics()
+        with use_metrics(self.builder.metrics), use_tracker(self.builder.usage):
+            asyncio.run(self.run_async(cycles))
@@ -4,20 +4,32 @@ import tempfile
 import urllib.parse
 import re
 import json
-import yaml
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
+from typing import Iterator, List
+from knowledge_base_builder import json_stream
 from knowledge_base_builder.base_processor import BaseProcessor
+from knowledge_base_builder.html_cleaner import HTMLCleaner
 
 class WebContentProcessor(BaseProcessor):
-    """Handle web content processing for .html, .xml, .json, and .yaml/.yml files."""
+    """Handle web content processing for .html, .xml, .json, .jsonl/.ndjson, and .yaml/.yml files."""
     
-    SUPPORTED_EXTENSIONS = ['.html', '.xml', '.json', '.yaml', '.yml']
+    SUPPORTED_EXTENSIONS = ['.html', '.xml', '.json', '.jsonl', '.ndjson', '.yaml', '.yml']
+    # text/html is left out: extension-less HTML URLs are fetched as web pages
+    MIME_TYPES = {
+        'application/xml': '.xml',
+        'text/xml': '.xml',
+        'application/json': '.json',
+        'application/x-ndjson': '.jsonl',
+        'application/jsonl': '.jsonl',
+        'application/yaml': '.yaml',
+        'application/x-yaml': '.yaml',
+        'text/yaml': '.yaml',
+    }
     
     @staticmethod
     def download(url: str) -> str:
         """Download web content from a URL or load from local file."""
-        return BaseProcessor.download(url, WebContentProcessor.SUPPORTED_EXTENSIONS)
+        return BaseProcessor.download(url, WebContentProcessor.SUPPORTED_EXTENSIONS, WebContentProcessor.MIME_TYPES)
 
     @staticmethod
     def extract_text(file_path: str) -> str:
@@ -30,6 +42,8 @@ class WebContentProcessor(BaseProcessor):
             return WebContentProcessor._extract_from_xml(file_path)
         elif file_ext == '.json':
             return WebContentProcessor._extract_from_json(file_path)
+        elif file_ext in ['.jsonl', '.ndjson']:
+            return WebContentProcessor._extract_from_jsonl(file_path)
         elif file_ext in ['.yaml', '.yml']:
             return WebContentProcessor._extract_from_yaml(file_path)
         else:
@@ -41,25 +55,8 @@ class WebContentProcessor(BaseProcessor):
         try:
             with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
                 html_content = file.read()
-                
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "meta", "link", "svg", "path"]):
-                script.extract()
-            
-            # Get text
-            text = soup.get_text(separator=' ')
-            
-            # Clean up whitespace
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            text = '\n'.join(lines)
             
-            # Remove excessive newlines and whitespace
-            text = re.sub(r'\n{3,}', '\n\n', text)
-            text = re.sub(r'\s{2,}', ' ', text)
-            
-            return text
+            return HTMLCleaner().to_markdown(html_content)
         except Exception as e:
             raise Exception(f"Error extracting text from .html file: {e}")
 
@@ -67,33 +64,7 @@ class WebContentProcessor(BaseProcessor):
     def _extract_from_xml(file_path: str) -> str:
         """Extract text from an .xml file."""
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # Convert XML to a structured text representation
-            def format_element(element, level=0):
-                result = []
-                indent = '  ' * level
-                
-                # Element tag with attributes
-                attrs = ' '.join([f'{k}="{v}"' for k, v in element.attrib.items()])
-                tag_line = f"{indent}{element.tag}"
-                if attrs:
-                    tag_line += f" [{attrs}]"
-                result.append(tag_line)
-                
-                # Element text content (if any)
-                if element.text and element.text.strip():
-                    result.append(f"{indent}  {element.text.strip()}")
-                
-                # Process child elements
-                for child in element:
-                    result.extend(format_element(child, level + 1))
-                    
-                return result
-            
-            text_lines = format_element(root)
-            return '\n'.join(text_lines)
+            return '\n'.join(WebContentProcessor._iter_xml_lines(file_path))
         except Exception as e:
             # Fall back to raw content if parsing fails
             try:
@@ -102,72 +73,139 @@ class WebContentProcessor(BaseProcessor):
             except:
                 raise Exception(f"Error extracting text from .xml file: {e}")
 
+    @staticmethod
+    def _iter_xml_lines(file_path: str) -> Iterator[str]:
+        """
+        Stream an XML file as indented text lines.
+        
+        Uses iterparse so only the chain of currently open elements is kept in
+        memory: every element is cleared and detached from its parent once it
+        ends, and nesting is tracked with an explicit stack instead of recursion.
+        """
+        # Each open element: [element, text already emitted?]
+        stack = []
+        
+        def text_line(entry):
+            element, emitted = entry
+            entry[1] = True
+            if not emitted and element.text and element.text.strip():
+                return f"{'  ' * (len(stack) - 1)}  {element.text.strip()}"
+            return None
+        
+        for event, element in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                # The parent's leading text is complete once a child starts
+                if stack and (line := text_line(stack[-1])) is not None:
+                    yield line
+                
+                stack.append([element, False])
+                # Element tag with attributes
+                attrs = ' '.join([f'{k}="{v}"' for k, v in element.attrib.items()])
+                tag_line = f"{'  ' * (len(stack) - 1)}{element.tag}"
+                if attrs:
+                    tag_line += f" [{attrs}]"
+                yield tag_line
+            else:
+                if (line := text_line(stack[-1])) is not None:
+                    yield line
+                stack.pop()
+                
+                # Drop the finished subtree so memory is bounded by depth
+                element.clear()
+                if stack:
+                    stack[-1][0].remove(element)
+
     @staticmethod
     def _extract_from_json(file_path: str) -> str:
         """Extract text from a .json file."""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-                data = json.load(file)
-            
-            # Convert JSON to a structured text representation
-            def format_json(obj, level=0):
-                if isinstance(obj, dict):
-                    result = []
-                    for key, value in obj.items():
-                        indent = '  ' * level
-                        if isinstance(value, (dict, list)):
-                            result.append(f"{indent}{key}:")
-                            result.extend(format_json(value, level + 1))
-                        else:
-                            result.append(f"{indent}{key}: {value}")
-                    return result
-                elif isinstance(obj, list):
-                    result = []
-                    for item in obj:
-                        if isinstance(item, (dict, list)):
-                            result.extend(format_json(item, level))
-                        else:
-                            result.append('  ' * level + str(item))
-                    return result
-                else:
-                    return ['  ' * level + str(obj)]
-            
-            text_lines = format_json(data)
-            return '\n'.join(text_lines)
+                # Walk the document as a token stream instead of json.load-ing it
+                return '\n'.join(json_stream.iter_formatted_lines(json_stream.iter_json_events(file)))
         except Exception as e:
             raise Exception(f"Error extracting text from .json file: {e}")
 
+    @staticmethod
+    def _extract_from_jsonl(file_path: str) -> str:
+        """Extract text from a .jsonl/.ndjson file."""
+        try:
+            return '\n'.join(WebContentProcessor._iter_jsonl_records(file_path))
+        except Exception as e:
+            raise Exception(f"Error extracting text from .jsonl/.ndjson file: {e}")
+
+    @staticmethod
+    def _iter_jsonl_records(file_path: str) -> Iterator[str]:
+        """Format a JSON Lines file one record at a time, skipping malformed lines."""
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                yield '\n'.join(json_stream.format_value(record))
+
+    @staticmethod
+    def iter_jsonl_chunks(file_path: str, chunk_size: int = 20000 * 4) -> Iterator[str]:
+        """
+        Batch the formatted records of a .jsonl/.ndjson file into chunks of roughly
+        chunk_size characters. Records are never split; a record larger than
+        chunk_size becomes a chunk of its own.
+        """
+        batch = []
+        batch_size = 0
+        for record in WebContentProcessor._iter_jsonl_records(file_path):
+            if batch and batch_size + len(record) > chunk_size:
+                yield '\n'.join(batch)
+                batch = []
+                batch_size = 0
+            batch.append(record)
+            batch_size += len(record) + 1
+        if batch:
+            yield '\n'.join(batch)
+
     @staticmethod
     def _extract_from_yaml(file_path: str) -> str:
-        """Extract text from a .yaml/.yml file."""
+        """Extract text from a .yaml/.yml file, including every document of a multi-doc stream."""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-                data = yaml.safe_load(file)
-            
-            # Convert YAML to a structured text representation
-            def format_yaml(obj, level=0):
-                if isinstance(obj, dict):
-                    result = []
-                    for key, value in obj.items():
-                        indent = '  ' * level
-                        if isinstance(value, (dict, list)):
-                            result.append(f"{indent}{key}:")
-                            result.extend(format_yaml(value, level + 1))
-                        else:
-                            result.append(f"{indent}{key}: {value}")
-                    return result
-                elif isinstance(obj, list):
-                    result = []
-                    for item in obj:
-                        if isinstance(item, (dict, list)):
-                            result.extend(format_yaml(item, level))
-                        else:
-                            result.append('  ' * level + f"- {item}")
-                    return result
-                else:
-                    return ['  ' * level + str(obj)]
-            
-            text_lines = format_yaml(data)
-            return '\n'.join(text_lines)
+            return '\n---\n'.join(WebContentProcessor._iter_yaml_documents(file_path))
         except Exception as e:
-            raise Exception(f"Error extracting text from .yaml/.yml file: {e}") 
\ No newline at end of file
+            raise Exception(f"Error extracting text from .yaml/.yml file: {e}")
+
+    @staticmethod
+    def _iter_yaml_documents(file_path: str) -> Iterator[str]:
+        """Lazily parse and format each document of a YAML stream, skipping empty ones."""
+        import yaml
+
+        # Use the libyaml-backed loader when PyYAML was built against libyaml
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            for data in yaml.load_all(file, Loader=loader):
+                if data is None:
+                    continue
+                yield '\n'.join(WebContentProcessor._format_yaml(data))
+
+    @staticmethod
+    def _format_yaml(obj, level=0) -> List[str]:
+        """Convert a YAML document to a structured text representation."""
+        if isinstance(obj, dict):
+            result = []
+            for key, value in obj.items():
+                indent = '  ' * level
+                if isinstance(value, (dict, list)):
+                    result.append(f"{indent}{key}:")
+                    result.extend(WebContentProcessor._format_yaml(value, level + 1))
+                else:
+                    result.append(f"{indent}{key}: {value}")
+            return result
+        elif isinstance(obj, list):
+            result = []
+            for item in obj:
+                if isinstance(item, (dict, list)):
+                    result.extend(WebContentProcessor._format_yaml(item, level))
+                else:
+                    result.append('  ' * level + f"- {item}")
+            return result
+        else:
+            return ['  ' * level + str(obj)]
@@ -1,12 +1,15 @@
 import requests
 from typing import List
-from bs4 import BeautifulSoup
+from knowledge_base_builder.html_cleaner import HTMLCleaner, Block
+from knowledge_base_builder.content_extractor import MainContentExtractor
 
 class WebsiteProcessor:
     """Handle website content processing."""
     @staticmethod
     def get_urls_from_sitemap(sitemap_url: str) -> List[str]:
         """Extract URLs from a sitemap XML file."""
+        from bs4 import BeautifulSoup
+
         response = requests.get(sitemap_url)
         if response.status_code != 200:
             raise Exception(f"Failed to load sitemap: {response.status_code}")
@@ -14,12 +17,23 @@ class WebsiteProcessor:
         return [loc.text for loc in soup.find_all("loc")]
 
     @staticmethod
-    def download_and_clean_html(url: str) -> str:
-        """Download HTML from a URL and clean it for processing."""
+    def download_html(url: str) -> str:
+        """Download the raw HTML of a page."""
         response = requests.get(url)
         if response.status_code != 200:
             raise Exception(f"Failed to download HTML: {response.status_code}")
-        soup = BeautifulSoup(response.text, "html.parser")
-        for tag in soup(["script", "style", "noscript"]):
-            tag.decompose()
-        return soup.get_text(separator="\n", strip=True) 
\ No newline at end of file
+        return response.text
+
+    @staticmethod
+    def extract_blocks(html: str, main_content: bool = False) -> List[Block]:
+        """Render HTML into Markdown blocks, optionally keeping only the main content."""
+        blocks = HTMLCleaner().to_blocks(html)
+        if main_content:
+            blocks = MainContentExtractor().select(blocks)
+        return blocks
+
+    @staticmethod
+    def download_and_clean_html(url: str, main_content: bool = False) -> str:
+        """Download HTML from a URL and clean it for processing."""
+        html = WebsiteProcessor.download_html(url)
+        return HTMLCleaner.join_blocks(WebsiteProcessor.extract_blocks(html, main_content))
@@ -49,13 +49,18 @@ setup(
         # New dependencies for spreadsheet processors
         "pandas>=2.0.0",        # For tabular data processing
         "openpyxl>=3.1.2",      # For .xlsx files
-        "ezodf>=0.3.2",         # For .ods files
         # New dependencies for web content processors
         "pyyaml>=6.0",          # For .yaml/.yml files
+        "numpy>=1.22",          # For near-duplicate fingerprints
     ],
+    extras_require={
+        "zstd": ["zstandard>=0.21"],  # For zstd-compressed KB shards
+    },
     entry_points={
         "console_scripts": [
             "knowledge-base-builder=knowledge_base_builder.cli:main",
+            "knowledge-base-builder-serve=knowledge_base_builder.cli:serve_main",
+            "knowledge-base-builder-worker=knowledge_base_builder.cli:worker_main",
         ],
     },
 ) 
\ No newline at end of file